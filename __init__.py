@@ -11,10 +11,15 @@ bl_info = {
 
 
 # -----------------------------------------------------------------------------
-from bpy.utils import register_class
+import multiprocessing
 
-from . import auto_load
-from .src.gui import MET_PT_map_editor, MET_PT_actors, MET_PT_selected_actor, MET_PT_measurements
+# The export pools spawn worker processes that import this package to reach src.t3d and src.ase, which do not need bpy.
+# Workers are plain Python interpreters without Blender's modules, so only Blender's own process imports the add-on.
+if multiprocessing.parent_process() is None:
+    from bpy.utils import register_class
+
+    from . import auto_load
+    from .src.gui import MET_PT_map_editor, MET_PT_actors, MET_PT_selected_actor, MET_PT_measurements, MET_PT_validation
 
 
 # -----------------------------------------------------------------------------
@@ -23,6 +28,7 @@ def register():
     register_class(MET_PT_selected_actor)
     register_class(MET_PT_actors)
     register_class(MET_PT_measurements)
+    register_class(MET_PT_validation)
 
     auto_load.init()
     auto_load.register()
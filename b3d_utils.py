@@ -16,6 +16,7 @@ import math
 import numpy as np
 from typing import Callable
 import textwrap
+from functools import lru_cache
 
 
 # -----------------------------------------------------------------------------
@@ -325,6 +326,31 @@ def new_mesh(
     return mesh
 
 
+# -----------------------------------------------------------------------------
+def new_mesh_from_arrays(_verts:np.ndarray, _loop_verts:np.ndarray, _offsets:np.ndarray, _name:str) -> Mesh:
+    """
+    Create a mesh in bulk. `_verts` has shape (n, 3), polygon k uses the vertex indices `_loop_verts[_offsets[k]:_offsets[k + 1]]`
+    """
+    mesh = bpy.data.meshes.new(_name)
+
+    mesh.vertices.add(len(_verts))
+    mesh.loops.add(len(_loop_verts))
+    mesh.polygons.add(len(_offsets) - 1)
+
+    mesh.vertices.foreach_set('co', np.ascontiguousarray(_verts, dtype=np.float32).ravel())
+    mesh.loops.foreach_set('vertex_index', np.ascontiguousarray(_loop_verts, dtype=np.int32))
+    mesh.polygons.foreach_set('loop_start', np.ascontiguousarray(_offsets[:-1], dtype=np.int32))
+
+    # Read-only since 4.0, where it is derived from loop_start
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set('loop_total', np.diff(_offsets).astype(np.int32))
+
+    mesh.update(calc_edges=True)
+    mesh.validate()
+
+    return mesh
+
+
 # -----------------------------------------------------------------------------
 # https://blender.stackexchange.com/questions/50160/scripting-low-level-join-meshes-elements-hopefully-with-bmesh
 def join_meshes(_meshes:list[Mesh]):
@@ -462,21 +488,146 @@ def snap_to_grid(_mesh:Mesh, _spacing:float):
 
 
 # -----------------------------------------------------------------------------
-def mesh_bounds(_obj:Object) -> tuple[Vector, Vector]:
-    bbmin = Vector((float('inf'), float('inf'), float('inf')))
-    bbmax = Vector((float('-inf'), float('-inf'), float('-inf')))
+def read_mesh_coordinates(_mesh:Mesh) -> np.ndarray:
+    co = np.empty(len(_mesh.vertices) * 3, dtype=np.float32)
+    _mesh.vertices.foreach_get('co', co)
+
+    return co.reshape(-1, 3)
+
+
+# -----------------------------------------------------------------------------
+class MeshBoundsCache:
+    """
+    Local coordinates and bounds per mesh datablock, keyed by `session_uid`.
+    Entries are dropped on geometry updates in the depsgraph once `enable_mesh_bounds_cache()` is called.
+    """
+    def __init__(self):
+        self.entries: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]] = {} # Dictionary of (mesh session_uid, (coordinates, min, max))
+
+
+    def get(self, _mesh:Mesh) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if (entry := self.entries.get(_mesh.session_uid)) is None:
+            entry = self.entries[_mesh.session_uid] = local_bounds(read_mesh_coordinates(_mesh))
+
+        return entry
+
+
+    def invalidate(self, _mesh:Mesh=None):
+        if _mesh is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(_mesh.session_uid, None)
+
+
+mesh_bounds_cache = MeshBoundsCache()
+
+
+# -----------------------------------------------------------------------------
+@bpy.app.handlers.persistent
+def on_mesh_bounds_depsgraph_update(_scene, _depsgraph):
+    if not mesh_bounds_cache.entries: return
+
+    for update in _depsgraph.updates:
+        if not update.is_updated_geometry: continue
+
+        data = update.id.original
+
+        if isinstance(data, Mesh):
+            mesh_bounds_cache.invalidate(data)
+        elif isinstance(data, Object) and data.type == 'MESH':
+            mesh_bounds_cache.invalidate(data.data)
+
+
+# -----------------------------------------------------------------------------
+@bpy.app.handlers.persistent
+def on_mesh_bounds_cache_clear(_scene, *_args):
+    mesh_bounds_cache.invalidate()
+
+
+# -----------------------------------------------------------------------------
+def enable_mesh_bounds_cache():
+    add_callback(bpy.app.handlers.depsgraph_update_post, on_mesh_bounds_depsgraph_update)
+
+    for handler in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        add_callback(handler, on_mesh_bounds_cache_clear)
+
+
+# -----------------------------------------------------------------------------
+def disable_mesh_bounds_cache():
+    remove_callback(bpy.app.handlers.depsgraph_update_post, on_mesh_bounds_depsgraph_update)
 
-    for vertex in _obj.data.vertices:
-        world_co = _obj.matrix_world @ vertex.co
-        bbmin.x = min(bbmin[0], world_co[0])
-        bbmin.y = min(bbmin[1], world_co[1])
-        bbmin.z = min(bbmin[2], world_co[2])
+    for handler in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        remove_callback(handler, on_mesh_bounds_cache_clear)
 
-        bbmax.x = max(bbmax[0], world_co[0])
-        bbmax.y = max(bbmax[1], world_co[1])
-        bbmax.z = max(bbmax[2], world_co[2])
+    mesh_bounds_cache.invalidate()
 
-    return bbmin, bbmax
+
+# -----------------------------------------------------------------------------
+def local_bounds(_co:np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if len(_co) == 0:
+        return _co, np.full(3, np.inf), np.full(3, -np.inf)
+
+    return _co, _co.min(axis=0).astype(np.float64), _co.max(axis=0).astype(np.float64)
+
+
+# -----------------------------------------------------------------------------
+def world_bounds(_co:np.ndarray, _lo:np.ndarray, _hi:np.ndarray, _matrix:Matrix) -> tuple[np.ndarray, np.ndarray]:
+    if len(_co) == 0:
+        return _lo, _hi
+
+    m = np.array(_matrix, dtype=np.float64)
+    basis, translation = m[:3, :3], m[:3, 3]
+
+    # Without rotation, the local bounds map to the world bounds
+    if np.count_nonzero(basis - np.diag(np.diagonal(basis))) == 0:
+        a = _lo * np.diagonal(basis) + translation
+        b = _hi * np.diagonal(basis) + translation
+
+        return np.minimum(a, b), np.maximum(a, b)
+
+    world = _co @ basis.T + translation
+
+    return world.min(axis=0), world.max(axis=0)
+
+
+# -----------------------------------------------------------------------------
+def mesh_bounds_array(_objects:list[Object], _use_cache=False) -> np.ndarray:
+    """
+    World space bounds of mesh objects as an array of shape (objects, 2, 3), with the minimum at [:, 0] and the maximum at [:, 1].
+    With `_use_cache` the local coordinates are read once per mesh, see `MeshBoundsCache`.
+    """
+    bounds = np.empty((len(_objects), 2, 3), dtype=np.float64)
+
+    for k, obj in enumerate(_objects):
+        if _use_cache:
+            co, lo, hi = mesh_bounds_cache.get(obj.data)
+        else:
+            co, lo, hi = local_bounds(read_mesh_coordinates(obj.data))
+
+        bounds[k] = world_bounds(co, lo, hi, obj.matrix_world)
+
+    return bounds
+
+
+# -----------------------------------------------------------------------------
+def mesh_bounds(_obj:Object, _use_cache=False) -> tuple[Vector, Vector]:
+    bounds = mesh_bounds_array([_obj], _use_cache)[0]
+
+    return Vector(bounds[0]), Vector(bounds[1])
+
+
+# -----------------------------------------------------------------------------
+def objects_bounds(_objects:list[Object], _use_cache=False) -> tuple[Vector, Vector]:
+    """
+    World space bounds around all `_objects`
+    """
+    if not _objects:
+        inf = float('inf')
+        return Vector((inf, inf, inf)), Vector((-inf, -inf, -inf))
+
+    bounds = mesh_bounds_array(_objects, _use_cache)
+
+    return Vector(bounds[:, 0].min(axis=0)), Vector(bounds[:, 1].max(axis=0))
 
 
 # -----------------------------------------------------------------------------
@@ -727,6 +878,15 @@ def draw_batch_3d(_color:tuple, _width=1.0, _type='LINES'):
     batch.draw(shader)
 
 
+# -----------------------------------------------------------------------------
+def tag_redraw_view3d():
+    # bpy.context.screen is not available in timers, so go through all windows
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
 # -----------------------------------------------------------------------------
 def draw_aabb_lines_3d(_bmin:Vector, _bmax:Vector, _color:tuple, _width=1):
     v0 = _bmin
@@ -808,6 +968,205 @@ def check_objects_intersection(_obj1:Object, _obj2:Object, _apply_modifiers=True
     return bvh1.overlap(bvh2)
 
 
+# -----------------------------------------------------------------------------
+def sweep_and_prune(_lo:np.ndarray, _hi:np.ndarray) -> list[tuple[int, int]]:
+    """
+    Index pairs (i, j), i < j, of the boxes with overlapping bounds, `_lo` and `_hi` have shape (n, 3).
+    Boxes are sorted along x, so each box is only compared with the boxes that start before it ends: O(n log n + pairs).
+    """
+    order = np.argsort(_lo[:, 0], kind='stable')
+    lo, hi = _lo[order], _hi[order]
+    ends = np.searchsorted(lo[:, 0], hi[:, 0], side='right')
+
+    pairs = []
+
+    for i in range(len(order)):
+        if ends[i] <= i + 1: continue
+
+        j = np.arange(i + 1, ends[i])
+        hit = np.all(lo[j] <= hi[i], axis=1) & np.all(hi[j] >= lo[i], axis=1)
+
+        a = order[i]
+        pairs.extend((min(a, b), max(a, b)) for b in order[j[hit]].tolist())
+
+    return pairs
+
+
+# -----------------------------------------------------------------------------
+class SceneBVHEntry:
+
+    def __init__(self, _key:tuple, _verts:np.ndarray, _loop_verts:np.ndarray, _offsets:np.ndarray):
+        self.key = _key
+        self.verts = _verts # World space
+        self.loop_verts = _loop_verts
+        self.offsets = _offsets
+        self.lo = _verts.min(axis=0) if len(_verts) else np.full(3, np.inf)
+        self.hi = _verts.max(axis=0) if len(_verts) else np.full(3, -np.inf)
+        self.bvh: BVHTree | None = None
+
+
+    def get_bvh(self) -> BVHTree:
+        if self.bvh is None:
+            polygons = [self.loop_verts[a:b] for a, b in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist())]
+            self.bvh = BVHTree.FromPolygons(self.verts.tolist(), [p.tolist() for p in polygons])
+
+        return self.bvh
+
+
+# -----------------------------------------------------------------------------
+class SceneBVHOverlap:
+
+    def __init__(self, _a:Object, _b:Object, _polygons:list[tuple[int, int]], _contained:bool):
+        self.a = _a
+        self.b = _b
+        self.polygons = _polygons # Pairs of intersecting polygons, as returned by BVHTree.overlap
+        self.contained = _contained # One object lies inside of the other without intersecting polygons
+
+
+# -----------------------------------------------------------------------------
+class SceneBVH:
+    """
+    Spatial index over the evaluated meshes of objects, in world space.
+    The broad phase sweeps the bounds of all objects, 
+    the BVHTree of an object is only built when its bounds overlap with another and is kept until its mesh or transform changes.
+    Entries are dropped on depsgraph geometry updates once `enable_scene_bvh()` is called.
+    """
+    def __init__(self):
+        self.entries: dict[int, SceneBVHEntry] = {} # Dictionary of (object session_uid, entry)
+
+
+    def invalidate(self, _obj:Object=None):
+        if _obj is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(_obj.session_uid, None)
+
+
+    def get(self, _obj:Object) -> SceneBVHEntry:
+        key = (_obj.data.session_uid, tuple(c for row in _obj.matrix_world for c in row))
+
+        if (entry := self.entries.get(_obj.session_uid)) is not None and entry.key == key:
+            return entry
+
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        obj_eval = _obj.evaluated_get(depsgraph)
+        mesh = obj_eval.to_mesh()
+
+        try:
+            co = read_mesh_coordinates(mesh)
+            loop_total = np.empty(len(mesh.polygons), dtype=np.int32)
+            loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+            mesh.polygons.foreach_get('loop_total', loop_total)
+            mesh.loops.foreach_get('vertex_index', loop_verts)
+        finally:
+            obj_eval.to_mesh_clear()
+
+        m = np.array(obj_eval.matrix_world, dtype=np.float32)
+        verts = co @ m[:3, :3].T + m[:3, 3]
+
+        offsets = np.zeros(len(loop_total) + 1, dtype=np.int64)
+        np.cumsum(loop_total, out=offsets[1:])
+
+        entry = self.entries[_obj.session_uid] = SceneBVHEntry(key, verts, loop_verts, offsets)
+
+        return entry
+
+
+    def candidate_pairs(self, _objects:list[Object], _others:list[Object]=None) -> list[tuple[Object, Object]]:
+        """
+        Pairs with overlapping bounds, within `_objects` or, if `_others` is given, between `_objects` and `_others`
+        """
+        objects = [obj for obj in _objects if obj.type == 'MESH']
+        others = [obj for obj in _others if obj.type == 'MESH'] if _others is not None else []
+        combined = objects + others
+
+        if len(combined) < 2: return []
+
+        entries = [self.get(obj) for obj in combined]
+        lo = np.array([e.lo for e in entries])
+        hi = np.array([e.hi for e in entries])
+
+        count = len(objects)
+        pairs = []
+
+        for i, j in sweep_and_prune(lo, hi):
+            if _others is not None and (i < count) == (j < count): continue
+            if combined[i] == combined[j]: continue
+
+            pairs.append((combined[i], combined[j]))
+
+        return pairs
+
+
+    def overlaps(self, _objects:list[Object], _others:list[Object]=None) -> list[SceneBVHOverlap]:
+        """
+        Pairs of objects whose surfaces intersect or of which one is inside the other
+        """
+        result = []
+
+        for a, b in self.candidate_pairs(_objects, _others):
+            ea, eb = self.get(a), self.get(b)
+            bvh_a, bvh_b = ea.get_bvh(), eb.get_bvh()
+
+            if (polygons := bvh_a.overlap(bvh_b)):
+                result.append(SceneBVHOverlap(a, b, polygons, False))
+
+            elif is_inside(bvh_b, ea.verts) or is_inside(bvh_a, eb.verts):
+                result.append(SceneBVHOverlap(a, b, [], True))
+
+        return result
+
+
+scene_bvh = SceneBVH()
+
+
+# -----------------------------------------------------------------------------
+def is_inside(_bvh:BVHTree, _verts:np.ndarray) -> bool:
+    # Without intersecting polygons, either all vertices are inside or none are, so test the first
+    if not len(_verts): return False
+
+    point = Vector(_verts[0].tolist())
+    location, normal, _, _ = _bvh.find_nearest(point)
+
+    if location is None: return False
+
+    return (point - location).dot(normal) < 0
+
+
+# -----------------------------------------------------------------------------
+@bpy.app.handlers.persistent
+def on_scene_bvh_depsgraph_update(_scene, _depsgraph):
+    if not scene_bvh.entries: return
+
+    for update in _depsgraph.updates:
+        if update.is_updated_geometry and isinstance(update.id, Object):
+            scene_bvh.invalidate(update.id.original)
+
+
+# -----------------------------------------------------------------------------
+@bpy.app.handlers.persistent
+def on_scene_bvh_clear(_scene, *_args):
+    scene_bvh.invalidate()
+
+
+# -----------------------------------------------------------------------------
+def enable_scene_bvh():
+    add_callback(bpy.app.handlers.depsgraph_update_post, on_scene_bvh_depsgraph_update)
+
+    for handler in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        add_callback(handler, on_scene_bvh_clear)
+
+
+# -----------------------------------------------------------------------------
+def disable_scene_bvh():
+    remove_callback(bpy.app.handlers.depsgraph_update_post, on_scene_bvh_depsgraph_update)
+
+    for handler in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        remove_callback(handler, on_scene_bvh_clear)
+
+    scene_bvh.invalidate()
+
+
 # -----------------------------------------------------------------------------
 # Layout
 # -----------------------------------------------------------------------------
@@ -994,184 +1353,125 @@ def draw_generic_list(_layout:UILayout, _list:GenericList, _name:str, _rows=4, _
 # NURBS Curve Interpolation
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
+# Vectorized port of Blender's `BKE_nurb_makeCurve`, see:
 # https://blender.stackexchange.com/questions/34145/calculate-points-on-a-nurbs-curve-without-converting-to-mesh
-def interpolate_nurbs(nu, resolu, stride):
-    EPS = 1e-6
-    coord_index = istart = iend = 0
-
-    coord_array = [0.0] * (3 * nu.resolution_u * macro_segmentsu(nu))
-    sum_array = [0] * nu.point_count_u
-    basisu = [0.0] * macro_knotsu(nu)
-    knots = makeknots(nu)
-
-    resolu = resolu * macro_segmentsu(nu)
-    ustart = knots[nu.order_u - 1]
-    uend   = knots[nu.point_count_u + nu.order_u - 1] if nu.use_cyclic_u else \
-             knots[nu.point_count_u]
-    ustep  = (uend - ustart) / (resolu - (0 if nu.use_cyclic_u else 1))
-    cycl = nu.order_u - 1 if nu.use_cyclic_u else 0
-
-    u = ustart
-    while resolu:
-        resolu -= 1
-        istart, iend = basisNurb(u, nu.order_u, nu.point_count_u + cycl, knots, basisu, istart, iend)
-
-        #/* calc sum */
-        sumdiv = 0.0
-        sum_index = 0
-        pt_index = istart - 1
-        for i in range(istart, iend + 1):
-            if i >= nu.point_count_u:
-                pt_index = i - nu.point_count_u
-            else:
-                pt_index += 1
-
-            sum_array[sum_index] = basisu[i] * nu.points[pt_index].co[3]
-            sumdiv += sum_array[sum_index]
-            sum_index += 1
-
-        if (sumdiv != 0.0) and (sumdiv < 1.0 - EPS or sumdiv > 1.0 + EPS):
-            sum_index = 0
-            for i in range(istart, iend + 1):
-                sum_array[sum_index] /= sumdiv
-                sum_index += 1
-
-        coord_array[coord_index: coord_index + 3] = (0.0, 0.0, 0.0)
-
-        sum_index = 0
-        pt_index = istart - 1
-        for i in range(istart, iend + 1):
-            if i >= nu.point_count_u:
-                pt_index = i - nu.point_count_u
-            else:
-                pt_index += 1
-
-            if sum_array[sum_index] != 0.0:
-                for j in range(3):
-                    coord_array[coord_index + j] += sum_array[sum_index] * nu.points[pt_index].co[j]
-            sum_index += 1
-
-        coord_index += stride
-        u += ustep
-
-    return coord_array
-
-
-def macro_knotsu(nu):
-    return nu.order_u + nu.point_count_u + (nu.order_u - 1 if nu.use_cyclic_u else 0)
-
-def macro_segmentsu(nu):
-    return nu.point_count_u if nu.use_cyclic_u else nu.point_count_u - 1
-
-def makeknots(nu):
-    knots = [0.0] * (4 + macro_knotsu(nu))
-    flag = nu.use_endpoint_u + (nu.use_bezier_u << 1)
-    if nu.use_cyclic_u:
-        calcknots(knots, nu.point_count_u, nu.order_u, 0)
-        makecyclicknots(knots, nu.point_count_u, nu.order_u)
-    else:
-        calcknots(knots, nu.point_count_u, nu.order_u, flag)
-    return knots
+# The basis functions of all samples are evaluated at once. They only depend on the knot vector, 
+# so they are cached by the signature of the spline and reused as long as only the control points change.
+NURBS_EPS = 1e-6
+
+
+# -----------------------------------------------------------------------------
+def nurbs_signature(_spline:Spline) -> tuple[int, int, bool, bool, bool]:
+    return _spline.order_u, _spline.point_count_u, _spline.use_cyclic_u, _spline.use_endpoint_u, _spline.use_bezier_u
+
+
+# -----------------------------------------------------------------------------
+@lru_cache(maxsize=64)
+def nurbs_knots(_order:int, _pnts:int, _cyclic:bool, _endpoint:bool, _bezier:bool) -> np.ndarray:
+    cycl  = _order - 1 if _cyclic else 0
+    knots = np.zeros(4 + _order + _pnts + cycl)
+    a     = np.arange(_pnts + _order)
+    flag  = 0 if _cyclic else _endpoint + (_bezier << 1)
 
-def calcknots(knots, pnts, order, flag):
-    pnts_order = pnts + order
     if flag == 1:
-        k = 0.0
-        for a in range(1, pnts_order + 1):
-            knots[a - 1] = k
-            if a >= order and a <= pnts:
-                k += 1.0
+        knots[:len(a)] = np.clip(a - _order + 1, 0, _pnts - _order + 1)
     elif flag == 2:
-        if order == 4:
-            k = 0.34
-            for a in range(pnts_order):
-                knots[a] = math.floor(k)
-                k += (1.0 / 3.0)
-        elif order == 3:
-            k = 0.6
-            for a in range(pnts_order):
-                if a >= order and a <= pnts:
-                    k += 0.5
-                    knots[a] = math.floor(k)
+        if _order == 4:
+            knots[:len(a)] = np.floor(0.34 + a / 3.0)
+        elif _order == 3:
+            inner = a[_order:_pnts + 1]
+            knots[inner] = np.floor(0.6 + 0.5 * (inner - _order + 1))
     else:
-        for a in range(pnts_order):
-            knots[a] = a
-
-def makecyclicknots(knots, pnts, order):
-    order2 = order - 1
-
-    if order > 2:
-        b = pnts + order2
-        for a in range(1, order2):
-            if knots[b] != knots[b - a]:
-                break
-
-            if a == order2:
-                knots[pnts + order - 2] += 1.0
-
-    b = order
-    c = pnts + order + order2
-    for a in range(pnts + order2, c):
-        knots[a] = knots[a - 1] + (knots[b] - knots[b - 1])
-        b -= 1
-
-def basisNurb(t, order, pnts, knots, basis, start, end):
-    i1 = i2 = 0
-    orderpluspnts = order + pnts
-    opp2 = orderpluspnts - 1
-
-    # this is for float inaccuracy
-    if t < knots[0]:
-        t = knots[0]
-    elif t > knots[opp2]:
-        t = knots[opp2]
-
-    # this part is order '1'
-    o2 = order + 1
-    for i in range(opp2):
-        if knots[i] != knots[i + 1] and t >= knots[i] and t <= knots[i + 1]:
-            basis[i] = 1.0
-            i1 = i - o2
-            if i1 < 0:
-                i1 = 0
-            i2 = i
-            i += 1
-            while i < opp2:
-                basis[i] = 0.0
-                i += 1
-            break
+        knots[:len(a)] = a
 
-        else:
-            basis[i] = 0.0
+    if _cyclic:
+        b = _order
 
-    basis[i] = 0.0
+        for k in range(_pnts + _order - 1, _pnts + _order + cycl):
+            knots[k] = knots[k - 1] + (knots[b] - knots[b - 1])
+            b -= 1
 
-    # this is order 2, 3, ...
-    for j in range(2, order + 1):
+    knots.flags.writeable = False
 
-        if i2 + j >= orderpluspnts:
-            i2 = opp2 - j
+    return knots
 
-        for i in range(i1, i2 + 1):
-            if basis[i] != 0.0:
-                d = ((t - knots[i]) * basis[i]) / (knots[i + j - 1] - knots[i])
-            else:
-                d = 0.0
 
-            if basis[i + 1] != 0.0:
-                e = ((knots[i + j] - t) * basis[i + 1]) / (knots[i + j] - knots[i + 1])
-            else:
-                e = 0.0
+# -----------------------------------------------------------------------------
+@lru_cache(maxsize=64)
+def nurbs_basis(_order:int, _pnts:int, _cyclic:bool, _endpoint:bool, _bezier:bool, _resolution:int) -> np.ndarray:
+    """
+    Returns the basis matrix of shape (samples, points). 
+    The columns of the cyclic extension are folded back onto the points they repeat.
+    """
+    knots = nurbs_knots(_order, _pnts, _cyclic, _endpoint, _bezier)
+
+    cycl     = _order - 1 if _cyclic else 0
+    segments = _pnts if _cyclic else _pnts - 1
+    samples  = _resolution * segments
+    opp2     = _order + _pnts + cycl - 1
+
+    ustart = knots[_order - 1]
+    uend   = knots[_pnts + _order - 1] if _cyclic else knots[_pnts]
+    ustep  = (uend - ustart) / max(samples - (0 if _cyclic else 1), 1)
+
+    t = np.clip(ustart + ustep * np.arange(samples), knots[0], knots[opp2])[:, None]
+
+    # Order 1: the first non-empty knot span that contains t
+    lo = knots[:opp2]
+    hi = knots[1:opp2 + 1]
+    inside = (lo != hi) & (t >= lo) & (t <= hi)
+    found  = inside.any(axis=1)
+
+    basis = np.zeros((samples, opp2 + 1))
+    basis[found, inside.argmax(axis=1)[found]] = 1.0
 
-            basis[i] = d + e
+    # Order 2, 3, ...
+    for j in range(2, _order + 1):
+        n  = opp2 - j + 1
+        b0 = basis[:, :n]
+        b1 = basis[:, 1:n + 1]
 
-    start = 1000
-    end = 0
+        d = np.divide((t - knots[:n]) * b0, knots[j - 1:j - 1 + n] - knots[:n], out=np.zeros_like(b0), where=b0 != 0.0)
+        e = np.divide((knots[j:j + n] - t) * b1, knots[j:j + n] - knots[1:n + 1], out=np.zeros_like(b1), where=b1 != 0.0)
+
+        basis[:, :n] = d + e
+
+    basis = basis[:, :_pnts + cycl]
+    basis[:, :cycl] += basis[:, _pnts:]
+    basis = np.ascontiguousarray(basis[:, :_pnts])
+    basis.flags.writeable = False
+
+    return basis
+
+
+# -----------------------------------------------------------------------------
+def evaluate_nurbs(_spline:Spline, _resolution:int) -> np.ndarray:
+    """
+    Returns the interpolated points of `_spline` as an array of shape (`_resolution` * segments, 3)
+    """
+    basis = nurbs_basis(*nurbs_signature(_spline), _resolution)
+
+    co = np.empty(len(_spline.points) * 4, dtype=np.float32)
+    _spline.points.foreach_get('co', co)
+    co = co.reshape(-1, 4).astype(np.float64)
+
+    weighted = basis * co[:, 3]
+    sumdiv   = weighted.sum(axis=1, keepdims=True)
+    rational = (sumdiv != 0.0) & (np.abs(sumdiv - 1.0) > NURBS_EPS)
+
+    np.divide(weighted, sumdiv, out=weighted, where=rational)
+
+    return weighted @ co[:, :3]
+
+
+# -----------------------------------------------------------------------------
+def interpolate_nurbs(nu:Spline, resolu:int, stride:int) -> list[float]:
+    """
+    Flat list of the interpolated coordinates, the points start `stride` floats apart
+    """
+    points = evaluate_nurbs(nu, resolu)
 
-    for i in range(i1, i2 + 1):
-        if basis[i] > 0.0:
-            end = i
-            if start == 1000:
-                start = i
+    coord_array = np.zeros((len(points), stride))
+    coord_array[:, :3] = points
 
-    return start, end
\ No newline at end of file
+    return coord_array.ravel().tolist()
@@ -0,0 +1,37 @@
+"""
+Loads the add-on from this checkout, so benchmarks can run with `blender --background --python`.
+"""
+
+import sys
+import importlib
+from pathlib import Path
+
+ADDON_DIR = Path(__file__).resolve().parent.parent
+
+
+# -----------------------------------------------------------------------------
+def import_module(_name:str):
+    """
+    Import a module of the add-on by its path relative to the add-on root, e.g. `src.t3d.builder`
+    """
+    if str(ADDON_DIR.parent) not in sys.path:
+        sys.path.insert(0, str(ADDON_DIR.parent))
+
+    return importlib.import_module(f'{ADDON_DIR.name}.{_name}' if _name else ADDON_DIR.name)
+
+
+# -----------------------------------------------------------------------------
+def load_addon():
+    """
+    Import and register the add-on, which adds the `medge_actor` property to objects
+    """
+    addon = import_module('')
+    addon.register()
+
+    return addon
+
+
+# -----------------------------------------------------------------------------
+def script_args() -> list[str]:
+    # Arguments after `--` are meant for the script, the others are Blender's
+    return sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:]
@@ -0,0 +1,60 @@
+"""
+Time to write one .ase per StaticMesh with one worker and with all cores.
+Meshes are subdivided cubes, so serialization dominates like it does for a prop library.
+
+    blender --background --python benchmarks/ase_export_bench.py -- [num_meshes] [subdivisions]
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _addon import load_addon, import_module, script_args
+
+
+# -----------------------------------------------------------------------------
+def create_static_meshes(_count:int, _subdivisions:int) -> list:
+    objects = []
+
+    for k in range(_count):
+        obj = b3d_utils.new_object(b3d_utils.create_cube(), f'SM_Bench_{k}')
+        modifier = obj.modifiers.new('Subdivision', 'SUBSURF')
+        modifier.levels = _subdivisions
+        props.get_actor_prop(obj).actor_type = 'STATIC_MESH'
+        objects.append(obj)
+
+    return objects
+
+
+# -----------------------------------------------------------------------------
+def main(_count:int, _subdivisions:int):
+    objects = create_static_meshes(_count, _subdivisions)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = os.path.join(tmp, 'bench.ase')
+
+        for workers in (1, 0):
+            start = time.perf_counter()
+            results = ase.export_static_meshes(objects, filepath, 100.0, _workers=workers)
+            seconds = time.perf_counter() - start
+
+            triangles = sum(r.triangles for r in results)
+            label = 'all cores' if workers == 0 else f'{workers} worker'
+
+            print(f'{label:<10} {len(results):>6} files {triangles:>10} triangles in {seconds:6.2f}s')
+
+
+# -----------------------------------------------------------------------------
+# The export workers are spawned and run this script again as `__mp_main__`, without bpy, so the add-on is only loaded here
+if __name__ == '__main__':
+    load_addon()
+
+    ase       = import_module('src.ase.exporter')
+    props     = import_module('src.props')
+    b3d_utils = import_module('b3d_utils')
+
+    args = script_args()
+    main(int(args[0]) if args else 200, int(args[1]) if len(args) > 1 else 3)
@@ -0,0 +1,59 @@
+"""
+Micro-benchmark of the T3D number formatting.
+Compares `format_points()` against formatting every point with `Point3D.__str__`.
+
+    python benchmarks/format_bench.py [num_points]
+"""
+
+import sys
+import random
+import timeit
+from pathlib import Path
+
+# The T3D actor model does not depend on bpy, so it is imported as the package `t3d` without Blender
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from t3d import scene
+
+
+# -----------------------------------------------------------------------------
+def legacy_point_str(_p) -> str:
+    # Point3D.__str__ before batch formatting: three format calls and an f-string
+    x = '{:.6f}'.format(_p.x)
+    y = '{:.6f}'.format(_p.y)
+    z = '{:.6f}'.format(_p.z)
+
+    return f'{x},{y},{z}'
+
+
+# -----------------------------------------------------------------------------
+def main(_count:int):
+    random.seed(0)
+    values = [random.uniform(-1e5, 1e5) for _ in range(_count * 3)]
+    points = [scene.Point3D(values[k:k + 3]) for k in range(0, len(values), 3)]
+
+    # The batch formatter reads the float32 values stored by the points
+    flat = [c for p in points for c in p]
+
+    legacy = [legacy_point_str(p) for p in points]
+    assert [str(p) for p in points] == legacy
+    assert scene.format_points(flat) == legacy
+
+    runs = {
+        'legacy Point3D.__str__': lambda: [legacy_point_str(p) for p in points],
+        'Point3D.__str__':        lambda: [str(p) for p in points],
+        'format_points':          lambda: scene.format_points(flat),
+    }
+
+    base = None
+
+    for name, fn in runs.items():
+        t = min(timeit.repeat(fn, number=1, repeat=5))
+        base = base or t
+        print(f'{name:<24} {t * 1000:9.2f} ms  {_count / t:12.0f} points/s  x{base / t:.2f}')
+
+
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:]
+    main(int(argv[0]) if argv else 100_000)
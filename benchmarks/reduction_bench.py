@@ -0,0 +1,67 @@
+"""
+Coplanar polygon merging on brushes in plain Python, without Blender.
+Every brush is a prism with triangulated sides and caps, like the output of a boolean modifier.
+
+    python benchmarks/reduction_bench.py [num_brushes] [faces_per_brush]
+"""
+
+import sys
+import time
+import math
+from pathlib import Path
+
+# The T3D actor model does not depend on bpy, so it is imported as the package `t3d` without Blender
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from t3d import scene, reduction
+
+
+# -----------------------------------------------------------------------------
+def triangulated_prism_polylist(_faces:int, _radius=128.0, _height=256.0) -> 'scene.PolyList':
+    sides = max(_faces - 2, 3)
+    ring = [(_radius * math.cos(math.tau * k / sides), _radius * math.sin(math.tau * k / sides)) for k in range(sides)]
+
+    polygons = []
+
+    for k in range(sides):
+        a, b = ring[k], ring[(k + 1) % sides]
+        polygons.append([(*a, 0), (*b, 0), (*b, _height)])
+        polygons.append([(*a, 0), (*b, _height), (*a, _height)])
+
+    for cap in ([(x, y, 0) for x, y in reversed(ring)], [(x, y, _height) for x, y in ring]):
+        polygons.extend([cap[0], cap[k], cap[k + 1]] for k in range(1, sides - 1))
+
+    verts = [c for polygon in polygons for v in polygon for c in v]
+    offsets = [0]
+
+    for polygon in polygons:
+        offsets.append(offsets[-1] + len(polygon))
+
+    zeros = [0.0] * 3 * len(polygons)
+
+    return scene.PolyList(zeros, zeros, zeros, zeros, verts, offsets, 'P_Bench.Materials.M_Concrete')
+
+
+# -----------------------------------------------------------------------------
+def main(_count:int, _faces:int):
+    polylists = [triangulated_prism_polylist(_faces) for _ in range(_count)]
+
+    start = time.perf_counter()
+    merged = [reduction.merge_coplanar(p) for p in polylists]
+    seconds = time.perf_counter() - start
+
+    before = sum(len(p) for p in polylists)
+    after = sum(len(m) for m in merged)
+    saved = sum(reduction.get_polylist_size(p) - reduction.get_polylist_size(m) for p, m in zip(polylists, merged))
+
+    print(f'brushes   {_count} prisms with {_faces} faces, triangulated')
+    print(f'polygons  {before} -> {after}')
+    print(f'size      {saved / (1024 * 1024):.1f} MB saved')
+    print(f'merge     {seconds:8.2f}s {_count / seconds:10.0f} brushes/s')
+
+
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 1000,
+         int(args[1]) if len(args) > 1 else 32)
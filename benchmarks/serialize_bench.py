@@ -0,0 +1,92 @@
+"""
+Serialization and writing of T3D actors in plain Python, without Blender.
+Times `str()` of every actor, `write_t3d` in this process and the same files written by the export pool.
+
+    python benchmarks/serialize_bench.py [num_brushes] [faces_per_brush] [files]
+"""
+
+import os
+import sys
+import time
+import math
+import tempfile
+from pathlib import Path
+
+# The T3D actor model does not depend on bpy, so it is imported as the package `t3d` without Blender
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from t3d import scene, writer, parallel
+
+
+# -----------------------------------------------------------------------------
+def prism_polylist(_faces:int, _radius=128.0, _height=256.0) -> 'scene.PolyList':
+    sides = max(_faces - 2, 3)
+    ring = [(_radius * math.cos(math.tau * k / sides), _radius * math.sin(math.tau * k / sides)) for k in range(sides)]
+
+    polygons = [[(*ring[k], 0), (*ring[(k + 1) % sides], 0), (*ring[(k + 1) % sides], _height), (*ring[k], _height)] for k in range(sides)]
+    polygons.append([(x, y, 0) for x, y in reversed(ring)])
+    polygons.append([(x, y, _height) for x, y in ring])
+
+    verts = [c for polygon in polygons for v in polygon for c in v]
+    offsets = [0]
+
+    for polygon in polygons:
+        offsets.append(offsets[-1] + len(polygon))
+
+    zeros = [0.0] * 3 * len(polygons)
+
+    return scene.PolyList(zeros, zeros, zeros, zeros, verts, offsets, 'P_Bench.Materials.M_Concrete')
+
+
+# -----------------------------------------------------------------------------
+def create_actors(_count:int, _faces:int) -> list:
+    polylist = prism_polylist(_faces)
+
+    return [scene.Brush(polylist, (k % 100 * 512, k // 100 * 512, 0), (0, 0, k * 0.01)) for k in range(_count)]
+
+
+# -----------------------------------------------------------------------------
+def timed(_fn) -> float:
+    start = time.perf_counter()
+    _fn()
+
+    return time.perf_counter() - start
+
+
+# -----------------------------------------------------------------------------
+def main(_count:int, _faces:int, _files:int):
+    actors = create_actors(_count, _faces)
+    chunks = [actors[k::_files] for k in range(_files)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f'bench_{k}.t3d') for k in range(_files)]
+
+        serialize = timed(lambda: [str(a) for a in actors])
+        write     = timed(lambda: [writer.write_t3d(p, c, 1 << 20) for p, c in zip(paths, chunks)])
+        size      = sum(os.path.getsize(p) for p in paths) / (1024 * 1024)
+
+        def pooled():
+            with parallel.T3DExportPool() as pool:
+                for p, c in zip(paths, chunks):
+                    pool.submit(parallel.T3DJob(p, c))
+
+                pool.results()
+
+            return pool.workers
+
+        start = time.perf_counter()
+        workers = pooled()
+        pool = time.perf_counter() - start
+
+    print(f'actors    {_count} brushes with {_faces} faces, {size:.1f} MB in {_files} files')
+    print(f'serialize {serialize:8.2f}s {_count / serialize:10.0f} actors/s')
+    print(f'write     {write:8.2f}s {size / write:10.1f} MB/s')
+    print(f'pool      {pool:8.2f}s {size / pool:10.1f} MB/s with {workers} workers')
+
+
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 2000,
+         int(args[1]) if len(args) > 1 else 32,
+         int(args[2]) if len(args) > 2 else 8)
@@ -0,0 +1,81 @@
+"""
+Per-actor overhead of T3DBuilder before and after the export session.
+Before: a mode switch, a builder instance and a depsgraph lookup for every object.
+After: one T3DExportSession that resolves these once.
+
+    blender --background --python benchmarks/session_bench.py -- [num_actors]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import bpy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _addon import load_addon, import_module, script_args
+
+load_addon()
+
+builder   = import_module('src.t3d.builder')
+props     = import_module('src.props')
+b3d_utils = import_module('b3d_utils')
+
+
+# -----------------------------------------------------------------------------
+def create_actors(_count:int, _actor_type:str) -> list:
+    objects = []
+
+    for k in range(_count):
+        obj = b3d_utils.new_object(b3d_utils.create_cube(), f'{_actor_type}_{k}')
+        props.get_actor_prop(obj).actor_type = _actor_type
+        objects.append(obj)
+
+    return objects
+
+
+# -----------------------------------------------------------------------------
+def legacy_overhead(_objects:list, _options, _paths):
+    for obj in _objects:
+        b3d_utils.set_object_mode(obj, 'OBJECT')
+        builder.BlockingVolumeBuilder(_options, _paths)
+        obj.evaluated_get(bpy.context.evaluated_depsgraph_get())
+
+
+# -----------------------------------------------------------------------------
+def session_overhead(_objects:list, _options, _paths):
+    session = builder.T3DExportSession(_options, _paths)
+
+    for obj in _objects:
+        session.get_builder(builder.BlockingVolumeBuilder)
+        session.evaluated(obj)
+
+
+# -----------------------------------------------------------------------------
+def timed(_fn, *_args) -> float:
+    start = time.perf_counter()
+    _fn(*_args)
+
+    return time.perf_counter() - start
+
+
+# -----------------------------------------------------------------------------
+def main(_count:int):
+    objects = create_actors(_count, 'BLOCKING_VOLUME')
+    options = builder.T3DBuilderOptions(100, None, 1.0, 1.0)
+    paths   = builder.CollectionPaths('GenericBrowser')
+
+    before = timed(legacy_overhead, objects, options, paths)
+    after  = timed(session_overhead, objects, options, paths)
+    build  = timed(builder.T3DBuilder().build, objects, options)
+
+    print(f'actors                   {_count}')
+    print(f'overhead before          {before / _count * 1e6:9.1f} us/actor')
+    print(f'overhead after           {after / _count * 1e6:9.1f} us/actor')
+    print(f'T3DBuilder.build         {build / _count * 1e6:9.1f} us/actor')
+
+
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+    args = script_args()
+    main(int(args[0]) if args else 2000)
@@ -0,0 +1,339 @@
+"""
+Benchmark suite for the export pipeline, on a generated scene of configurable size:
+brushes with a given number of faces, ladders, static meshes that use prefabs from nested GenericBrowser collections,
+ziplines and lights.
+
+Every benchmark takes `--repeat` samples of at least MIN_SAMPLE_SECONDS each, the fastest and the median sample are kept.
+Results are written as JSON.
+With a baseline, the fastest samples are compared and the run fails if one is slower than the allowed slowdown:
+`--tolerance`, or more if the benchmark is noisier than that, see `compare()`.
+The run also fails if the baseline was recorded with other scene options or another Blender version.
+Timings depend on the machine, so the baseline is not part of the repository:
+record one with --save-baseline on the machine that runs the suite.
+
+    blender --background --python benchmarks/suite.py -- [--brushes 500] [--faces 32] [--output results.json]
+    blender --background --python benchmarks/suite.py -- --save-baseline
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing  import Callable
+
+import bpy
+from bpy.app.handlers import depsgraph_update_post
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _addon import load_addon, import_module, script_args
+
+load_addon()
+
+props       = import_module('src.props')
+scene       = import_module('src.t3d.scene')
+builder     = import_module('src.t3d.builder')
+ase_builder = import_module('src.ase.builder')
+validation  = import_module('src.t3d.validation')
+b3d_utils   = import_module('b3d_utils')
+
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+# Short benchmarks are called repeatedly until a sample takes this long, so timer resolution and scheduling hiccups average out
+MIN_SAMPLE_SECONDS = 0.05
+
+
+# -----------------------------------------------------------------------------
+# Scene
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def create_prism(_faces:int, _radius=2.0, _height=4.0):
+    """
+    Closed prism with `_faces` faces: two caps and `_faces - 2` sides
+    """
+    sides = max(_faces - 2, 3)
+    ring = [(_radius * math.cos(2 * math.pi * k / sides), _radius * math.sin(2 * math.pi * k / sides)) for k in range(sides)]
+
+    verts = [(x, y, 0) for x, y in ring] + [(x, y, _height) for x, y in ring]
+    faces = [(k, (k + 1) % sides, sides + (k + 1) % sides, sides + k) for k in range(sides)]
+    faces.append(tuple(reversed(range(sides))))
+    faces.append(tuple(range(sides, 2 * sides)))
+
+    return b3d_utils.new_mesh(verts, [], faces, 'Prism')
+
+
+# -----------------------------------------------------------------------------
+def grid_location(_index:int, _spacing=8.0) -> tuple[float, float, float]:
+    return (_index % 50 * _spacing, _index // 50 * _spacing, 0)
+
+
+# -----------------------------------------------------------------------------
+def generate_scene(_args:argparse.Namespace) -> dict[str, list]:
+    objects = {name: [] for name in ('brushes', 'ladders', 'static_meshes', 'prefabs', 'ziplines', 'lights')}
+
+    # GenericBrowser packages with nested groups, the prefabs are the meshes of the static meshes
+    b3d_utils.new_collection('GenericBrowser')
+
+    for p in range(_args.packages):
+        package = f'P_Bench_{p}'
+        b3d_utils.new_collection(package, 'GenericBrowser')
+
+        for g in range(_args.groups):
+            group = f'{package}_Group_{g}'
+            b3d_utils.new_collection(group, package)
+
+            prefab = b3d_utils.new_object(create_prism(8, 1.0, 1.0), f'S_Prefab_{p}_{g}', group)
+            objects['prefabs'].append(prefab)
+
+    for k in range(_args.brushes):
+        obj = props.new_actor(scene.ActorType.BRUSH, create_prism(_args.faces))
+        obj.location = grid_location(k)
+        objects['brushes'].append(obj)
+
+    for k in range(_args.ladders):
+        obj = props.new_actor(scene.ActorType.LADDER_VOLUME)
+        obj.location = grid_location(k, 12.0)
+        objects['ladders'].append(obj)
+
+    for k in range(_args.static_meshes):
+        obj = props.new_actor(scene.ActorType.STATIC_MESH, create_prism(_args.faces, 1.0, 1.0))
+        obj.location = grid_location(k, 4.0)
+        objects['static_meshes'].append(obj)
+
+        # Half of them use a prefab, these are skipped by the ASE export
+        if k % 2 and objects['prefabs']:
+            static_mesh = props.get_actor_prop(obj).static_mesh
+            static_mesh.use_prefab = True
+            static_mesh.prefab = objects['prefabs'][k % len(objects['prefabs'])]
+
+    for k in range(_args.ziplines):
+        obj = props.new_actor(scene.ActorType.ZIPLINE)
+        obj.location = grid_location(k, 20.0)
+        objects['ziplines'].append(obj)
+
+    for k in range(_args.lights):
+        light_type = ('POINT', 'SPOT', 'AREA', 'SUN')[k % 4]
+        light = bpy.data.lights.new(f'Light_{k}', light_type)
+        obj = b3d_utils.new_object(light, f'Light_{k}')
+        obj.location = (*grid_location(k, 16.0)[:2], 10)
+        objects['lights'].append(obj)
+
+    bpy.context.view_layer.update()
+
+    return objects
+
+
+# -----------------------------------------------------------------------------
+# Benchmarks
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def summarize(_timings:list[float]) -> dict[str, float]:
+    return {'min': min(_timings), 'median': statistics.median(_timings)}
+
+
+# -----------------------------------------------------------------------------
+def sample(_repeat:int, _fn:Callable, *_args) -> dict[str, float]:
+    """
+    Seconds per call of `_fn`, the fastest and the median of `_repeat` samples.
+    Each sample calls `_fn` until at least MIN_SAMPLE_SECONDS have passed.
+    """
+    timings = []
+
+    for _ in range(_repeat):
+        calls = 0
+        start = time.perf_counter()
+
+        while (elapsed := time.perf_counter() - start) < MIN_SAMPLE_SECONDS or not calls:
+            _fn(*_args)
+            calls += 1
+
+        timings.append(elapsed / calls)
+
+    return summarize(timings)
+
+
+# -----------------------------------------------------------------------------
+def time_depsgraph_handler(_obj, _samples:int) -> dict[str, float]:
+    # Move an object and time the handler call that follows, like an edit in the viewport.
+    # Every call needs its own update, so calls are not grouped into longer samples, there are more of them instead
+    timings = []
+
+    def timed(_scene, _depsgraph):
+        start = time.perf_counter()
+        props.on_depsgraph_update_post(_scene, _depsgraph)
+        timings.append(time.perf_counter() - start)
+
+    depsgraph_update_post.remove(props.on_depsgraph_update_post)
+    depsgraph_update_post.append(timed)
+
+    try:
+        for k in range(_samples):
+            _obj.location.z = k * 0.01
+            bpy.context.view_layer.update()
+    finally:
+        depsgraph_update_post.remove(timed)
+        depsgraph_update_post.append(props.on_depsgraph_update_post)
+
+    return summarize(timings or [0.0])
+
+
+# -----------------------------------------------------------------------------
+def run(_args:argparse.Namespace, _objects:dict[str, list]) -> dict[str, dict[str, float]]:
+    results = {}
+    repeat = _args.repeat
+
+    actors = [obj for objs in _objects.values() for obj in objs if obj not in _objects['prefabs']]
+    options = builder.T3DBuilderOptions(100.0, None, 1.0, 1.0)
+
+    results['t3d_build'] = sample(repeat, lambda: builder.T3DBuilder().build(actors, options))
+
+    merged = builder.T3DBuilderOptions(100.0, None, 1.0, 1.0, True)
+    results['t3d_build_merged'] = sample(repeat, lambda: builder.T3DBuilder().build(actors, merged))
+
+    built = builder.T3DBuilder().build(actors, options)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = os.path.join(tmp, 'suite.t3d')
+        results['t3d_write'] = sample(repeat, lambda: builder.write_t3d(filepath, built))
+        results['t3d_stream'] = sample(repeat, lambda: builder.T3DBuilder().stream(actors, options, filepath))
+
+    if _objects['ziplines']:
+        results['depsgraph_update_post'] = time_depsgraph_handler(_objects['ziplines'][0], max(repeat, 50))
+
+        splines = [props.get_actor_prop(obj).zipline.curve.data.splines[0] for obj in _objects['ziplines']]
+        results['interpolate_nurbs'] = sample(repeat, lambda: [b3d_utils.interpolate_nurbs(s, 12, 3) for s in splines])
+
+    results['mesh_bounds'] = sample(repeat, lambda: [b3d_utils.mesh_bounds(obj) for obj in _objects['brushes']])
+    results['mesh_bounds_array'] = sample(repeat, lambda: b3d_utils.mesh_bounds_array(_objects['brushes']))
+
+    b3d_utils.mesh_bounds_array(_objects['brushes'], True)
+    results['mesh_bounds_cached'] = sample(repeat, lambda: b3d_utils.mesh_bounds_array(_objects['brushes'], True))
+    b3d_utils.mesh_bounds_cache.invalidate()
+
+    # All pairs within brushes and static meshes, and ladders against brushes like a buried ladder check
+    volumes = _objects['brushes'] + _objects['static_meshes']
+    results['scene_bvh_build'] = sample(repeat, lambda: (b3d_utils.scene_bvh.invalidate(), b3d_utils.scene_bvh.overlaps(volumes)))
+    results['scene_bvh_cached'] = sample(repeat, lambda: b3d_utils.scene_bvh.overlaps(volumes))
+    results['scene_bvh_ladders'] = sample(repeat, lambda: b3d_utils.scene_bvh.overlaps(_objects['ladders'], _objects['brushes']))
+    b3d_utils.scene_bvh.invalidate()
+
+    # The first pass checks every brush, later passes take the brush geometry from the cache
+    results['validate_cold'] = sample(repeat, lambda: (validation.brush_geometry_cache.invalidate(), validation.validate(actors)))
+    results['validate'] = sample(repeat, lambda: validation.validate(actors))
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    static_meshes = [obj for obj in _objects['static_meshes'] if not props.get_actor_prop(obj).static_mesh.use_prefab]
+    results['ase_build_geometry'] = sample(repeat, lambda: [ase_builder.build_geometry(obj, depsgraph, 100.0) for obj in static_meshes])
+
+    return results
+
+
+# -----------------------------------------------------------------------------
+# Baseline
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def get_noise(_timings:dict[str, float]) -> float:
+    # How much slower the median sample is than the fastest one
+    return _timings['median'] / _timings['min'] - 1.0 if _timings['min'] > 0 else 0.0
+
+
+# -----------------------------------------------------------------------------
+def compare(_results:dict[str, dict], _baseline:dict[str, dict], _tolerance:float) -> list[str]:
+    """
+    Returns the names of the benchmarks whose fastest sample is slower than the baseline allows.
+    The allowed slowdown is `_tolerance`, or three times the noise of the benchmark in either run if that is larger,
+    so that a benchmark whose samples spread by 30% is not reported for being 30% slower.
+    """
+    regressions = []
+
+    print(f'{"benchmark":<24} {"seconds":>10} {"baseline":>10} {"ratio":>7} {"allowed":>8}')
+
+    for name, timings in _results.items():
+        seconds = timings['min']
+
+        if (base := _baseline.get(name)) is None or base['min'] <= 0:
+            print(f'{name:<24} {seconds:>10.4f} {"-":>10} {"-":>7} {"-":>8}')
+            continue
+
+        ratio = seconds / base['min']
+        allowed = max(_tolerance, 3 * get_noise(timings), 3 * get_noise(base))
+        mark = ''
+
+        if ratio > 1.0 + allowed:
+            regressions.append(name)
+            mark = '  REGRESSION'
+
+        print(f'{name:<24} {seconds:>10.4f} {base["min"]:>10.4f} {ratio:>6.2f}x {1.0 + allowed:>7.2f}x{mark}')
+
+    return regressions
+
+
+# -----------------------------------------------------------------------------
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='suite.py')
+    parser.add_argument('--brushes',       type=int, default=500)
+    parser.add_argument('--faces',         type=int, default=32, help='Faces per brush and per static mesh')
+    parser.add_argument('--ladders',       type=int, default=100)
+    parser.add_argument('--static-meshes', type=int, default=500)
+    parser.add_argument('--ziplines',      type=int, default=50)
+    parser.add_argument('--lights',        type=int, default=100)
+    parser.add_argument('--packages',      type=int, default=4)
+    parser.add_argument('--groups',        type=int, default=8, help='Groups per package')
+    parser.add_argument('--repeat',        type=int, default=5)
+    parser.add_argument('--output',        default='benchmark_results.json')
+    parser.add_argument('--baseline',      default=str(BASELINE))
+    parser.add_argument('--tolerance',     type=float, default=0.5, help='Smallest allowed slowdown against the baseline, 0.5 is 50%%. Wider than the run to run drift of a busy machine')
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results to the baseline instead of comparing')
+
+    return parser.parse_args(script_args())
+
+
+# -----------------------------------------------------------------------------
+def main():
+    args = parse_args()
+    objects = generate_scene(args)
+    results = run(args, objects)
+
+    config = {k: v for k, v in vars(args).items() if k not in {'output', 'baseline', 'tolerance', 'save_baseline'}}
+    report = {'blender': bpy.app.version_string, 'config': config, 'results': results}
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        print(f'Baseline written to {args.baseline}')
+        return
+
+    if not os.path.exists(args.baseline):
+        compare(results, {}, args.tolerance)
+        print(f'No baseline at {args.baseline}, run with --save-baseline to create one')
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    if baseline.get('blender') != bpy.app.version_string:
+        sys.exit(f'The baseline was recorded with Blender {baseline.get("blender")}, this is {bpy.app.version_string}, '
+                 'record a new baseline with --save-baseline')
+
+    # Timings of different scenes cannot be compared
+    if (recorded := baseline.get('config', {})) != config:
+        differences = ', '.join(f'{k} {recorded.get(k)} != {config.get(k)}' for k in sorted(recorded.keys() | config.keys()) if recorded.get(k) != config.get(k))
+        sys.exit(f'The baseline was recorded with a different scene configuration ({differences}), '
+                 'run with the same options or record a new baseline with --save-baseline')
+
+    if (regressions := compare(results, baseline['results'], args.tolerance)):
+        print(f'{len(regressions)} benchmarks regressed: {", ".join(regressions)}')
+        sys.exit(1)
+
+
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Throughput of the T3D importer in MB/s, for parsing only and for creating the actors.
+Without a file, a map of volumes and static meshes is generated with the exporter classes.
+
+    blender --background --python benchmarks/t3d_import_bench.py -- [file.t3d | num_actors]
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+import bpy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _addon import load_addon, import_module, script_args
+
+load_addon()
+
+scene    = import_module('src.t3d.scene')
+writer   = import_module('src.t3d.writer')
+parser   = import_module('src.t3d.parser')
+importer = import_module('src.t3d.importer')
+builder  = import_module('src.t3d.builder')
+
+
+# -----------------------------------------------------------------------------
+def cube_polylist(_size:float) -> 'scene.PolyList':
+    s = _size
+    corners = [(-s, -s, -s), (s, -s, -s), (s, s, -s), (-s, s, -s), (-s, -s, s), (s, -s, s), (s, s, s), (-s, s, s)]
+    faces = [(0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)]
+
+    verts = [c for f in faces for k in f for c in corners[k]]
+    zeros = [0.0] * 3 * len(faces)
+
+    return scene.PolyList(zeros, zeros, zeros, zeros, verts, range(0, 4 * len(faces) + 1, 4))
+
+
+# -----------------------------------------------------------------------------
+def generate(_filepath:str, _count:int):
+    polylist = str(cube_polylist(64))
+
+    def actors():
+        for k in range(_count):
+            location = (k % 100 * 256, k // 100 * 256, 0)
+
+            if k % 2:
+                yield scene.BlockingVolume(polylist, location, (0, 0, 0))
+            else:
+                yield scene.StaticMesh(location, (0, 0, k * 0.1), (1, 1, 1), 'P_Generic.Boxes.S_Box')
+
+    writer.write_t3d(_filepath, actors())
+
+
+# -----------------------------------------------------------------------------
+def main(_filepath:str):
+    size = os.path.getsize(_filepath) / (1024 * 1024)
+
+    start = time.perf_counter()
+
+    with parser.open_t3d(_filepath) as f:
+        count = sum(1 for _ in parser.iter_actors(f))
+
+    seconds = time.perf_counter() - start
+    print(f'parse   {count:>8} actors {size:8.1f} MB in {seconds:6.2f}s {size / seconds:8.1f} MB/s')
+
+    options = importer.T3DImportOptions(100.0, 1.0)
+    collection = bpy.data.collections.new('T3D_Import_Bench')
+    bpy.context.scene.collection.children.link(collection)
+
+    stats = importer.T3DImporter(options, collection).load(_filepath)
+    rss = builder.get_peak_rss()
+
+    print(f'import  {stats.actors:>8} actors {size:8.1f} MB in {stats.seconds:6.2f}s {stats.megabytes_per_second:8.1f} MB/s')
+    print(f'skipped {stats.skipped}, peak RSS {rss / (1024 * 1024):.0f} MB' if rss else f'skipped {stats.skipped}')
+
+
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+    args = script_args()
+
+    if args and not args[0].isdigit():
+        main(args[0])
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            filepath = os.path.join(tmp, 'bench.t3d')
+            generate(filepath, int(args[0]) if args else 10_000)
+            main(filepath)
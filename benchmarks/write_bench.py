@@ -0,0 +1,66 @@
+"""
+Throughput of T3DWriter against the previous writer, which wrote every actor to a text mode file.
+Actors are serialized once and repeated until the output reaches the requested size, so only writing is timed.
+
+    python benchmarks/write_bench.py [megabytes] [encoding]
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# The T3D actor model does not depend on bpy, so it is imported as the package `t3d` without Blender
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from t3d import writer
+from serialize_bench import create_actors
+
+
+# -----------------------------------------------------------------------------
+def legacy_write(_filepath:str, _actors:list[str], _newline:str=None, _encoding:str=None):
+    # T3DBuilder.write before chunked writing: one write per actor to a text mode file.
+    # On Windows that file translated newlines to CRLF and encoded with the ANSI code page.
+    with open(_filepath, 'w', newline=_newline, encoding=_encoding) as f:
+        f.write(writer.HEADER)
+
+        for actor in _actors:
+            f.write(actor)
+
+        f.write(writer.FOOTER)
+
+
+# -----------------------------------------------------------------------------
+def timed(_fn, *_args) -> float:
+    start = time.perf_counter()
+    _fn(*_args)
+
+    return time.perf_counter() - start
+
+
+# -----------------------------------------------------------------------------
+def main(_megabytes:int, _encoding:str):
+    fragments = [str(a) for a in create_actors(100, 32)]
+    size = sum(len(f) for f in fragments)
+    actors = fragments * max(1, _megabytes * 1024 * 1024 // size)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = os.path.join(tmp, 'bench.t3d')
+
+        runs = {
+            'legacy text writes': lambda: legacy_write(filepath, actors),
+            'legacy as on Windows': lambda: legacy_write(filepath, actors, '\r\n', 'cp1252'),
+            f'T3DWriter {_encoding}': lambda: writer.write_t3d(filepath, actors, 1 << 20, _encoding),
+        }
+
+        for name, fn in runs.items():
+            seconds = timed(fn)
+            megabytes = os.path.getsize(filepath) / (1024 * 1024)
+            print(f'{name:<24} {megabytes:8.1f} MB in {seconds:6.2f}s {megabytes / seconds:8.1f} MB/s')
+
+
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 300, args[1] if len(args) > 1 else writer.ENCODING)
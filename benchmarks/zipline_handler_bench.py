@@ -0,0 +1,88 @@
+"""
+Cost of the zipline depsgraph handler as the scene grows.
+Every sample moves one object and times the handler call that follows, 
+for the registry based handler and for the previous full scene scan.
+
+    blender --background --python benchmarks/zipline_handler_bench.py -- [sizes...]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import bpy
+from bpy.app.handlers import depsgraph_update_post
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _addon import load_addon, import_module, script_args
+
+load_addon()
+
+props = import_module('src.props')
+scene = import_module('src.t3d.scene')
+
+
+# -----------------------------------------------------------------------------
+def legacy_handler(_scene, _depsgraph):
+    # on_depsgraph_update_post before the zipline registry
+    for obj in _scene.objects:
+        actor = props.get_actor_prop(obj)
+
+        match(actor.actor_type):
+            case scene.ActorType.ZIPLINE.name:
+                actor.zipline.update_bounds()
+
+
+# -----------------------------------------------------------------------------
+def fill_scene(_count:int):
+    coll = bpy.context.scene.collection
+
+    for k in range(len(bpy.context.scene.objects), _count):
+        coll.objects.link(bpy.data.objects.new(f'Empty_{k}', None))
+
+
+# -----------------------------------------------------------------------------
+def time_handler(_handler, _samples=50) -> float:
+    timings = []
+
+    def timed(_scene, _depsgraph):
+        start = time.perf_counter()
+        _handler(_scene, _depsgraph)
+        timings.append(time.perf_counter() - start)
+
+    depsgraph_update_post.append(timed)
+
+    obj = bpy.context.scene.objects[0]
+
+    for k in range(_samples):
+        obj.location.x = k
+        bpy.context.view_layer.update()
+
+    depsgraph_update_post.remove(timed)
+
+    return sum(timings) / max(len(timings), 1)
+
+
+# -----------------------------------------------------------------------------
+def main(_sizes:list[int]):
+    # Time the handlers in isolation
+    depsgraph_update_post.remove(props.on_depsgraph_update_post)
+
+    for k in range(4):
+        props.new_actor(scene.ActorType.ZIPLINE).location.y = k * 10
+
+    print(f'{"objects":>8} {"registry":>12} {"full scan":>12}')
+
+    for size in _sizes:
+        fill_scene(size)
+
+        registry = time_handler(props.on_depsgraph_update_post)
+        legacy   = time_handler(legacy_handler)
+
+        print(f'{size:>8} {registry * 1e6:>9.1f} us {legacy * 1e6:>9.1f} us')
+
+
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+    args = script_args()
+    main([int(a) for a in args] if args else [1000, 5000, 20000])
@@ -0,0 +1,79 @@
+import bpy
+from bpy.types import Object, Depsgraph
+
+import numpy as np
+
+from .writer import ASEGeometry, DEFAULT_MATERIAL
+
+
+# -----------------------------------------------------------------------------
+def get_geometry_name(_obj:Object) -> str:
+    # UnrealEd uses dots to separate packages and groups
+    return _obj.name.replace('.', '_')
+
+
+# -----------------------------------------------------------------------------
+def get_material_names(_obj_eval:Object) -> list[str]:
+    names = [slot.material.name if slot.material else DEFAULT_MATERIAL for slot in _obj_eval.material_slots]
+
+    return names or [DEFAULT_MATERIAL]
+
+
+# -----------------------------------------------------------------------------
+def build_geometry(_obj:Object, _depsgraph:Depsgraph, _unit_scale:float) -> ASEGeometry:
+    """
+    Reads the evaluated mesh of `_obj` in object space, curves and modifiers included, without adding anything to the scene.
+    The external ASE exporter rotated models 180 degrees around the z-axis, which had to be undone by mirroring x and y.
+    Here the two cancel out, so the vertices are written as they are.
+    """
+    obj_eval = _obj.evaluated_get(_depsgraph)
+    mesh = obj_eval.to_mesh()
+
+    try:
+        mesh.calc_loop_triangles()
+
+        if bpy.app.version < (4, 1, 0):
+            mesh.calc_normals_split()
+
+        tris = mesh.loop_triangles
+        count = len(tris)
+
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', co)
+
+        faces = np.empty(count * 3, dtype=np.int32)
+        loops = np.empty(count * 3, dtype=np.int32)
+        material_indices = np.empty(count, dtype=np.int32)
+        smooth = np.empty(count, dtype=bool)
+        face_normals = np.empty(count * 3, dtype=np.float32)
+        vertex_normals = np.empty(count * 9, dtype=np.float32)
+
+        tris.foreach_get('vertices', faces)
+        tris.foreach_get('loops', loops)
+        tris.foreach_get('material_index', material_indices)
+        tris.foreach_get('use_smooth', smooth)
+        tris.foreach_get('normal', face_normals)
+        tris.foreach_get('split_normals', vertex_normals)
+
+        if (uv_layer := mesh.uv_layers.active):
+            uv = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+            uv_layer.data.foreach_get('uv', uv)
+            uvs = uv.reshape(-1, 2)[loops]
+        else:
+            uvs = np.zeros((count * 3, 2), dtype=np.float32)
+
+        materials = get_material_names(obj_eval)
+        np.clip(material_indices, 0, len(materials) - 1, out=material_indices)
+
+    finally:
+        obj_eval.to_mesh_clear()
+
+    return ASEGeometry(get_geometry_name(_obj),
+                       co.reshape(-1, 3) * np.float32(_unit_scale),
+                       faces.reshape(-1, 3),
+                       material_indices,
+                       smooth.astype(np.int32),
+                       uvs,
+                       face_normals.reshape(-1, 3),
+                       vertex_normals.reshape(-1, 3),
+                       materials)
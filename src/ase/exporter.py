@@ -1,12 +1,16 @@
 import bpy
-from bpy.props           import StringProperty, BoolProperty, EnumProperty
+from bpy.props           import StringProperty, BoolProperty, EnumProperty, IntProperty
 from bpy.types           import Operator, Context, Object, TOPBAR_MT_file_export
 from bpy_extras.io_utils import ExportHelper
-from mathutils           import Matrix
+
+import os.path
+import time
 
 from ...         import b3d_utils
 from ..props     import get_actor_prop
 from ..t3d.scene import ActorType
+from .builder    import build_geometry
+from .parallel   import ASEExportPool, ASEJob, ASEJobResult
 
 
 # -----------------------------------------------------------------------------
@@ -16,7 +20,7 @@ class ASEExportError(Exception):
 
 # -----------------------------------------------------------------------------
 class MET_OT_ASE_Export(Operator, ExportHelper):
-    '''Process selection before exporting to .ase files'''
+    '''Export StaticMesh actors to .ase files'''
     bl_idname = 'medge_map_editor.ase_export'
     bl_label = 'Export ASE'
     bl_space_type = 'PROPERTIES'
@@ -35,6 +39,11 @@ class MET_OT_ASE_Export(Operator, ExportHelper):
         name='Combine Meshes')
 
 
+    units_scale = {
+        'M': 100.0,
+        'U': 1.0}
+
+
     units: EnumProperty(
         default='M',
         items=(('M', 'Meters', ''),
@@ -52,6 +61,13 @@ class MET_OT_ASE_Export(Operator, ExportHelper):
         default=False)
 
 
+    workers: IntProperty(
+        name='Workers', 
+        min=0, 
+        default=0, 
+        description='Number of worker processes that write the .ase files. 0 uses all cores, 1 writes one file at a time in Blender. Starting the workers takes a moment, so few small files are faster with 1')
+
+
     def draw(self, _context:Context):
         layout = self.layout
         layout.use_property_decorate = False
@@ -66,16 +82,11 @@ class MET_OT_ASE_Export(Operator, ExportHelper):
 
         layout.prop(self, 'combine_meshes')
 
+        if not self.combine_meshes:
+            layout.prop(self, 'workers')
 
-    def execute(self, _context:Context):
-        # Apply transforms to temporary copies and mirror x-axis
-        temp_objs_to_export = []
-
-        # To convert curves to mesh we create a new mesh to keep the curve intact.
-        # But the new mesh needs the name of the original mesh, because the original name is what is written to .t3d.
-        # Therefore, swap the names before export and swap back after.
-        orig_obj_names = []
 
+    def execute(self, _context:Context):
         objects = _context.scene.objects
 
         if self.selected_collection:
@@ -84,80 +95,67 @@ class MET_OT_ASE_Export(Operator, ExportHelper):
         elif self.selected_objects:
             objects = _context.selected_objects
 
-        for obj in objects:
-            me_actor = get_actor_prop(obj)
+        try:
+            start = time.perf_counter()
+            results = export_static_meshes(objects, self.filepath, self.units_scale[self.units], self.combine_meshes, self.workers)
+            count = sum(r.geometries for r in results)
 
-            if me_actor.actor_type != ActorType.STATIC_MESH.name: continue
-            if me_actor.static_mesh.use_prefab: continue
+            self.report({'INFO'}, f'ASE exported successful: {count} StaticMeshes in {time.perf_counter() - start:.2f}s')
 
-            # Convert to mesh
-            if obj.type == 'CURVE':
-                new_obj = b3d_utils.duplicate_object(obj, False)
-                b3d_utils.convert_to_mesh_in_place(new_obj)
+        except (ASEExportError, OSError) as e:
+            self.report({'ERROR'}, str(e))
 
-            else:
-                new_obj = b3d_utils.duplicate_object(obj, False)
-            
-            # This will translate the object origin to the world origin
-            new_obj.parent = None
+        return {'FINISHED'}
 
-            # Mirror x, y because the ASE exporter rotates the models 180 degrees around z-axis, around the origin
-            b3d_utils.transform(new_obj.data, [Matrix.Scale(-1, 3, (1, 0, 0)), Matrix.Scale(-1, 3, (0, 1, 0))])
 
-            temp_objs_to_export.append(new_obj)
-            orig_obj_names.append((obj, obj.name))
-            
-            self.__swap_names(obj, new_obj)
+# -----------------------------------------------------------------------------
+def get_static_meshes(_objects:list[Object]) -> list[Object]:
+    static_meshes = []
 
-        self.__check_material(temp_objs_to_export)
-        self.__format_names(temp_objs_to_export)
+    for obj in _objects:
+        if obj.type not in {'MESH', 'CURVE'}: continue
 
-        # Select objects to export
-        b3d_utils.deselect_all_objects()
+        me_actor = get_actor_prop(obj)
 
-        for obj in temp_objs_to_export:
-            b3d_utils.select_object(obj)
+        if me_actor.actor_type != ActorType.STATIC_MESH.name: continue
+        if me_actor.static_mesh.use_prefab: continue
 
-        try:
-            bpy.ops.io_scene_ase.ase_export(filepath=self.filepath, units=self.units, combine_meshes=self.combine_meshes)
-            self.report({'INFO'}, 'ASE exported successful')
+        static_meshes.append(obj)
 
-        except ASEExportError as e:
-            self.report({'ERROR'}, str(e))
-        
-        # Remove temp objects first before swapping names, 
-        # otherwise Blender thinks there are two objects with the same name and adds a .001
-        for obj in temp_objs_to_export:
-            b3d_utils.remove_object(obj)
-
-        # Restore original names
-        for obj, name in orig_obj_names:
-            obj.name = name
-            
-        return {'FINISHED'}
-    
+    return static_meshes
+
+
+# -----------------------------------------------------------------------------
+def export_static_meshes(_objects:list[Object], _filepath:str, _unit_scale:float, _combine_meshes=False, _workers=0) -> list[ASEJobResult]:
+    """
+    Writes the StaticMesh actors in `_objects` to `_filepath` if `_combine_meshes`, 
+    otherwise to one `<name>.ase` per mesh in the directory of `_filepath`.
+    Meshes are read in the main thread, bpy is not thread safe, and are serialized and written in `_workers` processes.
+    """
+    if not (static_meshes := get_static_meshes(_objects)):
+        raise ASEExportError('No StaticMesh actors to export')
+
+    # Evaluated meshes are only up to date outside edit mode
+    if (active := bpy.context.object) and active.mode != 'OBJECT':
+        b3d_utils.set_object_mode(active, 'OBJECT')
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
 
-    # Add default material if missing; required for ASE Export
-    def __check_material(self, _objects:list[Object]):
-        for obj in _objects:
-            if len(obj.data.materials) > 0: continue
-            
-            mat = bpy.data.materials.get('ME_Default')
-            if mat is None:
-                mat = bpy.data.materials.new(name='ME_Default')
-            obj.data.materials.append(mat)
-            obj.active_material_index = len(obj.data.materials) - 1 
+    if _combine_meshes:
+        _workers = 1
 
+    with ASEExportPool(_workers) as pool:
+        if _combine_meshes:
+            pool.submit(ASEJob(_filepath, [build_geometry(obj, depsgraph, _unit_scale) for obj in static_meshes]))
 
-    def __swap_names(self, _source:Object, _target:Object):
-            temp = _source.name
-            _source.name = _target.name
-            _target.name = temp
+        else:
+            dir = os.path.dirname(_filepath)
 
+            for obj in static_meshes:
+                geometry = build_geometry(obj, depsgraph, _unit_scale)
+                pool.submit(ASEJob(os.path.join(dir, geometry.name + '.ase'), [geometry]))
 
-    def __format_names(self, _objects:list[Object]):
-        for obj in _objects:
-            obj.name = obj.name.replace('.', '_')
+        return pool.results()
 
 
 # -----------------------------------------------------------------------------
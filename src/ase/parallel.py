@@ -0,0 +1,38 @@
+import time
+from dataclasses import dataclass
+
+from ..t3d.parallel import T3DExportPool
+from .writer        import ASEGeometry, write_ase
+
+
+# -----------------------------------------------------------------------------
+@dataclass
+class ASEJob:
+    filepath : str
+    geometries : list[ASEGeometry] # NumPy arrays, pickled to the worker as one buffer each
+
+
+# -----------------------------------------------------------------------------
+@dataclass
+class ASEJobResult:
+    filepath : str
+    geometries : int
+    triangles : int
+    seconds : float
+
+
+# -----------------------------------------------------------------------------
+def run_ase_job(_job:ASEJob) -> ASEJobResult:
+    start = time.perf_counter()
+    write_ase(_job.filepath, _job.geometries)
+    triangles = sum(len(g.faces) for g in _job.geometries)
+
+    return ASEJobResult(_job.filepath, len(_job.geometries), triangles, time.perf_counter() - start)
+
+
+# -----------------------------------------------------------------------------
+class ASEExportPool(T3DExportPool):
+    """
+    Serializes and writes .ase files in worker processes, while the main thread reads the next mesh
+    """
+    run_job = staticmethod(run_ase_job)
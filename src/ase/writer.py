@@ -0,0 +1,130 @@
+import numpy as np
+from dataclasses import dataclass, field
+from typing      import Iterable
+
+
+DEFAULT_MATERIAL = 'ME_Default'
+
+
+# -----------------------------------------------------------------------------
+@dataclass
+class ASEGeometry:
+    """
+    Triangulated mesh in the layout of the ASE format, every array has one row per triangle or per triangle corner.
+    Does not depend on bpy, so it can be sent to worker processes.
+    """
+    name : str
+    vertices : np.ndarray                # (vertices, 3) float32
+    faces : np.ndarray                   # (triangles, 3) vertex indices
+    material_indices : np.ndarray        # (triangles,)
+    smoothing : np.ndarray               # (triangles,) smoothing group, 0 is flat
+    uvs : np.ndarray                     # (triangles * 3, 2) per corner
+    face_normals : np.ndarray            # (triangles, 3)
+    vertex_normals : np.ndarray          # (triangles * 3, 3) per corner
+    materials : list[str] = field(default_factory=lambda: [DEFAULT_MATERIAL])
+
+
+# -----------------------------------------------------------------------------
+def format_materials(_geometries:list[ASEGeometry]) -> list[str]:
+    # One multi material per geometry, referenced by `*MATERIAL_REF`
+    lines = ['*MATERIAL_LIST {', f'\t*MATERIAL_COUNT {len(_geometries)}']
+
+    for k, geometry in enumerate(_geometries):
+        lines.append(f'\t*MATERIAL {k} {{')
+        lines.append(f'\t\t*MATERIAL_NAME "{geometry.name}"')
+        lines.append(f'\t\t*NUMSUBMTLS {len(geometry.materials)}')
+
+        for i, material in enumerate(geometry.materials):
+            lines.extend((
+                f'\t\t*SUBMATERIAL {i} {{',
+                f'\t\t\t*MATERIAL_NAME "{material}"',
+                 '\t\t\t*MAP_DIFFUSE {',
+                f'\t\t\t\t*MAP_NAME "{material}"',
+                 '\t\t\t\t*UVW_U_OFFSET 0.0000',
+                 '\t\t\t\t*UVW_V_OFFSET 0.0000',
+                 '\t\t\t\t*UVW_U_TILING 1.0000',
+                 '\t\t\t\t*UVW_V_TILING 1.0000',
+                 '\t\t\t}',
+                 '\t\t}'))
+
+        lines.append('\t}')
+
+    lines.append('}')
+
+    return lines
+
+
+# -----------------------------------------------------------------------------
+def format_geometry(_geometry:ASEGeometry, _material_ref:int) -> list[str]:
+    g = _geometry
+    triangles = len(g.faces)
+
+    lines = [
+        '*GEOMOBJECT {',
+        f'\t*NODE_NAME "{g.name}"',
+        '\t*MESH {',
+        '\t\t*TIMEVALUE 0',
+        f'\t\t*MESH_NUMVERTEX {len(g.vertices)}',
+        f'\t\t*MESH_NUMFACES {triangles}',
+        '\t\t*MESH_VERTEX_LIST {']
+
+    lines.extend(f'\t\t\t*MESH_VERTEX {i}\t{x:.6f}\t{y:.6f}\t{z:.6f}' for i, (x, y, z) in enumerate(g.vertices.tolist()))
+
+    lines.append('\t\t}')
+    lines.append('\t\t*MESH_FACE_LIST {')
+
+    lines.extend(f'\t\t\t*MESH_FACE {i}: A: {a} B: {b} C: {c} AB: 1 BC: 1 CA: 1\t*MESH_SMOOTHING {s}\t*MESH_MTLID {m}'
+                 for i, ((a, b, c), s, m) in enumerate(zip(g.faces.tolist(), g.smoothing.tolist(), g.material_indices.tolist())))
+
+    lines.append('\t\t}')
+    lines.append(f'\t\t*MESH_NUMTVERTEX {len(g.uvs)}')
+    lines.append('\t\t*MESH_TVERTLIST {')
+
+    lines.extend(f'\t\t\t*MESH_TVERT {i}\t{u:.6f}\t{v:.6f}\t0.000000' for i, (u, v) in enumerate(g.uvs.tolist()))
+
+    lines.append('\t\t}')
+    lines.append(f'\t\t*MESH_NUMTVFACES {triangles}')
+    lines.append('\t\t*MESH_TFACELIST {')
+
+    # Texture vertices are stored per corner
+    lines.extend(f'\t\t\t*MESH_TFACE {i}\t{3 * i}\t{3 * i + 1}\t{3 * i + 2}' for i in range(triangles))
+
+    lines.append('\t\t}')
+    lines.append('\t\t*MESH_NORMALS {')
+
+    corners = g.vertex_normals.tolist()
+
+    for i, ((x, y, z), face) in enumerate(zip(g.face_normals.tolist(), g.faces.tolist())):
+        lines.append(f'\t\t\t*MESH_FACENORMAL {i}\t{x:.6f}\t{y:.6f}\t{z:.6f}')
+
+        for k in range(3):
+            nx, ny, nz = corners[3 * i + k]
+            lines.append(f'\t\t\t\t*MESH_VERTEXNORMAL {face[k]}\t{nx:.6f}\t{ny:.6f}\t{nz:.6f}')
+
+    lines.append('\t\t}')
+    lines.append('\t}')
+    lines.append(f'\t*MATERIAL_REF {_material_ref}')
+    lines.append('}')
+
+    return lines
+
+
+# -----------------------------------------------------------------------------
+def format_ase(_geometries:Iterable[ASEGeometry]) -> str:
+    geometries = list(_geometries)
+
+    lines = ['*3DSMAX_ASCIIEXPORT 200', '*COMMENT "MEdge Map Editor"']
+    lines.extend(format_materials(geometries))
+
+    for k, geometry in enumerate(geometries):
+        lines.extend(format_geometry(geometry, k))
+
+    lines.append('')
+
+    return '\n'.join(lines)
+
+
+# -----------------------------------------------------------------------------
+def write_ase(_filepath:str, _geometries:Iterable[ASEGeometry]):
+    with open(_filepath, 'w') as f:
+        f.write(format_ase(_geometries))
@@ -1,8 +1,8 @@
 import bpy
-from bpy.types import Panel, Context, UILayout, Menu
+from bpy.types import Panel, Context, UILayout, Menu, UIList
 
 from .t3d.scene import ActorType
-from .ops       import MET_OT_add_actor, MET_OT_cleanup_widgets, MET_OT_add_skydome, MET_OT_add_springboard
+from .ops       import MET_OT_add_actor, MET_OT_cleanup_widgets, MET_OT_add_skydome, MET_OT_add_springboard, MET_OT_validate
 from .props     import get_actor_prop
 
 
@@ -118,6 +118,36 @@ class MET_PT_measurements(MEdgeToolsPanel, Panel):
         col2.label(text='1.5m')
 
 
+# -----------------------------------------------------------------------------
+class MET_UL_validation_issues(UIList):
+
+    def draw_item(self, _context, _layout, _data, _item, _icon, _active_data, _active_property, _index, _flt_flag):
+        icon = 'ERROR' if _item.severity == 'ERROR' else 'INFO'
+        text = f'{_item.obj.name}: {_item.name}' if _item.obj else _item.name
+
+        _layout.label(text=text, icon=icon)
+
+
+# -----------------------------------------------------------------------------
+class MET_PT_validation(MEdgeToolsPanel, Panel):
+    bl_parent_id = MET_PT_map_editor.bl_idname
+    bl_label = 'Validation'
+
+
+    def draw(self, _context:Context):
+        layout = self.layout
+        validation = _context.scene.medge_validation
+
+        row = layout.row(align=True)
+        row.operator(MET_OT_validate.bl_idname)
+        row.prop(validation, 'validate_on_save', text='', icon='FILE_TICK')
+
+        errors = sum(1 for i in validation.issues if i.severity == 'ERROR')
+        layout.label(text=f'{errors} errors, {len(validation.issues) - errors} warnings in {validation.seconds:.3f}s')
+
+        layout.template_list('MET_UL_validation_issues', '', validation, 'issues', validation, 'selected_issue_idx', rows=4)
+
+
 # -----------------------------------------------------------------------------
 class VIEW3D_MT_PIE_medge_actors(Menu):
     bl_label = 'MEdge Actors'
@@ -6,6 +6,7 @@ from mathutils import Matrix
 from ..         import b3d_utils
 from .t3d.scene import ActorType
 from .props     import ActorTypeEnumProperty, new_actor, cleanup_widgets, get_actor_prop
+from .t3d.validation import validate_scene
 
 
 # -----------------------------------------------------------------------------
@@ -36,6 +37,23 @@ class MET_OT_cleanup_widgets(Operator):
         return {'FINISHED'}
     
 
+# -----------------------------------------------------------------------------
+class MET_OT_validate(Operator):
+    bl_idname  = 'medge_map_editor.validate'
+    bl_label   = 'Validate'
+    bl_description = 'Check all actors for problems that would show up during or after export'
+
+
+    def execute(self, _context:Context):
+        issues = validate_scene(_context.scene)
+        errors = sum(1 for i in issues if i.severity == 'ERROR')
+        seconds = _context.scene.medge_validation.seconds
+
+        self.report({'WARNING'} if issues else {'INFO'}, f'{errors} errors, {len(issues) - errors} warnings in {seconds:.3f}s')
+
+        return {'FINISHED'}
+
+
 # -----------------------------------------------------------------------------
 class MET_OT_add_skydome(Operator):
     bl_idname  = 'medge_map_editor.add_skydome'
@@ -1,15 +1,18 @@
 import bpy
 from bpy.props        import EnumProperty, PointerProperty, CollectionProperty, BoolProperty, IntProperty, FloatVectorProperty, FloatProperty, StringProperty
-from bpy.types        import Scene, Depsgraph, Object, Mesh, ID, PropertyGroup, Context, UILayout
-from bpy.app.handlers import depsgraph_update_post
+from bpy.types        import Scene, Depsgraph, Object, Mesh, ID, Collection, PropertyGroup, Context, UILayout, SpaceView3D
+from bpy.app.handlers import depsgraph_update_post, load_post, undo_post, redo_post, persistent
 from mathutils        import Vector, Matrix
 
 import math
+import time
+import numpy as np
 from typing    import Callable
 from mathutils import Matrix, Vector
 
-from ..         import b3d_utils
-from .t3d.scene import ActorType, TrackIndex
+from ..            import b3d_utils
+from .t3d.scene    import ActorType, TrackIndex
+from .t3d.geometry import normalize, cross
 
 COLLECTION_WIDGETS = 'Widgets'
 
@@ -27,12 +30,12 @@ def cleanup_widgets():
 
 
 # -----------------------------------------------------------------------------
-def new_actor(_actor_type:ActorType, _data:ID=None):
+def new_actor(_actor_type:ActorType, _data:ID=None, _collection:Collection=None):
 
     if _data:
-        obj = b3d_utils.new_object(_data, _actor_type.label)
+        obj = b3d_utils.new_object(_data, _actor_type.label, _collection)
     else:
-        obj = b3d_utils.new_object(b3d_utils.create_cube(), _actor_type.label)
+        obj = b3d_utils.new_object(b3d_utils.create_cube(), _actor_type.label, _collection)
 
 
     me_actor = get_actor_prop(obj)
@@ -336,6 +339,26 @@ class MET_ACTOR_PG_SwingVolume(Actor, PropertyGroup):
 # -----------------------------------------------------------------------------
 # Zipline
 # -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def zipline_bounds_faces(_segments:int) -> np.ndarray:
+    """
+    Quads of a bounding box made of `_segments` rings of four vertices, capped at both ends
+    """
+    a = np.arange(_segments - 1)[:, None] * 4 + np.arange(4)
+    b = a + 4
+
+    sides = np.stack((
+        np.stack((a[:, 0], b[:, 0], b[:, 1], a[:, 1]), axis=1),
+        np.stack((a[:, 0], a[:, 3], b[:, 3], b[:, 0]), axis=1),
+        np.stack((a[:, 3], a[:, 2], b[:, 2], b[:, 3]), axis=1),
+        np.stack((a[:, 2], a[:, 1], b[:, 1], b[:, 2]), axis=1),
+    ), axis=1).reshape(-1, 4)
+
+    l = _segments * 4
+
+    return np.vstack(((0, 1, 2, 3), sides, (l - 1, l - 2, l - 3, l - 4)))
+
+
 # -----------------------------------------------------------------------------
 class MET_ACTOR_PG_Zipline(Actor, PropertyGroup):
     
@@ -377,6 +400,14 @@ class MET_ACTOR_PG_Zipline(Actor, PropertyGroup):
             _layout.separator()
             _layout.prop(self, 'bb_offset')
 
+            settings = bpy.context.scene.medge_zipline_settings
+
+            _layout.separator()
+            _layout.prop(settings, 'debounce')
+
+            if settings.debounce:
+                _layout.prop(settings, 'debounce_interval')
+
 
     def create_zipline(self) -> Object:
         curve, path = b3d_utils.create_curve()
@@ -394,10 +425,35 @@ class MET_ACTOR_PG_Zipline(Actor, PropertyGroup):
         return zipline
 
 
+    def get_segment_count(self) -> int:
+        # One ring of four vertices per segment, the last one is placed at the end of the curve
+        curve_data = self.curve.data
+        nurbs = curve_data.splines[0]
+
+        n = curve_data.resolution_u * (nurbs.point_count_u if nurbs.use_cyclic_u else nurbs.point_count_u - 1)
+
+        return len(range(0, n - 1, 1 + self.bb_resolution)) + 1
+
+
+    def needs_update(self) -> bool:
+        if not self.auto_bb or not self.curve: 
+            return False
+
+        points = self.curve.data.splines[0].points
+
+        if points[0].co.xyz != self.c1 or points[1].co.xyz != self.c2 or points[2].co.xyz != self.c3:
+            return True
+
+        return len(self.id_data.data.vertices) != 4 * self.get_segment_count()
+
+
     def update_bounds(self, _force=False):   
         if not self.auto_bb: 
             return
 
+        if not _force and not self.needs_update():
+            return
+
         curve_data = self.curve.data
 
         nurbs = curve_data.splines[0]
@@ -407,82 +463,67 @@ class MET_ACTOR_PG_Zipline(Actor, PropertyGroup):
         p2 = points[1].co.xyz
         p3 = points[2].co.xyz
 
-        if not _force:
-            if p1 == self.c1 and p2 == self.c2 and p3 == self.c3:
-                return
-        
+        n = curve_data.resolution_u * (len(points) if nurbs.use_cyclic_u else len(points) - 1)
+        step = 1 + self.bb_resolution
+        segments = self.get_segment_count()
+
+        mesh = self.id_data.data
+
         self.c1 = p1
         self.c2 = p2
         self.c3 = p3
 
-        verts = []
-        edges = []
-        segments = []; 
+        ipoints = b3d_utils.evaluate_nurbs(nurbs, curve_data.resolution_u).astype(np.float32)
+        end = np.array((p3, p3 - p2), dtype=np.float32)
 
-        def local_bounds(center:Vector, p1:Vector, p2:Vector):
-            forward = (p2 - p1).normalized()
+        centers = np.vstack((ipoints[0:n - 1:step], end[0]))
+        forward = np.vstack((ipoints[1:n:step] - ipoints[0:n - 1:step], end[1]))
 
-            if self.align_z:
-                forward.z = 0
+        verts = self.bounds_vertices(centers, forward)
 
-            right = Vector((forward.y, -forward.x, 0)).normalized() * self.bb_scale
-            up = forward.cross(right).normalized() * self.bb_scale
+        # Only the positions change while the segment count stays the same
+        if mesh.users == 1 and len(mesh.vertices) == 4 * segments and len(mesh.polygons) == 4 * segments - 2:
+            mesh.vertices.foreach_set('co', verts.ravel())
+            mesh.update()
+            return
 
-            center += self.bb_offset
+        faces = zipline_bounds_faces(segments).tolist()
 
-            e1 = len(verts)
-            verts.append(center + up + right)
+        if mesh.users == 1:
+            mesh.clear_geometry()
+            mesh.from_pydata(verts.tolist(), [], faces)
+        else:
+            b3d_utils.set_data(self.id_data, b3d_utils.new_mesh(verts.tolist(), [], faces, self.id_data.name))
 
-            e2 = len(verts)
-            verts.append(center - up + right)
 
-            e3 = len(verts)
-            verts.append(center - up - right)
+    def bounds_vertices(self, _centers:np.ndarray, _forward:np.ndarray) -> np.ndarray:
+        """
+        Returns the four corners around each center, as an array of shape (len(_centers) * 4, 3)
+        """
+        scale = np.array(self.bb_scale, dtype=np.float32)
 
-            e4 = len(verts)
-            verts.append(center + up - right)
+        forward = normalize(_forward)
 
-            edges.append((e1, e2))
-            edges.append((e2, e3))
-            edges.append((e3, e4))
-            edges.append((e4, e1))
-            
-            segments.append((e1, e2, e3, e4))
+        if self.align_z:
+            forward[:, 2] = 0
 
-        # Interpolate points
-        stride = 3
-        ipoints = b3d_utils.interpolate_nurbs(nurbs, curve_data.resolution_u, stride)
+        right = np.zeros_like(forward)
+        right[:, 0] = forward[:, 1]
+        right[:, 1] = -forward[:, 0]
+        right = normalize(right) * scale
 
-        for k in range(0, len(ipoints) - stride, stride + self.bb_resolution * 3):
-            ip1 = Vector((ipoints[k + 0], ipoints[k + 1], ipoints[k + 2]))
-            ip2 = Vector((ipoints[k + 3], ipoints[k + 4], ipoints[k + 5]))
-            local_bounds(ip1, ip1, ip2)
+        up = normalize(cross(forward, right)) * scale
 
-        local_bounds(p3, p2, p3)
-        
-        # Create mesh bounds
-        faces = []
-        faces.append((0, 1, 2, 3))
-
-        for k in range(len(segments) - 1):
-            s1 = segments[k]
-            s2 = segments[k + 1]
-
-            edges.append((s1[0], s2[0]))
-            edges.append((s1[1], s2[1]))
-            edges.append((s1[2], s2[2]))
-            edges.append((s1[3], s2[3]))
-            
-            faces.append((s1[0], s2[0], s2[1], s1[1]))
-            faces.append((s1[0], s1[3], s2[3], s2[0]))
-            faces.append((s1[0], s1[3], s2[3], s2[0]))
-            faces.append((s1[3], s1[2], s2[2], s2[3]))
-            faces.append((s1[2], s1[1], s2[1], s2[2]))
-        
-        l = len(verts)
-        faces.append((l-1, l-2, l-3, l-4))
+        centers = _centers + np.array(self.bb_offset, dtype=np.float32)
+
+        corners = np.stack((
+            centers + up + right,
+            centers - up + right,
+            centers - up - right,
+            centers + up - right,
+        ), axis=1)
 
-        b3d_utils.set_data(self.id_data, b3d_utils.new_mesh(verts, edges, faces, self.id_data.name))
+        return corners.reshape(-1, 3)
 
 
     def __force_update_bb_bounds(self, _context:Context):
@@ -502,6 +543,43 @@ class MET_ACTOR_PG_Zipline(Actor, PropertyGroup):
     c3:            FloatVectorProperty(name='PRIVATE', subtype='TRANSLATION')
 
 
+# -----------------------------------------------------------------------------
+class MET_SCENE_PG_ZiplineSettings(PropertyGroup):
+    debounce:          BoolProperty(name='Debounce Updates', 
+                                    description='While a curve is being edited, only draw a preview. Rebuild the bounding box once the curve has been still for the interval')
+    debounce_interval: FloatProperty(name='Interval', description='Seconds without changes before the bounding box is rebuilt', default=0.25, min=0.01, soft_max=2)
+
+
+# -----------------------------------------------------------------------------
+# Validation
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+class MET_PG_ValidationIssue(PropertyGroup):
+    # The message is stored as the name, so that the list can be filtered on it
+    severity: EnumProperty(items=(('ERROR', 'Error', ''), ('WARNING', 'Warning', '')), name='Severity')
+    code:     StringProperty(name='Code')
+    obj:      PointerProperty(type=Object, name='Object')
+
+
+# -----------------------------------------------------------------------------
+class MET_SCENE_PG_Validation(PropertyGroup):
+
+    def __on_selected_issue_update(self, _context:Context):
+        if not (0 <= self.selected_issue_idx < len(self.issues)): return
+
+        obj = self.issues[self.selected_issue_idx].obj
+
+        if obj and obj.name in _context.view_layer.objects:
+            b3d_utils.deselect_all_objects()
+            b3d_utils.select_object(obj)
+
+
+    issues:             CollectionProperty(type=MET_PG_ValidationIssue)
+    selected_issue_idx: IntProperty(name='PRIVATE', update=__on_selected_issue_update)
+    seconds:            FloatProperty(name='PRIVATE')
+    validate_on_save:   BoolProperty(name='Validate On Save', default=True, description='Check all actors for problems that would show up during or after export when the file is saved')
+
+
 # -----------------------------------------------------------------------------
 # BlockingVolume
 # -----------------------------------------------------------------------------
@@ -623,7 +701,7 @@ class MET_ACTOR_PG_Checkpoint(Actor, PropertyGroup):
 
 
     def __on_order_index_update(self, _context:Context):
-        self.id_data.name = 'TimeTrialCheckpoint_' + self.order_index
+        self.id_data.name = 'TimeTrialCheckpoint_' + str(self.order_index)
 
 
     track_index:          TrackIndexEnumProperty()
@@ -823,14 +901,196 @@ def get_actor_prop(_obj:Object) -> MET_OBJECT_PG_Actor:
     return _obj.medge_actor
 
 
+# -----------------------------------------------------------------------------
+class ZiplineRegistry:
+    """
+    Zipline actors and the curves that drive them, so that the depsgraph handler 
+    only has to look at the ids in `depsgraph.updates` instead of every object in the scene.
+    Ids are tracked by `session_uid`, which survives renames.
+    """
+    def __init__(self):
+        self.ziplines: dict[int, str] = {}      # Dictionary of (zipline session_uid, zipline name)
+        self.curves: dict[int, set[int]] = {}   # Dictionary of (curve object or data session_uid, zipline session_uids)
+        self.valid = False
+
+
+    def invalidate(self):
+        self.valid = False
+
+
+    def rebuild(self, _scene:Scene):
+        self.ziplines.clear()
+        self.curves.clear()
+
+        for obj in _scene.objects:
+            if get_actor_prop(obj).actor_type == ActorType.ZIPLINE.name:
+                self.add(obj)
+
+        self.valid = True
+
+
+    def add(self, _obj:Object):
+        uid = _obj.session_uid
+        self.ziplines[uid] = _obj.name
+
+        if (curve := get_actor_prop(_obj).zipline.curve):
+            self.curves.setdefault(curve.session_uid, set()).add(uid)
+
+            if curve.data:
+                self.curves.setdefault(curve.data.session_uid, set()).add(uid)
+
+
+    def remove(self, _uid:int):
+        self.ziplines.pop(_uid, None)
+
+        for ziplines in self.curves.values():
+            ziplines.discard(_uid)
+
+
+    def get_changed(self, _depsgraph:Depsgraph) -> set[int]:
+        changed = set()
+
+        for update in _depsgraph.updates:
+            id = update.id.original
+            uid = id.session_uid
+
+            if isinstance(id, Object) and (uid in self.ziplines or get_actor_prop(id).actor_type == ActorType.ZIPLINE.name):
+                # (Re)register to pick up renames, new ziplines and a different curve
+                self.add(id)
+                changed.add(uid)
+
+            if (ziplines := self.curves.get(uid)):
+                changed |= ziplines
+
+        return changed
+
+
+    def get_zipline(self, _scene:Scene, _uid:int) -> Object | None:
+        """
+        Returns the zipline object, None if it has been removed or is no longer a zipline
+        """
+        obj = _scene.objects.get(self.ziplines.get(_uid, ''))
+
+        if not obj or obj.session_uid != _uid or get_actor_prop(obj).actor_type != ActorType.ZIPLINE.name:
+            self.remove(_uid)
+            return None
+
+        return obj
+
+
+zipline_registry = ZiplineRegistry()
+
+
+# -----------------------------------------------------------------------------
+class ZiplineDebounce:
+    """
+    Postpones the bounding box rebuild of ziplines whose curves are being edited,
+    until they have been still for `MET_SCENE_PG_ZiplineSettings.debounce_interval` seconds.
+    In the meantime a polyline through the control points is drawn as preview.
+    """
+    PREVIEW_COLOR = (1.0, 0.6, 0.0, 1.0)
+
+    def __init__(self):
+        self.pending: set[int] = set() # Zipline session_uids
+        self.last_change = 0.0
+        self.draw_handle = None
+
+
+    def push(self, _uids:set[int], _interval:float):
+        self.pending |= _uids
+        self.last_change = time.monotonic()
+
+        if not bpy.app.timers.is_registered(on_zipline_debounce_timer):
+            bpy.app.timers.register(on_zipline_debounce_timer, first_interval=_interval)
+
+        b3d_utils.tag_redraw_view3d()
+
+
+    def flush(self, _scene:Scene):
+        for uid in self.pending:
+            if (obj := zipline_registry.get_zipline(_scene, uid)):
+                get_actor_prop(obj).zipline.update_bounds()
+
+        self.pending.clear()
+
+        b3d_utils.tag_redraw_view3d()
+
+
+    def draw(self):
+        if not self.pending: return
+
+        scene = bpy.context.scene
+        b3d_utils.begin_batch()
+
+        for uid in self.pending:
+            obj = zipline_registry.get_zipline(scene, uid)
+            curve = obj and get_actor_prop(obj).zipline.curve
+
+            if not curve: continue
+
+            matrix = curve.matrix_world
+            coords = [matrix @ p.co.xyz for p in curve.data.splines[0].points]
+            start = len(b3d_utils.shader_coords)
+
+            b3d_utils.batch_add_coords(coords)
+            b3d_utils.batch_add_indices([(start + k, start + k + 1) for k in range(len(coords) - 1)])
+
+        if b3d_utils.shader_coords:
+            b3d_utils.draw_batch_3d(self.PREVIEW_COLOR, 2, 'LINES')
+
+
+zipline_debounce = ZiplineDebounce()
+
+
+# -----------------------------------------------------------------------------
+def on_zipline_debounce_timer() -> float | None:
+    scene = bpy.context.scene
+    remaining = scene.medge_zipline_settings.debounce_interval - (time.monotonic() - zipline_debounce.last_change)
+
+    # Still being edited, check again when the interval has passed since the last change
+    if remaining > 0: 
+        return remaining
+
+    zipline_debounce.flush(scene)
+
+    return None
+
+
+# -----------------------------------------------------------------------------
+def on_draw_zipline_previews():
+    zipline_debounce.draw()
+
+
 # -----------------------------------------------------------------------------
 def on_depsgraph_update_post(_scene:Scene, _depsgraph:Depsgraph):
-    for obj in _scene.objects:
-        actor = get_actor_prop(obj)
+    if not zipline_registry.valid:
+        zipline_registry.rebuild(_scene)
 
-        match(actor.actor_type):
-            case ActorType.ZIPLINE.name:
-                actor.zipline.update_bounds()
+    settings = _scene.medge_zipline_settings
+    debounced = set()
+
+    for uid in zipline_registry.get_changed(_depsgraph):
+        if not (obj := zipline_registry.get_zipline(_scene, uid)):
+            continue
+
+        zipline = get_actor_prop(obj).zipline
+
+        if not settings.debounce:
+            zipline.update_bounds()
+        elif zipline.needs_update():
+            # Rebuilding the bounding box also triggers an update, which does not need to be debounced
+            debounced.add(uid)
+
+    if debounced:
+        zipline_debounce.push(debounced, settings.debounce_interval)
+
+
+# -----------------------------------------------------------------------------
+@persistent
+def on_zipline_registry_invalidate(_scene:Scene, *_args):
+    # Loading a file or undoing can add and remove ziplines without depsgraph updates for them
+    zipline_registry.invalidate()
+    zipline_debounce.pending.clear()
 
 
 # -----------------------------------------------------------------------------
@@ -839,12 +1099,33 @@ def on_depsgraph_update_post(_scene:Scene, _depsgraph:Depsgraph):
 # -----------------------------------------------------------------------------
 def register():
     Object.medge_actor = bpy.props.PointerProperty(type=MET_OBJECT_PG_Actor)
+    Scene.medge_zipline_settings = bpy.props.PointerProperty(type=MET_SCENE_PG_ZiplineSettings)
+    Scene.medge_validation = bpy.props.PointerProperty(type=MET_SCENE_PG_Validation)
     
     b3d_utils.add_callback(depsgraph_update_post, on_depsgraph_update_post)
+    
+    for handler in (load_post, undo_post, redo_post):
+        b3d_utils.add_callback(handler, on_zipline_registry_invalidate)
+
+    zipline_registry.invalidate()
+
+    zipline_debounce.draw_handle = SpaceView3D.draw_handler_add(on_draw_zipline_previews, (), 'WINDOW', 'POST_VIEW')
 
 
 # -----------------------------------------------------------------------------
 def unregister():
+    if zipline_debounce.draw_handle:
+        SpaceView3D.draw_handler_remove(zipline_debounce.draw_handle, 'WINDOW')
+        zipline_debounce.draw_handle = None
+
+    if bpy.app.timers.is_registered(on_zipline_debounce_timer):
+        bpy.app.timers.unregister(on_zipline_debounce_timer)
+
     b3d_utils.remove_callback(depsgraph_update_post, on_depsgraph_update_post)
+
+    for handler in (load_post, undo_post, redo_post):
+        b3d_utils.remove_callback(handler, on_zipline_registry_invalidate)
     
     if hasattr(Object, 'medge_actor'): del Object.medge_actor
+    if hasattr(Scene, 'medge_zipline_settings'): del Scene.medge_zipline_settings
+    if hasattr(Scene, 'medge_validation'): del Scene.medge_validation
@@ -1,7 +1,6 @@
 import bpy
-import bmesh
 from   bpy.types import (
-    Object, Collection, 
+    Object, 
     PointLight as BL_PointLight, 
     SunLight as BL_SunLight, 
     SpotLight as BL_SpotLight, 
@@ -9,14 +8,18 @@ from   bpy.types import (
 from   mathutils import Vector, Euler
 
 from dataclasses import dataclass
+from typing      import Iterator
 import math
+import os
+import sys
+import time
 from math import atan2, hypot
 
 from .scene import (
     ActorType, 
     BakerSettings,
     Actor, 
-    Polygon, 
+    PolyList, 
     Checkpoint, 
     PlayerStart, 
     StaticMesh, 
@@ -30,8 +33,14 @@ from .scene import (
     SpotLight,
     AreaLight)
 
-from ...     import b3d_utils
-from ..props import get_actor_prop
+from .geometry import MeshBuffers, extract_polygons
+from .writer   import write_t3d, ENCODING
+from .cache    import T3DExportCache, hash_object
+from .paths    import CollectionPaths, collection_paths
+from .profiler import T3DProfiler
+from .reduction import PolygonReduction, merge_coplanar, get_polylist_size
+from ...       import b3d_utils
+from ..props   import get_actor_prop
 
 
 # -----------------------------------------------------------------------------
@@ -50,32 +59,71 @@ class T3DBuilderOptions:
     skylight_options : SkylightOptions | None # If not None, add skylight
     light_power_scale : float # Scales the energy when setting brightness
     window_light_angle_scale : float # Scale the energy when setting window light angle
+    merge_polygons : bool = False # Merge coplanar adjacent brush polygons and drop polygons without area
 
 
 # -----------------------------------------------------------------------------
-class CollectionPaths:
+@dataclass
+class T3DExportStats:
+    actors : int
+    seconds : float
+    peak_rss : int | None # Peak resident set size of the process in bytes, None if unavailable
 
-    def __init__(self, _collection_root:str):
-        self.paths = {} # Dictionary of (object name, collection path)
-        root = bpy.data.collections.get(_collection_root)
-        
-        if root:
-            self.build_hierarchy(root)
-        else:
-            print(f'Collection does not exists: {_collection_root}')
+    @property
+    def actors_per_second(self) -> float:
+        if self.seconds <= 0: return 0.0
+        return self.actors / self.seconds
 
+    def __str__(self) -> str:
+        rss = f'{self.peak_rss / (1024 * 1024):.1f} MB' if self.peak_rss is not None else 'n/a'
+        return f'{self.actors} actors in {self.seconds:.2f}s ({self.actors_per_second:.0f} actors/s), peak RSS {rss}'
 
-    def __getitem__(self, key:str):
-        if key in self.paths: return self.paths[key]
-        return ''
 
+# -----------------------------------------------------------------------------
+def get_peak_rss() -> int | None:
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb',                         wintypes.DWORD),
+                        ('PageFaultCount',             wintypes.DWORD),
+                        ('PeakWorkingSetSize',         ctypes.c_size_t),
+                        ('WorkingSetSize',             ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage',    ctypes.c_size_t),
+                        ('QuotaPagedPoolUsage',        ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaNonPagedPoolUsage',     ctypes.c_size_t),
+                        ('PagefileUsage',              ctypes.c_size_t),
+                        ('PeakPagefileUsage',          ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+
+        return counters.PeakWorkingSetSize
+
+    try:
+        import resource
+    except ImportError:
+        return None
 
-    def build_hierarchy(self, _collection:Collection, _path=''):
-        for obj in _collection.objects:
-            self.paths[obj.name] = _path
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
 
-        for child in _collection.children:
-            self.build_hierarchy(child, _path + child.name + '.')
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+# -----------------------------------------------------------------------------
+def get_actor_type_name(_obj:Object) -> str:
+    # Lights are exported by their light type, they do not have an ActorType
+    if _obj.type == 'LIGHT':
+        return f'{_obj.data.type}_LIGHT'
+
+    return get_actor_prop(_obj).actor_type
 
 
 # -----------------------------------------------------------------------------
@@ -93,10 +141,18 @@ def get_rotation_mirrored(_obj:Object) -> Euler:
 # -----------------------------------------------------------------------------
 class Builder:
 
-    def __init__(self, _options:T3DBuilderOptions, _collection_paths:CollectionPaths):
+    def __init__(self, _options:T3DBuilderOptions, _collection_paths:CollectionPaths, _session:'T3DExportSession'=None):
         self.mirror = Vector((1, -1, 1))
         self.options = _options
         self.collection_paths = _collection_paths
+        self.session = _session
+
+
+    def get_evaluated(self, _obj:Object) -> Object:
+        if self.session:
+            return self.session.evaluated(_obj)
+
+        return _obj.evaluated_get(bpy.context.evaluated_depsgraph_get())
 
 
     def get_location(self, _obj:Object) -> tuple[float, float, float]:
@@ -111,39 +167,37 @@ class Builder:
         return rotation
 
 
-    def create_polygons(self, _obj:Object, _apply_transforms=False) -> list[Polygon]:
-        depsgraph = bpy.context.evaluated_depsgraph_get()
-        obj_eval = _obj.evaluated_get(depsgraph)
+    def create_polygons(self, _obj:Object, _apply_transforms=False) -> PolyList:
+        obj_eval = self.get_evaluated(_obj)
+        buffers = self.session.buffers if self.session else None
 
-        bm = bmesh.new()
-        bm.from_mesh(obj_eval.data)
+        if not (self.session and self.session.profiler):
+            return extract_polygons(obj_eval, self.options.unit_scale, self.mirror, _apply_transforms, buffers)
 
-        polylist : list[Polygon] = []
+        with self.session.profiler.measure('polygons') as stats:
+            polylist = extract_polygons(obj_eval, self.options.unit_scale, self.mirror, _apply_transforms, buffers)
+            stats.polygons += len(polylist)
+            stats.vertices += len(polylist.Vertices) // 3
 
-        for f in bm.faces:
-            verts = []
+        return polylist
 
-            for v in reversed(f.verts):
-                if _apply_transforms:
-                    world_co = obj_eval.matrix_world @ v.co
-                    verts.append(world_co * self.options.unit_scale * self.mirror)
-                else:
-                    verts.append(v.co * obj_eval.scale * self.options.unit_scale * self.mirror)
 
-            v0 = f.verts[0].co
-            v1 = f.verts[1].co
-            
-            u = v1 - v0
-            u.normalize()
-            n = f.normal
-            v = n.cross(u)
+    def create_local_polygons(self, _obj:Object) -> PolyList | str:
+        """
+        Polygons in local space, scaled by the object scale.
+        Objects that share a mesh and scale share the serialized polygons, so each mesh is only processed once per export.
+        """
+        if not self.session or _obj.modifiers or _obj.data.shape_keys:
+            return self.create_polygons(_obj)
 
-            p = Polygon(verts[0], n, u, v, verts)
-            polylist.append(p)
+        key = (_obj.data.as_pointer(), tuple(self.get_evaluated(_obj).scale))
 
-        bm.free()
+        if (text := self.session.polygon_text.get(key)) is None:
+            text = self.session.polygon_text[key] = str(self.create_polygons(_obj))
+        else:
+            self.session.polygon_text_hits += 1
 
-        return polylist
+        return text
 
 
     def build(self, _obj:Object) -> Actor | None:
@@ -191,19 +245,17 @@ class StaticMeshBuilder(Builder):
 
         if static_mesh.use_prefab:
             if (prefab := static_mesh.prefab):
-                name = prefab.name
-                path = self.collection_paths[name]
+                path = self.collection_paths[prefab]
 
-                return StaticMesh(location, rotation, _obj.scale, path + name, static_mesh.is_hidden_game)
+                return StaticMesh(location, rotation, _obj.scale, path + prefab.name, static_mesh.is_hidden_game)
             
             else:
                 print(f'Object {_obj.name} uses prefab, but has not prefab selected')
         
         else:
-            name = _obj.name
-            path = self.collection_paths[name]
+            path = self.collection_paths[_obj]
             
-            return StaticMesh(location, rotation, _obj.scale, path + name, static_mesh.is_hidden_game)
+            return StaticMesh(location, rotation, _obj.scale, path + _obj.name, static_mesh.is_hidden_game)
 
 
 # -----------------------------------------------------------------------------
@@ -238,18 +290,30 @@ class BrushBuilder(Builder):
         material = get_actor_prop(_obj).get_brush().material
 
         if material:
-            for poly in polylist:
-                name = material.name
-                poly.Texture = self.collection_paths[name] + name
+            polylist.Texture = self.collection_paths[material] + material.name
+
+        if self.options.merge_polygons:
+            polylist = self.merge_polygons(_obj, polylist)
 
         return Brush(polylist, (0, 0, 0), (0, 0, 0), _csg_oper='CSG_Add')
 
 
+    def merge_polygons(self, _obj:Object, _polylist:PolyList) -> PolyList:
+        # The saved bytes are computed from the values, the polylists are not serialized for it
+        merged = merge_coplanar(_polylist)
+
+        if self.session:
+            saved = get_polylist_size(_polylist) - get_polylist_size(merged)
+            self.session.reductions.append(PolygonReduction(_obj.name, len(_polylist), len(merged), saved))
+
+        return merged
+
+
 # -----------------------------------------------------------------------------
 class LadderVolumeBuilder(Builder):
 
     def build(self, _obj:Object) -> Actor | None:
-        polylist = self.create_polygons(_obj)
+        polylist = self.create_local_polygons(_obj)
         location = self.get_location(_obj)
         rotation = self.get_rotation(_obj)
 
@@ -262,7 +326,7 @@ class LadderVolumeBuilder(Builder):
 class SwingVolumeBuilder(Builder):
 
     def build(self, _obj:Object) -> Actor | None:
-        polylist = self.create_polygons(_obj)
+        polylist = self.create_local_polygons(_obj)
         location = self.get_location(_obj)
         rotation = self.get_rotation(_obj)
 
@@ -275,7 +339,7 @@ class SwingVolumeBuilder(Builder):
 class BlockingVolumeBuilder(Builder):
 
     def build(self, _obj:Object) -> Actor | None:
-        polylist = self.create_polygons(_obj)
+        polylist = self.create_local_polygons(_obj)
         location = self.get_location(_obj)
         rotation = self.get_rotation(_obj)
 
@@ -284,8 +348,7 @@ class BlockingVolumeBuilder(Builder):
         path = ''
 
         if (material := blocking_volume.phys_material):
-            name = material.name
-            path = self.collection_paths[name] + name
+            path = self.collection_paths[material] + material.name
 
         return BlockingVolume(polylist, location, rotation, path)
     
@@ -294,7 +357,7 @@ class BlockingVolumeBuilder(Builder):
 class TriggerVolumeBuilder(Builder):
     
     def build(self, _obj:Object) -> Actor | None:
-        polylist = self.create_polygons(_obj)
+        polylist = self.create_local_polygons(_obj)
         location = self.get_location(_obj)
         rotation = self.get_rotation(_obj)
 
@@ -307,7 +370,7 @@ class TriggerVolumeBuilder(Builder):
 class KillVolumeBuilder(Builder):
     
     def build(self, _obj:Object) -> Actor | None:
-        polylist = self.create_polygons(_obj)
+        polylist = self.create_local_polygons(_obj)
         location = self.get_location(_obj)
         rotation = self.get_rotation(_obj)
 
@@ -458,42 +521,173 @@ class AreaLightBuilder(Builder):
                          light.energy * self.options.window_light_angle_scale)
 
 
+# -----------------------------------------------------------------------------
+# Session
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+class T3DExportSession:
+    """
+    State that is shared by all actors of one export: 
+    the evaluated depsgraph, mesh buffers and one builder instance per builder type.
+    """
+    def __init__(self, _options:T3DBuilderOptions, _collection_paths:CollectionPaths, _profiler:T3DProfiler=None, _reductions:list[PolygonReduction]=None):
+        self.options = _options
+        self.collection_paths = _collection_paths
+        self.profiler = _profiler
+        self.reductions = _reductions if _reductions is not None else [] # Merged brush polygons per actor
+        self.builders: dict[type[Builder], Builder] = {}
+        self.buffers = MeshBuffers()
+
+        # Serialized local space polygons keyed by (mesh, scale)
+        self.polygon_text: dict[tuple, str] = {}
+        self.polygon_text_hits = 0
+
+        # Evaluated meshes are only up to date outside edit mode, so leave it once for all objects
+        if (active := bpy.context.object) and active.mode != 'OBJECT':
+            b3d_utils.set_object_mode(active, 'OBJECT')
+
+        self.depsgraph = bpy.context.evaluated_depsgraph_get()
+
+
+    def evaluated(self, _obj:Object) -> Object:
+        return _obj.evaluated_get(self.depsgraph)
+
+
+    def get_builder(self, _type:type[Builder]) -> Builder:
+        if (builder := self.builders.get(_type)) is None:
+            builder = self.builders[_type] = _type(self.options, self.collection_paths, self)
+
+        return builder
+
+
 # -----------------------------------------------------------------------------
 # T3DBuilder
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
 class T3DBuilder:
 
-    def __init__(self) -> None:
-        self.scene:list[Actor] = []
+    # Size of the file buffer used when writing actors to disk
+    STREAM_BUFFER_SIZE = 1 << 20
 
 
-    def build(self, _objects:list[Object], _options:T3DBuilderOptions) -> list[Actor]:
-        collection_paths = CollectionPaths('GenericBrowser')
+    def __init__(self, _cache:T3DExportCache=None, _profiler:T3DProfiler=None, _reductions:list[PolygonReduction]=None) -> None:
+        self.scene:list[Actor | str] = []
+        self.cache = _cache # If not None, unchanged actors are taken from the cache as T3D text
+        self.profiler = _profiler # If not None, actors are serialized as soon as they are built, to time each actor type
+        self.reductions = _reductions if _reductions is not None else [] # Filled when brush polygons are merged
+
+
+    def build(self, _objects:list[Object], _options:T3DBuilderOptions) -> list[Actor | str]:
+        if not self.profiler:
+            self.scene.extend(self.iter_actors(_objects, _options))
+            return self.scene
+
+        with self.profiler.measure('build', ''):
+            self.scene.extend(self.iter_actors(_objects, _options))
+
+        return self.scene    
+
+
+    def iter_actors(self, _objects:list[Object], _options:T3DBuilderOptions) -> Iterator[Actor | str]:
+        session = T3DExportSession(_options, collection_paths, self.profiler, self.reductions)
 
         if (so := _options.skylight_options):
-            self.scene.append(SkyLight(so.location, so.color, so.brightness, so.sample_factor))
+            yield SkyLight(so.location, so.color, so.brightness, so.sample_factor)
+
+        if self.cache is not None:
+            yield from self.iter_cached_actors(_objects, session)
+            return
+
+        if self.profiler:
+            for obj in _objects:
+                if (text := self.build_text(obj, session)):
+                    yield text
+            return
 
         for obj in _objects:
-            if(actor := self.build_actor(obj, _options, collection_paths)):
-                self.scene.append(actor)
+            if(actor := self.build_actor(obj, session)):
+                yield actor
 
-        return self.scene    
 
+    def iter_cached_actors(self, _objects:list[Object], _session:T3DExportSession) -> Iterator[str]:
+        """
+        Unchanged actors are taken from the cache, merged brushes add the polygon reduction that was stored with them.
+        With a profiler, hashing is the `hash` phase and every cache hit is a call of the `cached` phase.
+        """
+        for obj in _objects:
+            if obj.type != 'LIGHT' and get_actor_prop(obj).actor_type == ActorType.NONE.name: continue
+
+            key = self.hash_object(obj, _session)
+
+            if (entry := self.cache.get(obj.name, key)) is None:
+                count = len(_session.reductions)
+                fragment = self.build_text(obj, _session)
+                reduction = None
+
+                if len(_session.reductions) > count:
+                    r = _session.reductions[count]
+                    reduction = [r.polygons_before, r.polygons_after, r.bytes_saved]
+
+                self.cache.put(obj.name, key, fragment, reduction)
+
+            else:
+                fragment, reduction = entry
+
+                if reduction:
+                    _session.reductions.append(PolygonReduction(obj.name, *reduction))
+
+                if self.profiler:
+                    stats = self.profiler.get('cached', get_actor_type_name(obj))
+                    stats.calls += 1
+                    stats.bytes += len(fragment)
+
+            if fragment:
+                yield fragment
+
+
+    def hash_object(self, _obj:Object, _session:T3DExportSession) -> str:
+        if not self.profiler:
+            return hash_object(_obj, _session.evaluated(_obj), _session.collection_paths)
+
+        with self.profiler.measure('hash', get_actor_type_name(_obj)):
+            return hash_object(_obj, _session.evaluated(_obj), _session.collection_paths)
+
+
+    def build_text(self, _obj:Object, _session:T3DExportSession) -> str:
+        """
+        T3D text of the actor, empty if `_obj` is not an actor
+        """
+        if not self.profiler:
+            actor = self.build_actor(_obj, _session)
+            return str(actor) if actor else ''
+
+        actor_type = get_actor_type_name(_obj)
+
+        with self.profiler.measure('actor', actor_type):
+            actor = self.build_actor(_obj, _session)
+
+        if not actor: return ''
+
+        with self.profiler.measure('serialize', actor_type) as stats:
+            text = str(actor)
+            stats.bytes += len(text)
+
+        return text
+
+
+    def build_actor(self, _obj:Object, _session:T3DExportSession) -> Actor | None:
+        builder = _session.get_builder
 
-    def build_actor(self, _obj:Object, _options:T3DBuilderOptions, _collection_paths:CollectionPaths) -> Actor | None:
-        b3d_utils.set_object_mode(_obj, 'OBJECT')
-        
         if _obj.type == 'LIGHT':
             match _obj.data.type:
                 case 'POINT':
-                    return PointLightBuilder(_options, _collection_paths).build(_obj)
+                    return builder(PointLightBuilder).build(_obj)
                 case 'SUN': 
-                    return DirectionalLightBuilder(_options, _collection_paths).build(_obj)
+                    return builder(DirectionalLightBuilder).build(_obj)
                 case 'SPOT':
-                    return SpotLightBuilder(_options, _collection_paths).build(_obj)
+                    return builder(SpotLightBuilder).build(_obj)
                 case 'AREA':
-                    return AreaLightBuilder(_options, _collection_paths).build(_obj)
+                    return builder(AreaLightBuilder).build(_obj)
 
         me_actor = get_actor_prop(_obj)
 
@@ -501,32 +695,54 @@ class T3DBuilder:
 
         match(me_actor.actor_type):
             case ActorType.PLAYER_START.name:
-                return PlayerStartBuilder(_options, _collection_paths).build(_obj)
+                return builder(PlayerStartBuilder).build(_obj)
             case ActorType.CHECKPOINT.name:
-                return CheckpointBuilder(_options, _collection_paths).build(_obj)
+                return builder(CheckpointBuilder).build(_obj)
             case ActorType.STATIC_MESH.name:
-                return StaticMeshBuilder(_options, _collection_paths).build(_obj)
+                return builder(StaticMeshBuilder).build(_obj)
             case ActorType.ZIPLINE.name:
-                return ZiplineBuilder(_options, _collection_paths).build(_obj)
+                return builder(ZiplineBuilder).build(_obj)
             case ActorType.BRUSH.name:
-                return BrushBuilder(_options, _collection_paths).build(_obj)
+                return builder(BrushBuilder).build(_obj)
             case ActorType.LADDER_VOLUME.name:
-                return LadderVolumeBuilder(_options, _collection_paths).build(_obj)
+                return builder(LadderVolumeBuilder).build(_obj)
             case ActorType.SWING_VOLUME.name:
-                return SwingVolumeBuilder(_options, _collection_paths).build(_obj)
+                return builder(SwingVolumeBuilder).build(_obj)
             case ActorType.BLOCKING_VOLUME.name:
-                return BlockingVolumeBuilder(_options, _collection_paths).build(_obj)
+                return builder(BlockingVolumeBuilder).build(_obj)
             case ActorType.TRIGGER_VOLUME.name:
-                return TriggerVolumeBuilder(_options, _collection_paths).build(_obj)
+                return builder(TriggerVolumeBuilder).build(_obj)
             case ActorType.KILL_VOLUME.name:
-                return KillVolumeBuilder(_options, _collection_paths).build(_obj)
+                return builder(KillVolumeBuilder).build(_obj)
         
         return None
     
 
-    def write(self, _filepath: str):
-        with open(_filepath, 'w') as f:
-            f.write('Begin Map\nBegin Level NAME=PersistentLevel\n')
-            for actor in self.scene:
-                f.write(str(actor))
-            f.write('End Level\nBegin Surface\nEnd Surface\nEnd Map')
\ No newline at end of file
+    def write(self, _filepath: str, _encoding=ENCODING):
+        if not self.profiler:
+            write_t3d(_filepath, self.scene, self.STREAM_BUFFER_SIZE, _encoding)
+            return
+
+        with self.profiler.measure('write', '') as stats:
+            write_t3d(_filepath, self.scene, self.STREAM_BUFFER_SIZE, _encoding)
+
+        stats.bytes += os.path.getsize(_filepath)
+
+
+    def stream(self, _objects:list[Object], _options:T3DBuilderOptions, _filepath:str, _encoding=ENCODING) -> T3DExportStats:
+        """
+        Build each actor and write it to `_filepath` straight away, so that only one actor is alive at a time.
+        The output is identical to `build()` followed by `write()`, but `self.scene` stays empty.
+        """
+        start = time.perf_counter()
+
+        if not self.profiler:
+            count = write_t3d(_filepath, self.iter_actors(_objects, _options), self.STREAM_BUFFER_SIZE, _encoding)
+        else:
+            # Building and writing interleave, so the stream phase includes both
+            with self.profiler.measure('stream', '') as stats:
+                count = write_t3d(_filepath, self.iter_actors(_objects, _options), self.STREAM_BUFFER_SIZE, _encoding)
+
+            stats.bytes += os.path.getsize(_filepath)
+
+        return T3DExportStats(count, time.perf_counter() - start, get_peak_rss())
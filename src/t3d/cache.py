@@ -0,0 +1,174 @@
+import bpy
+from bpy.types import Object, ID
+
+import os
+import json
+import struct
+import hashlib
+import numpy as np
+from dataclasses import asdict
+
+from .scene    import ActorType
+from .geometry import read_vertices, read_polygons
+from ..props   import get_actor_prop
+
+
+# -----------------------------------------------------------------------------
+# Hashing
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def hash_matrix(_hasher, _matrix):
+    _hasher.update(struct.pack('16f', *(v for row in _matrix for v in row)))
+
+
+# -----------------------------------------------------------------------------
+def hash_rna(_hasher, _struct, _depth:int, _on_id=None):
+    """
+    Hash the property values of `_struct`. Datablocks are hashed by name and passed to `_on_id`.
+    Nested structs are followed up to `_depth` levels.
+    """
+    for prop in _struct.bl_rna.properties:
+        key = prop.identifier
+
+        if key == 'rna_type': continue
+
+        value = getattr(_struct, key, None)
+        _hasher.update(key.encode())
+
+        match prop.type:
+            case 'POINTER':
+                if value is None:
+                    _hasher.update(b'\0')
+                elif isinstance(value, ID):
+                    _hasher.update(value.name.encode())
+                    if _on_id: _on_id(value)
+                elif _depth > 0:
+                    hash_rna(_hasher, value, _depth - 1, _on_id)
+
+            case 'COLLECTION':
+                if _depth > 0:
+                    for item in value:
+                        hash_rna(_hasher, item, _depth - 1, _on_id)
+
+            case _:
+                if isinstance(value, set):
+                    value = sorted(value)
+                elif hasattr(value, '__len__') and not isinstance(value, str):
+                    value = tuple(value)
+
+                _hasher.update(repr(value).encode())
+
+
+# -----------------------------------------------------------------------------
+def hash_object(_obj:Object, _obj_eval:Object, _collection_paths) -> str:
+    """
+    Hash of everything `T3DBuilder.build_actor` reads from `_obj`:
+    the transform, the evaluated geometry, the `medge_actor` properties and the GenericBrowser paths.
+    """
+    h = hashlib.blake2b(digest_size=16)
+
+    hash_matrix(h, _obj.matrix_world)
+    h.update(struct.pack('3f', *_obj.scale))
+    h.update(_collection_paths[_obj].encode())
+
+    def on_id(_id:ID):
+        h.update(_collection_paths[_id].encode())
+
+    me_actor = get_actor_prop(_obj)
+    hash_rna(h, me_actor, 3, on_id)
+
+    if _obj.type == 'MESH':
+        mesh = _obj_eval.data
+        h.update(read_vertices(mesh).tobytes())
+
+        for buffer in read_polygons(mesh):
+            h.update(buffer.tobytes())
+
+    elif _obj.type == 'LIGHT':
+        hash_rna(h, _obj.data, 0)
+
+    if me_actor.actor_type == ActorType.ZIPLINE.name and (curve := me_actor.zipline.curve):
+        hash_matrix(h, curve.matrix_world)
+
+        for spline in curve.data.splines:
+            co = np.empty(len(spline.points) * 4, dtype=np.float32)
+            spline.points.foreach_get('co', co)
+            h.update(co.tobytes())
+
+    return h.hexdigest()
+
+
+# -----------------------------------------------------------------------------
+# Cache
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def get_cache_path() -> str | None:
+    """
+    The cache is stored next to the .blend file, None if the file has not been saved yet.
+    """
+    if not bpy.data.filepath: return None
+    return bpy.data.filepath + '.t3dcache'
+
+
+# -----------------------------------------------------------------------------
+class T3DExportCache:
+    """
+    Serialized T3D text of each actor keyed by object name, together with the hash of its inputs
+    and the (polygons before, polygons after, bytes saved) of brushes whose polygons were merged.
+    All entries are dropped when the export options change.
+    """
+    VERSION = 2
+
+    def __init__(self, _filepath:str | None, _options):
+        self.filepath = _filepath
+        self.options  = json.dumps(asdict(_options), sort_keys=True, default=list)
+        self.entries: dict[str, tuple[str, str, list[int] | None]] = {} # Dictionary of (object name, (hash, fragment, reduction))
+        self.hits     = 0
+        self.misses   = 0
+
+        self.load()
+
+
+    def load(self):
+        if not self.filepath or not os.path.exists(self.filepath): return
+
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f'Could not read T3D export cache {self.filepath}: {e}')
+            return
+
+        if data.get('version') != self.VERSION: return
+        if data.get('options') != self.options: return
+
+        self.entries = {name: tuple(entry) for name, entry in data['entries'].items()}
+
+
+    def save(self):
+        if not self.filepath: return
+
+        # Forget objects that no longer exist
+        objects = bpy.data.objects
+        entries = {name: entry for name, entry in self.entries.items() if name in objects}
+
+        with open(self.filepath, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'options': self.options, 'entries': entries}, f)
+
+
+    def get(self, _name:str, _key:str) -> tuple[str, list[int] | None] | None:
+        """
+        Returns (fragment, reduction) if the entry of `_name` has hash `_key`
+        """
+        entry = self.entries.get(_name)
+
+        if entry and entry[0] == _key:
+            self.hits += 1
+            return entry[1], entry[2]
+
+        self.misses += 1
+        return None
+
+
+    def put(self, _name:str, _key:str, _fragment:str, _reduction:list[int] | None=None):
+        self.entries[_name] = (_key, _fragment, _reduction)
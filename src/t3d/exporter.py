@@ -1,12 +1,20 @@
 import bpy
-from bpy.props           import StringProperty, EnumProperty, BoolProperty, FloatVectorProperty, FloatProperty
-from bpy.types           import TOPBAR_MT_file_export, Operator, Context, Collection, Panel
+from bpy.props           import StringProperty, EnumProperty, BoolProperty, FloatVectorProperty, FloatProperty, IntProperty
+from bpy.types           import TOPBAR_MT_file_export, Operator, Context, Collection, Panel, Object
 from bpy_extras.io_utils import ExportHelper
 
 import os.path
+import time
+from contextlib import nullcontext
 
 from ...b3d_utils import get_selected_collection_names
-from .builder     import T3DBuilder, T3DBuilderOptions, SkylightOptions
+from .builder     import T3DBuilder, T3DBuilderOptions, T3DExportStats, SkylightOptions
+from .parallel    import T3DExportPool, T3DJob
+from .cache       import T3DExportCache, get_cache_path
+from .profiler    import T3DProfiler
+from .reduction   import PolygonReduction
+from .validation  import validate_scene
+from ..ase.exporter import ASEExportError, export_static_meshes
 
 
 # -----------------------------------------------------------------------------
@@ -42,6 +50,30 @@ class MET_OT_T3D_Export(Operator, ExportHelper):
     selected_objects: BoolProperty(name='Selected Objects')
     
     export_static_meshes: BoolProperty(name='Export StaticMeshes')
+
+    workers: IntProperty(name='Workers', min=0, default=0, description='Number of worker processes that write the selected collections and the .ase files. 0 uses all cores, 1 writes one file at a time in Blender. Starting the workers takes a moment, so few small files are faster with 1')
+
+    incremental: BoolProperty(name='Incremental', description='Reuse the T3D text of actors that did not change since the last export. The cache is stored next to the .blend file')
+
+    encoding: EnumProperty(
+        default='cp1252',
+        items=(('cp1252', 'ANSI',   'What UnrealEd reads from files without a byte order mark'),
+               ('utf-16', 'UTF-16', 'What UnrealEd exports, use it for names with characters outside of ANSI')),
+        name='Encoding')
+
+    validate: BoolProperty(name='Validate', default=True, description='Check all actors before export and list the problems in the Validation panel')
+
+    merge_polygons: BoolProperty(name='Merge Polygons', description='Merge coplanar adjacent brush faces with the same material into convex polygons and drop faces without area. Makes the file smaller and CSG rebuilds in UnrealEd faster')
+
+    streaming: BoolProperty(name='Streaming', default=True, description='Write each actor to disk as soon as it is built instead of building the whole scene first')
+    
+    profile: EnumProperty(
+        default='NONE',
+        items=(('NONE',   'None',     ''),
+               ('REPORT', 'Report',   'Time each export phase per actor type and add it to the report'),
+               ('JSON',   'JSON',     'Report and write the timings to <file>.profile.json'),
+               ('PROF',   'cProfile', 'Report and write a cProfile profile to <file>.prof')),
+        name='Profile')
     
     light_power_scale: FloatProperty(name='Light Power Scale', min=0.0, default=1.0, description='Scales light power when setting the brightness')
 
@@ -71,12 +103,31 @@ class MET_OT_T3D_Export(Operator, ExportHelper):
         
         layout.prop(self, 'export_static_meshes')
 
+        if self.selected_collections or self.export_static_meshes:
+            layout.prop(self, 'workers')
+
+        layout.prop(self, 'encoding')
+        layout.prop(self, 'validate')
+        layout.prop(self, 'merge_polygons')
+        layout.prop(self, 'streaming')
+        layout.prop(self, 'incremental')
+        layout.prop(self, 'profile')
+
         layout.separator()
 
         layout.prop(self, 'light_power_scale')
 
 
     def execute(self, _context: Context):
+        # Problems do not stop the export, they are listed in the Validation panel
+        if self.validate:
+            try:
+                if (issues := validate_scene(_context.scene, self.get_exported_objects(_context))):
+                    errors = sum(1 for i in issues if i.severity == 'ERROR')
+                    self.report({'WARNING'}, f'Validation: {errors} errors, {len(issues) - errors} warnings, see the Validation panel')
+            except Exception as e:
+                self.report({'WARNING'}, f'Validation failed, exporting anyway: {e}')
+
         # Export T3D
         try:
             unit_scale = self.units_scale[self.units]
@@ -92,42 +143,144 @@ class MET_OT_T3D_Export(Operator, ExportHelper):
             options = T3DBuilderOptions(unit_scale, 
                                         skylight_options, 
                                         self.light_power_scale,
-                                        self.window_light_angle_scale)
+                                        self.window_light_angle_scale,
+                                        self.merge_polygons)
 
-            if self.selected_collections:
-                for name in get_selected_collection_names():
-                    coll:Collection = bpy.data.collections.get(name)
-                    dir = os.path.dirname(self.filepath)
-                    
-                    t3d = T3DBuilder()
-                    t3d.build(coll.all_objects, options)
-                    t3d.write(f'{dir}\\{coll.name}.t3d')
+            stats:list[T3DExportStats] = []
+            reductions:list[PolygonReduction] = []
+
+            cache = T3DExportCache(get_cache_path(), options) if self.incremental else None
 
-            else:
-                objects = _context.scene.objects
-                
-                if self.selected_objects:
-                    objects = _context.selected_objects
+            profiler = T3DProfiler(self.profile == 'PROF') if self.profile != 'NONE' else None
 
-                t3d = T3DBuilder()
-                t3d.build(objects, options)
-                t3d.write(self.filepath)
+            with profiler or nullcontext():
+                if self.selected_collections and self.workers != 1:
+                    self.export_parallel(get_selected_collection_names(), options, cache, profiler, reductions)
+
+                elif self.selected_collections:
+                    for name in get_selected_collection_names():
+                        coll:Collection = bpy.data.collections.get(name)
+                        dir = os.path.dirname(self.filepath)
+                        
+                        if (s := self.export(coll.all_objects, options, f'{dir}\\{coll.name}.t3d', cache, profiler, reductions)):
+                            stats.append(s)
+
+                else:
+                    objects = _context.scene.objects
+                    
+                    if self.selected_objects:
+                        objects = _context.selected_objects
+
+                    if (s := self.export(objects, options, self.filepath, cache, profiler, reductions)):
+                        stats.append(s)
 
             self.report({'INFO'}, 'T3D exported successful')
 
+            if profiler:
+                self.save_profile(profiler)
+
+            if cache:
+                cache.save()
+                self.report({'INFO'}, f'Incremental export: {cache.hits} actors reused, {cache.misses} rebuilt')
+
+            for s in stats:
+                self.report({'INFO'}, str(s))
+
+            if self.merge_polygons:
+                self.report_reductions(reductions)
+
         except Exception as e:
             self.report({'ERROR'}, str(e))
 
         # Export ASE
         if self.export_static_meshes:
-            bpy.ops.medge_map_editor.ase_export(filepath=self.filepath, 
-                                                units=self.units, 
-                                                selected_collection=self.selected_collections,
-                                                selected_objects=self.selected_objects)
+            try:
+                results = export_static_meshes(self.get_exported_objects(_context), self.filepath, unit_scale, _workers=self.workers)
+                self.report({'INFO'}, f'ASE exported successful: {sum(r.geometries for r in results)} StaticMeshes')
+
+            except (ASEExportError, OSError) as e:
+                self.report({'ERROR'}, str(e))
 
         return {'FINISHED'}
+
+
+    def get_exported_objects(self, _context:Context) -> list[Object]:
+        """
+        All objects that the selected collections, the selected objects or the scene option export, each one once
+        """
+        if self.selected_collections:
+            return list(dict.fromkeys(obj for name in get_selected_collection_names() for obj in bpy.data.collections[name].all_objects))
+
+        if self.selected_objects:
+            return _context.selected_objects
+
+        return _context.scene.objects
+
+
+    def export(self, _objects:list[Object], _options:T3DBuilderOptions, _filepath:str, _cache:T3DExportCache=None, _profiler:T3DProfiler=None, 
+               _reductions:list[PolygonReduction]=None) -> T3DExportStats | None:
+        t3d = T3DBuilder(_cache, _profiler, _reductions)
+
+        if self.streaming:
+            return t3d.stream(_objects, _options, _filepath, self.encoding)
+
+        t3d.build(_objects, _options)
+        t3d.write(_filepath, self.encoding)
+
+        return None
+
+
+    def export_parallel(self, _collection_names:list[str], _options:T3DBuilderOptions, _cache:T3DExportCache=None, _profiler:T3DProfiler=None, 
+                        _reductions:list[PolygonReduction]=None):
+        # Actors are built in the main thread, because bpy is not thread safe.
+        # Serialization and writing of each collection happens in the pool, which the profiler does not see.
+        start = time.perf_counter()
+        dir = os.path.dirname(self.filepath)
+
+        with T3DExportPool(self.workers) as pool:
+            for name in _collection_names:
+                coll:Collection = bpy.data.collections.get(name)
+
+                actors = T3DBuilder(_cache, _profiler, _reductions).build(coll.all_objects, _options)
+                pool.submit(T3DJob(f'{dir}\\{coll.name}.t3d', actors, self.encoding))
+
+            results = pool.results()
+
+        count = sum(r.actors for r in results)
+
+        if pool.error:
+            self.report({'WARNING'}, f'Worker processes stopped, the files were written one at a time: {pool.error}')
+
+        self.report({'INFO'}, f'{len(results)} collections, {count} actors in {time.perf_counter() - start:.2f}s using {pool.workers} workers')
     
 
+    def report_reductions(self, _reductions:list[PolygonReduction]):
+        # Every brush is listed in the Info editor, followed by the total
+        for r in _reductions:
+            self.report({'INFO'}, str(r))
+
+        before = sum(r.polygons_before for r in _reductions)
+        after = sum(r.polygons_after for r in _reductions)
+        saved = sum(r.bytes_saved for r in _reductions)
+
+        self.report({'INFO'}, f'Merged polygons of {len(_reductions)} brushes: {before} -> {after} polygons, {saved / 1024:.1f} KB saved')
+
+
+    def save_profile(self, _profiler:T3DProfiler):
+        for line in _profiler.report():
+            self.report({'INFO'}, line)
+
+        root = os.path.splitext(self.filepath)[0]
+
+        match self.profile:
+            case 'JSON':
+                _profiler.save_json(root + '.profile.json')
+                self.report({'INFO'}, f'Profile written to {root}.profile.json')
+            case 'PROF':
+                _profiler.save_prof(root + '.prof')
+                self.report({'INFO'}, f'Profile written to {root}.prof')
+
+
 # -----------------------------------------------------------------------------
 class MET_PT_SkylightSettings(Panel):
     bl_space_type = 'FILE_BROWSER'
@@ -0,0 +1,322 @@
+import numpy as np
+from array  import array
+from typing import TYPE_CHECKING
+
+from .scene import PolyList
+
+# Only used in annotations, the math below runs without Blender
+if TYPE_CHECKING:
+    from bpy.types import Object, Mesh
+
+
+# -----------------------------------------------------------------------------
+# Mesh Buffers
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+class MeshBuffers:
+    """
+    Grow-only arrays that are reused for every mesh that is read.
+    The arrays returned by `empty()` are only valid until the next mesh is read.
+    """
+    def __init__(self):
+        self.arrays: dict[str, np.ndarray] = {}
+
+
+    def empty(self, _name:str, _size:int, _dtype) -> np.ndarray:
+        array = self.arrays.get(_name)
+
+        if array is None or len(array) < _size:
+            capacity = max(_size, 2 * len(array)) if array is not None else _size
+            array = self.arrays[_name] = np.empty(capacity, dtype=_dtype)
+
+        return array[:_size]
+
+
+# -----------------------------------------------------------------------------
+def empty(_buffers:MeshBuffers | None, _name:str, _size:int, _dtype) -> np.ndarray:
+    if _buffers is None:
+        return np.empty(_size, dtype=_dtype)
+    
+    return _buffers.empty(_name, _size, _dtype)
+
+
+# -----------------------------------------------------------------------------
+def read_vertices(_mesh:'Mesh', _buffers:MeshBuffers=None) -> np.ndarray:
+    co = empty(_buffers, 'co', len(_mesh.vertices) * 3, np.float32)
+    _mesh.vertices.foreach_get('co', co)
+
+    return co.reshape(-1, 3)
+
+
+# -----------------------------------------------------------------------------
+def read_polygons(_mesh:'Mesh', _buffers:MeshBuffers=None) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns (loop_start, loop_total, normals, loop_vertex_index) of `_mesh`
+    """
+    count = len(_mesh.polygons)
+
+    loop_start = empty(_buffers, 'loop_start', count, np.int32)
+    loop_total = empty(_buffers, 'loop_total', count, np.int32)
+    normals    = empty(_buffers, 'normal', count * 3, np.float32)
+    loop_verts = empty(_buffers, 'vertex_index', len(_mesh.loops), np.int32)
+
+    _mesh.polygons.foreach_get('loop_start', loop_start)
+    _mesh.polygons.foreach_get('loop_total', loop_total)
+    _mesh.polygons.foreach_get('normal', normals)
+    _mesh.loops.foreach_get('vertex_index', loop_verts)
+
+    return loop_start, loop_total, normals.reshape(-1, 3), loop_verts
+
+
+# -----------------------------------------------------------------------------
+# Math
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+# The functions below follow the float32 evaluation order of mathutils,
+# so that the exported values are identical to the ones computed with Vector.
+def transform_points(_matrix, _points:np.ndarray) -> np.ndarray:
+    """
+    `_matrix @ point` for each point, like `Matrix @ Vector`:
+    each product is rounded to float32, the products of a row are summed in float64 and rounded once.
+    """
+    m = np.array(_matrix, dtype=np.float32)
+    x, y, z = _points[:, 0:1], _points[:, 1:2], _points[:, 2:3]
+
+    out = (x * m[:3, 0]).astype(np.float64)
+    out += y * m[:3, 1]
+    out += z * m[:3, 2]
+    out += m[:3, 3]
+
+    return out.astype(np.float32)
+
+
+# -----------------------------------------------------------------------------
+def normalize(_vectors:np.ndarray) -> np.ndarray:
+    """
+    Like `Vector.normalize()`: the squared length is summed in float64 from z to x,
+    its square root is rounded to float32 and the vectors are scaled by the float32 reciprocal.
+    Vectors that are too short become zero.
+    """
+    sq = np.square(_vectors, dtype=np.float64)
+    d = sq[:, 2] + sq[:, 1] + sq[:, 0]
+
+    valid = d > 1.0e-35
+    length = np.sqrt(d, where=valid, out=np.zeros_like(d)).astype(np.float32)
+    inv = np.divide(np.float32(1), length, where=valid, out=np.zeros_like(length))
+
+    return _vectors * inv[:, None]
+
+
+# -----------------------------------------------------------------------------
+def cross(_a:np.ndarray, _b:np.ndarray) -> np.ndarray:
+    out = np.empty_like(_a)
+    out[:, 0] = _a[:, 1] * _b[:, 2] - _a[:, 2] * _b[:, 1]
+    out[:, 1] = _a[:, 2] * _b[:, 0] - _a[:, 0] * _b[:, 2]
+    out[:, 2] = _a[:, 0] * _b[:, 1] - _a[:, 1] * _b[:, 0]
+
+    return out
+
+
+# -----------------------------------------------------------------------------
+# Face Basis
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+# Edges and normals with a squared length below this do not define a direction
+BASIS_EPSILON = 1.0e-12
+
+AXES = np.eye(3, dtype=np.float32)
+
+
+# -----------------------------------------------------------------------------
+def length_squared(_vectors:np.ndarray) -> np.ndarray:
+    sq = _vectors * _vectors
+    return sq[:, 2].astype(np.float64) + sq[:, 1] + sq[:, 0]
+
+
+# -----------------------------------------------------------------------------
+def perpendicular_axis(_vectors:np.ndarray) -> np.ndarray:
+    """
+    Unit vectors perpendicular to `_vectors`, projected from the world axis that is the least aligned with each vector.
+    Zero vectors get the x axis.
+    """
+    axes = AXES[np.argmin(np.abs(_vectors), axis=1)]
+    unit = normalize(_vectors)
+
+    return normalize(axes - unit * np.einsum('ij,ij->i', axes, unit)[:, None])
+
+
+# -----------------------------------------------------------------------------
+def face_basis(_co:np.ndarray, _loop_start:np.ndarray, _loop_total:np.ndarray, _loop_verts:np.ndarray, 
+               _normals:np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns (normals, u, v, repaired) of all faces.
+    TextureU is the direction of the first edge of a face and TextureV is the normal crossed with TextureU.
+    Faces with a degenerate first edge take TextureU from their longest edge, 
+    or else from the world axis that is the least aligned with the normal.
+    Faces without a normal get one that is perpendicular to TextureU.
+    `repaired` holds the indices of those faces, all other faces are identical to the first edge rule.
+    """
+    v0 = _co[_loop_verts[_loop_start]]
+    v1 = _co[_loop_verts[_loop_start + 1]]
+    edge = v1 - v0
+
+    u = normalize(edge)
+    normals = _normals
+
+    no_edge = length_squared(edge) <= BASIS_EPSILON
+    no_normal = length_squared(normals) <= BASIS_EPSILON
+    repaired = np.flatnonzero(no_edge | no_normal)
+
+    if len(repaired):
+        normals = normals.copy()
+        u[repaired], normals[repaired] = repair_basis(_co, _loop_start, _loop_total, _loop_verts, u, normals, repaired, no_edge[repaired])
+
+    v = cross(normals, u)
+
+    return normals, u, v, repaired
+
+
+# -----------------------------------------------------------------------------
+def repair_basis(_co:np.ndarray, _loop_start:np.ndarray, _loop_total:np.ndarray, _loop_verts:np.ndarray, 
+                 _u:np.ndarray, _normals:np.ndarray, _faces:np.ndarray, _no_edge:np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    start = _loop_start[_faces]
+    total = _loop_total[_faces]
+    u = _u[_faces]
+    normals = _normals[_faces]
+
+    # All edges of the faces, loop k runs to loop k + 1 of the same face
+    offsets = np.zeros(len(_faces) + 1, dtype=np.int64)
+    np.cumsum(total, out=offsets[1:])
+
+    face  = np.repeat(np.arange(len(_faces)), total)
+    local = np.arange(offsets[-1]) - offsets[face]
+
+    edges = _co[_loop_verts[start[face] + (local + 1) % total[face]]] - _co[_loop_verts[start[face] + local]]
+    lengths = length_squared(edges)
+
+    # The first edge of each face with the largest length
+    longest = np.maximum.reduceat(lengths, offsets[:-1])
+    candidates = np.flatnonzero(lengths == longest[face])
+    first = candidates[np.searchsorted(face[candidates], np.arange(len(_faces)))]
+
+    no_normal = length_squared(normals) <= BASIS_EPSILON
+
+    # Projected onto the plane of the face, in case the face is not planar
+    u[_no_edge] = edges[first[_no_edge]]
+    project = _no_edge & ~no_normal
+    u[project] -= normals[project] * np.einsum('ij,ij->i', u[project], normals[project])[:, None]
+    u[_no_edge] = normalize(u[_no_edge])
+
+    # All edges are degenerate or the longest edge is along the normal
+    use_axis = _no_edge & (length_squared(u) <= BASIS_EPSILON)
+    u[use_axis] = perpendicular_axis(normals[use_axis])
+
+    normals[no_normal] = normalize(cross(u[no_normal], perpendicular_axis(u[no_normal])))
+
+    return u, normals
+
+
+# -----------------------------------------------------------------------------
+# Polygons
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def to_array(_typecode:str, _values:np.ndarray) -> array:
+    values = array(_typecode)
+    values.frombytes(np.ascontiguousarray(_values, dtype=values.typecode).tobytes())
+
+    return values
+
+
+# -----------------------------------------------------------------------------
+def extract_polygons(_obj_eval:'Object', _unit_scale:float, _mirror, _apply_transforms=False, _buffers:MeshBuffers=None) -> PolyList:
+    """
+    `_obj_eval` is an evaluated object.
+    Vertices are written in reversed winding order and the texture axes are taken from the first edge of each face,
+    see `face_basis()` for faces where that edge is degenerate.
+    """
+    mesh = _obj_eval.data
+
+    co = read_vertices(mesh, _buffers)
+    loop_start, loop_total, normals, loop_verts = read_polygons(mesh, _buffers)
+
+    # Reverse the winding of every face
+    offsets = np.zeros(len(loop_total) + 1, dtype=np.int64)
+    np.cumsum(loop_total, out=offsets[1:])
+
+    face  = np.repeat(np.arange(len(loop_total)), loop_total)
+    local = np.arange(offsets[-1]) - offsets[face]
+    loops = loop_start[face] + loop_total[face] - 1 - local
+
+    corners = co[loop_verts[loops]]
+
+    unit_scale = np.float32(_unit_scale)
+    mirror     = np.array(_mirror, dtype=np.float32)
+
+    if _apply_transforms:
+        verts = transform_points(_obj_eval.matrix_world, corners) * unit_scale * mirror
+    else:
+        scale = np.array(_obj_eval.scale, dtype=np.float32)
+        verts = corners * scale * unit_scale * mirror
+
+    normals, u, v, _ = face_basis(co, loop_start, loop_total, loop_verts, normals)
+
+    return PolyList(to_array('f', verts[offsets[:-1]]),
+                    to_array('f', normals),
+                    to_array('f', u),
+                    to_array('f', v),
+                    to_array('f', verts),
+                    to_array('q', offsets))
+
+
+# -----------------------------------------------------------------------------
+# Validation
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def polygon_areas(_corners:np.ndarray, _offsets:np.ndarray) -> np.ndarray:
+    """
+    Area vectors with Newell's method, polygon k has the corners `_offsets[k]` up to `_offsets[k + 1]`.
+    The length of an area vector is the area of the polygon and it points along the normal.
+    Center the corners first, so that large coordinates do not cancel out.
+    """
+    starts = _offsets[:-1]
+    next = np.arange(1, len(_corners) + 1)
+    next[_offsets[1:] - 1] = starts
+
+    return np.add.reduceat(np.cross(_corners, _corners[next]), starts, axis=0) * 0.5
+
+
+# -----------------------------------------------------------------------------
+def check_polygons(_verts:np.ndarray, _loop_total:np.ndarray, _loop_verts:np.ndarray, 
+                   _plane_tolerance:float, _area_tolerance:float) -> tuple[np.ndarray, np.ndarray, float]:
+    """
+    Returns (degenerate, non_planar, volume) of the polygons of a mesh with vertices `_verts`,
+    the indices of the polygons with an area below `_area_tolerance`, 
+    the indices of the polygons with a vertex further than `_plane_tolerance` from the plane of the polygon
+    and the signed volume, which is negative if the normals of a closed mesh point inwards.
+    """
+    if not len(_loop_total):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), 0.0
+
+    offsets = np.zeros(len(_loop_total) + 1, dtype=np.int64)
+    np.cumsum(_loop_total, out=offsets[1:])
+    starts = offsets[:-1]
+
+    # Centered in float64, so that large coordinates do not cancel out
+    corners = _verts[_loop_verts].astype(np.float64)
+    corners -= corners.mean(axis=0)
+
+    face = np.repeat(np.arange(len(_loop_total)), _loop_total)
+
+    area = polygon_areas(corners, offsets)
+    length = np.sqrt(np.einsum('ij,ij->i', area, area))
+    degenerate = length <= _area_tolerance
+
+    normal = area / np.where(degenerate, 1.0, length)[:, None]
+    centroid = np.add.reduceat(corners, starts, axis=0) / _loop_total[:, None]
+
+    distance = np.abs(np.einsum('ij,ij->i', corners - centroid[face], normal[face]))
+    non_planar = (np.maximum.reduceat(distance, starts) > _plane_tolerance) & ~degenerate
+
+    volume = float(np.einsum('ij,ij->i', centroid, area).sum() / 3)
+
+    return np.flatnonzero(degenerate), np.flatnonzero(non_planar), volume
@@ -0,0 +1,472 @@
+import bpy
+from bpy.props           import StringProperty, EnumProperty, FloatProperty
+from bpy.types           import TOPBAR_MT_file_import, Operator, Context, Collection, Object, Mesh
+from bpy_extras.io_utils import ImportHelper
+from mathutils           import Vector, Euler, Matrix
+
+import os
+import math
+import time
+import numpy as np
+from dataclasses import dataclass, field
+
+from ...     import b3d_utils
+from ..props import new_actor, get_actor_prop
+from .scene  import ActorType, TrackIndex, EULER_TO_URU
+from .parser import (
+    T3DActorBlock,
+    open_t3d,
+    iter_actors,
+    parse_vector,
+    parse_struct,
+    parse_reference,
+    parse_bool,
+    parse_float)
+
+
+# -----------------------------------------------------------------------------
+@dataclass
+class T3DImportOptions:
+    unit_scale : float
+    light_power_scale : float # Brightness is divided by this when setting the energy
+
+
+# -----------------------------------------------------------------------------
+@dataclass
+class T3DImportStats:
+    actors : int = 0
+    size : int = 0 # Bytes
+    seconds : float = 0.0
+    skipped : dict[str, int] = field(default_factory=dict) # Dictionary of (actor class, count)
+
+    @property
+    def megabytes_per_second(self) -> float:
+        if self.seconds <= 0: return 0.0
+        return self.size / (1024 * 1024) / self.seconds
+
+    def __str__(self) -> str:
+        skipped = sum(self.skipped.values())
+        return f'{self.actors} actors in {self.seconds:.2f}s ({self.megabytes_per_second:.1f} MB/s), {skipped} skipped'
+
+
+# -----------------------------------------------------------------------------
+# T3DImporter
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+class T3DImporter:
+    """
+    Creates the actors of a .t3d file, the inverse of `T3DBuilder`.
+    Actors are created while the file is read, so only one actor block is in memory at a time.
+    """
+    def __init__(self, _options:T3DImportOptions, _collection:Collection):
+        self.options = _options
+        self.collection = _collection
+        self.mirror = Vector((1, -1, 1))
+        self.placeholder: Mesh | None = None # Shared by static meshes that have no prefab in this file
+        self.stats = T3DImportStats()
+
+
+    def load(self, _filepath:str) -> T3DImportStats:
+        start = time.perf_counter()
+
+        with open_t3d(_filepath) as f:
+            for actor in iter_actors(f):
+                try:
+                    obj = self.import_actor(actor)
+                except Exception as e:
+                    print(f'Could not import {actor.name}: {e}')
+                    obj = None
+
+                if obj:
+                    self.stats.actors += 1
+                else:
+                    self.stats.skipped[actor.cls] = self.stats.skipped.get(actor.cls, 0) + 1
+
+        self.stats.size = os.path.getsize(_filepath)
+        self.stats.seconds = time.perf_counter() - start
+
+        return self.stats
+
+
+    def import_actor(self, _actor:T3DActorBlock) -> Object | None:
+        match _actor.cls:
+            case 'Brush':
+                return self.import_brush(_actor)
+            case 'TdLadderVolume':
+                return self.import_ladder_volume(_actor)
+            case 'TdSwingVolume':
+                return self.import_volume(_actor, ActorType.SWING_VOLUME)
+            case 'TdZiplineVolume':
+                return self.import_zipline(_actor)
+            case 'BlockingVolume':
+                return self.import_blocking_volume(_actor)
+            case 'TdTriggerVolume':
+                return self.import_volume(_actor, ActorType.TRIGGER_VOLUME)
+            case 'TdKillVolume':
+                return self.import_volume(_actor, ActorType.KILL_VOLUME)
+            case 'StaticMeshActor':
+                return self.import_static_mesh(_actor)
+            case 'PlayerStart' | 'TdTimeTrialStart':
+                return self.import_player_start(_actor)
+            case 'TdTimerCheckpoint':
+                return self.import_checkpoint(_actor)
+            case 'PointLight':
+                return self.import_point_light(_actor)
+            case 'DirectionalLight':
+                return self.import_euler_light(_actor, 'SUN')
+            case 'SpotLight':
+                return self.import_euler_light(_actor, 'SPOT')
+            case 'TdAreaLight':
+                return self.import_area_light(_actor)
+
+        return None
+
+
+    # Transforms
+    # -------------------------------------------------------------------------
+    def to_blender(self, _point:tuple[float, float, float]) -> Vector:
+        return Vector(_point) / self.options.unit_scale * self.mirror
+
+
+    def get_location(self, _actor:T3DActorBlock) -> Vector:
+        return self.to_blender(parse_vector(_actor.properties.get('Location')))
+
+
+    def get_rotation(self, _actor:T3DActorBlock, _roll_offset=0.0) -> Euler:
+        # Inverse of `get_rotation_mirrored`, where X and Y are swapped
+        pitch, roll, yaw = parse_vector(_actor.properties.get('Rotation'), ('Pitch', 'Roll', 'Yaw'))
+
+        q = Euler((roll / EULER_TO_URU + _roll_offset, pitch / EULER_TO_URU, yaw / EULER_TO_URU)).to_quaternion()
+        q.x *= -1
+        q.w *= -1
+
+        return q.to_euler()
+
+
+    def get_scale(self, _actor:T3DActorBlock) -> Vector:
+        scale = Vector(parse_vector(_actor.properties.get('DrawScale3D'), _default=1.0))
+
+        return scale * parse_float(_actor.properties.get('DrawScale'), 1.0)
+
+
+    def set_transform(self, _obj:Object, _actor:T3DActorBlock):
+        _obj.location = self.get_location(_actor)
+        _obj.rotation_euler = self.get_rotation(_actor)
+
+
+    # Geometry
+    # -------------------------------------------------------------------------
+    def create_mesh(self, _actor:T3DActorBlock) -> Mesh | None:
+        """
+        Mesh in local space from the polygons of the brush, None if it has no polygons
+        """
+        polylist = _actor.polylist
+
+        if not polylist or not len(polylist): return None
+
+        verts   = np.frombuffer(polylist.vertices, dtype=np.float64).reshape(-1, 3)
+        offsets = np.frombuffer(polylist.offsets, dtype=np.int64)
+        pivot   = np.array(parse_vector(_actor.properties.get('PrePivot')))
+
+        verts = (verts - pivot) / self.options.unit_scale * np.array(self.mirror)
+
+        # The exporter reverses the winding of every face, reverse it back
+        counts = np.diff(offsets)
+        first  = np.repeat(offsets[:-1], counts)
+        last   = first + np.repeat(counts, counts) - 1
+        verts  = verts[first + last - np.arange(len(verts))]
+
+        # Polygons store their own corners, merge the ones that are at the same position
+        unique, loop_verts = np.unique(verts, axis=0, return_inverse=True)
+
+        return b3d_utils.new_mesh_from_arrays(unique, loop_verts.ravel(), offsets, _actor.name)
+
+
+    def get_placeholder(self) -> Mesh:
+        if not self.placeholder:
+            self.placeholder = b3d_utils.create_cube()
+            self.placeholder.name = 'T3D_Placeholder'
+
+        return self.placeholder
+
+
+    def find_object(self, _path:str | None) -> Object | None:
+        # GenericBrowser paths end with the object name, e.g. Package.Group.Name
+        if not _path: return None
+        return bpy.data.objects.get(_path.rsplit('.', 1)[-1])
+
+
+    # Brushes
+    # -------------------------------------------------------------------------
+    def import_brush(self, _actor:T3DActorBlock) -> Object | None:
+        # The builder brush is not part of the level
+        if _actor.properties.get('CsgOper', 'CSG_Active') == 'CSG_Active': return None
+
+        obj = self.import_volume(_actor, ActorType.BRUSH)
+
+        texture = next((t for t in _actor.polylist.textures if t), None) if _actor.polylist else None
+
+        if (material := self.find_object(texture)):
+            get_actor_prop(obj).brush.material = material
+
+        return obj
+
+
+    def import_volume(self, _actor:T3DActorBlock, _actor_type:ActorType) -> Object:
+        mesh = self.create_mesh(_actor)
+        obj = new_actor(_actor_type, mesh, self.collection)
+
+        # Some actors replace their mesh on init
+        if mesh and obj.data != mesh:
+            b3d_utils.set_data(obj, mesh)
+
+        self.set_transform(obj, _actor)
+        obj.name = _actor.name
+
+        return obj
+
+
+    def import_ladder_volume(self, _actor:T3DActorBlock) -> Object:
+        obj = self.import_volume(_actor, ActorType.LADDER_VOLUME)
+        get_actor_prop(obj).ladder.is_pipe = _actor.properties.get('LadderType') == 'LT_Pipe'
+        obj.name = _actor.name
+
+        return obj
+
+
+    def import_blocking_volume(self, _actor:T3DActorBlock) -> Object:
+        obj = self.import_volume(_actor, ActorType.BLOCKING_VOLUME)
+
+        if (material := self.find_object(parse_reference(_actor.get('PhysMaterialOverride')))):
+            get_actor_prop(obj).blocking_volume.phys_material = material
+
+        return obj
+
+
+    def import_zipline(self, _actor:T3DActorBlock) -> Object:
+        # The bounding box is generated from the curve, so the polygons are not needed
+        obj = new_actor(ActorType.ZIPLINE, None, self.collection)
+        zipline = get_actor_prop(obj).zipline
+
+        self.set_transform(obj, _actor)
+        obj.name = _actor.name
+
+        b3d_utils.link_object_to_scene(zipline.curve, self.collection)
+
+        # The curve is a child of the bounding box, at its origin
+        world_to_local = Matrix.LocRotScale(obj.location, obj.rotation_euler, None).inverted()
+        points = zipline.curve.data.splines[0].points
+
+        for p, key in zip(points, ('Start', 'Middle', 'End')):
+            co = world_to_local @ self.to_blender(parse_vector(_actor.properties.get(key)))
+            p.co = (*co, 1)
+
+        zipline.update_bounds(True)
+
+        return obj
+
+
+    # Actors
+    # -------------------------------------------------------------------------
+    def import_static_mesh(self, _actor:T3DActorBlock) -> Object:
+        path = parse_reference(_actor.get('StaticMesh'))
+        prefab = self.find_object(path)
+
+        if prefab and prefab.type != 'MESH':
+            prefab = None
+
+        obj = new_actor(ActorType.STATIC_MESH, prefab.data if prefab else self.get_placeholder(), self.collection)
+        static_mesh = get_actor_prop(obj).static_mesh
+
+        if prefab:
+            static_mesh.use_prefab = True
+            static_mesh.prefab = prefab
+        else:
+            # Without prefab the object name is exported as the StaticMesh
+            obj.name = path.rsplit('.', 1)[-1] or _actor.name
+
+        static_mesh.is_hidden_game = parse_bool(_actor.get('HiddenGame'))
+
+        self.set_transform(obj, _actor)
+        obj.scale = self.get_scale(_actor)
+
+        return obj
+
+
+    def import_player_start(self, _actor:T3DActorBlock) -> Object:
+        obj = new_actor(ActorType.PLAYER_START, None, self.collection)
+        player_start = get_actor_prop(obj).player_start
+
+        player_start.is_time_trial = _actor.cls == 'TdTimeTrialStart'
+
+        if (track_index := _actor.properties.get('TrackIndex')) in TrackIndex.__members__:
+            player_start.track_index = track_index
+
+        self.set_transform(obj, _actor)
+
+        # PlayerStartBuilder raises the location by one unit
+        obj.location.z -= 1 / self.options.unit_scale
+
+        return obj
+
+
+    def import_checkpoint(self, _actor:T3DActorBlock) -> Object:
+        obj = new_actor(ActorType.CHECKPOINT, None, self.collection)
+        checkpoint = get_actor_prop(obj).checkpoint
+        track = parse_struct(_actor.properties.get('BelongToTracks(0)', ''))
+
+        if (track_index := track.get('TrackIndex')) in TrackIndex.__members__:
+            checkpoint.track_index = track_index
+
+        checkpoint.order_index          = int(track.get('OrderIndex', 0))
+        checkpoint.no_intermediate_time = parse_bool(track.get('bNoIntermediateTime'))
+        checkpoint.custom_height        = parse_float(_actor.properties.get('CustomHeight'))
+        checkpoint.custom_width_scale   = parse_float(_actor.properties.get('CustomWidthScale'))
+        checkpoint.no_respawn           = parse_bool(_actor.properties.get('bNoRespawn'))
+        checkpoint.enabled              = parse_bool(_actor.properties.get('bEnabled'), True)
+        checkpoint.should_be_based      = parse_bool(_actor.properties.get('bShouldBeBased'), True)
+
+        obj.location = self.get_location(_actor)
+
+        return obj
+
+
+    # Lights
+    # -------------------------------------------------------------------------
+    def new_light(self, _actor:T3DActorBlock, _type:str) -> Object:
+        light = bpy.data.lights.new(_actor.name, _type)
+        light.color = Vector(parse_vector(_actor.get('LightColor'), ('R', 'G', 'B'), 255.0)) / 255
+
+        brightness = parse_float(_actor.get('Brightness'), 1.0)
+
+        if _type != 'SUN' and self.options.light_power_scale > 0:
+            brightness /= self.options.light_power_scale
+
+        light.energy = brightness
+
+        obj = b3d_utils.new_object(light, _actor.name, self.collection)
+        obj.location = self.get_location(_actor)
+
+        return obj
+
+
+    def set_cutoff_distance(self, _obj:Object, _actor:T3DActorBlock):
+        if (radius := parse_float(_actor.get('BakerCutOffRadius'))) > 0:
+            _obj.data.use_custom_distance = True
+            _obj.data.cutoff_distance = radius / self.options.unit_scale
+
+
+    def import_point_light(self, _actor:T3DActorBlock) -> Object:
+        obj = self.new_light(_actor, 'POINT')
+        obj.data.shadow_soft_size = parse_float(_actor.get('Radius')) / self.options.unit_scale
+        self.set_cutoff_distance(obj, _actor)
+
+        get_actor_prop(obj).point_light.sample_factor = parse_float(_actor.get('SampleFactor'), 1.0)
+
+        return obj
+
+
+    def import_euler_light(self, _actor:T3DActorBlock, _type:str) -> Object:
+        obj = self.new_light(_actor, _type)
+
+        # Inverse of `EulerLightBuilder.get_rotation`: the light points along the X axis of its rotation in UnrealEd
+        pitch, yaw = (v / EULER_TO_URU for v in parse_vector(_actor.properties.get('Rotation'), ('Pitch', 'Yaw')))
+        direction = Vector((math.cos(pitch) * math.cos(yaw), math.cos(pitch) * math.sin(yaw), math.sin(pitch))) * self.mirror
+
+        obj.rotation_euler = direction.to_track_quat('-Z', 'Y').to_euler()
+
+        me_actor = get_actor_prop(obj)
+        settings = me_actor.directional_light if _type == 'SUN' else me_actor.spot_light
+        settings.sample_factor = parse_float(_actor.get('SampleFactor'), 1.0)
+
+        return obj
+
+
+    def import_area_light(self, _actor:T3DActorBlock) -> Object:
+        obj = self.new_light(_actor, 'AREA')
+        light = obj.data
+
+        # AreaLightBuilder subtracts 90 degrees from the roll
+        obj.rotation_euler = self.get_rotation(_actor, math.pi / 2)
+
+        light.shape = 'RECTANGLE'
+        light.size = parse_float(_actor.get('SizeX'), 1.0) / self.options.unit_scale
+        light.size_y = parse_float(_actor.get('SizeZ'), 1.0) / self.options.unit_scale
+        light.shadow_soft_size = parse_float(_actor.get('Radius'))
+        self.set_cutoff_distance(obj, _actor)
+
+        area_light = get_actor_prop(obj).area_light
+        area_light.sample_factor = parse_float(_actor.get('SampleFactor'), 1.0)
+        area_light.is_window_light = parse_bool(_actor.get('bIsWindowLight'))
+
+        return obj
+
+
+# -----------------------------------------------------------------------------
+# Operator
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+class MET_OT_T3D_Import(Operator, ImportHelper):
+    '''Import actors from a .t3d file'''
+    bl_idname       = 'medge_map_editor.t3d_import'
+    bl_label        = 'Import T3D'
+    bl_options      = {'UNDO'}
+    filename_ext    = '.t3d'
+
+
+    filter_glob: StringProperty(
+        default='*.t3d',
+        options={'HIDDEN'},
+        maxlen=255)
+
+
+    units_scale = {
+        'M': 100.0,
+        'U': 1.0}
+
+
+    units: EnumProperty(
+        default='M',
+        items=(('M', 'Meters', ''),
+               ('U', 'Unreal', '')),
+        name='Units')
+
+    light_power_scale: FloatProperty(name='Light Power Scale', min=0.0, default=1.0, description='The light power scale that was used for the export')
+
+
+    def execute(self, _context:Context):
+        try:
+            options = T3DImportOptions(self.units_scale[self.units], self.light_power_scale)
+
+            name = os.path.splitext(os.path.basename(self.filepath))[0]
+            collection = b3d_utils.new_collection(name)
+
+            stats = T3DImporter(options, collection).load(self.filepath)
+
+            self.report({'INFO'}, f'T3D imported: {stats}')
+
+            for cls, count in sorted(stats.skipped.items()):
+                print(f'Skipped {count} {cls}')
+
+        except Exception as e:
+            self.report({'ERROR'}, str(e))
+
+        return {'FINISHED'}
+
+
+# -----------------------------------------------------------------------------
+# Registration
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def menu_func_import(self, _context:Context):
+    self.layout.operator(MET_OT_T3D_Import.bl_idname, text='MEdge T3D (.t3d)')
+
+
+# -----------------------------------------------------------------------------
+def register():
+    TOPBAR_MT_file_import.append(menu_func_import)
+
+
+# -----------------------------------------------------------------------------
+def unregister():
+    TOPBAR_MT_file_import.remove(menu_func_import)
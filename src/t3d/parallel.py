@@ -0,0 +1,108 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures         import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses        import dataclass
+
+from .scene  import Actor
+from .writer import write_t3d, ENCODING
+
+
+# -----------------------------------------------------------------------------
+@dataclass
+class T3DJob:
+    filepath : str
+    actors : list[Actor | str] # Snapshot of the actors, built in the main thread
+    encoding : str = ENCODING
+
+
+# -----------------------------------------------------------------------------
+@dataclass
+class T3DJobResult:
+    filepath : str
+    actors : int
+    seconds : float
+
+
+# -----------------------------------------------------------------------------
+def run_job(_job:T3DJob) -> T3DJobResult:
+    start = time.perf_counter()
+    count = write_t3d(_job.filepath, _job.actors, 1 << 20, _job.encoding)
+
+    return T3DJobResult(_job.filepath, count, time.perf_counter() - start)
+
+
+# -----------------------------------------------------------------------------
+def get_pool_context() -> multiprocessing.context.BaseContext:
+    # Workers are spawned on every platform. Forking Blender copies its other threads' locks in whatever state they are in,
+    # so a forked worker can deadlock. A spawned worker is a plain Python interpreter that imports this module through
+    # the add-on package, whose __init__ skips the Blender modules in worker processes.
+    return multiprocessing.get_context('spawn')
+
+
+# -----------------------------------------------------------------------------
+class T3DExportPool:
+    """
+    Serializes and writes jobs in worker processes, while the main thread snapshots the next job.
+    Results are returned in the order the jobs were submitted.
+    Jobs run in the calling process if `_workers == 1`, or if the workers stop, e.g. because they cannot import the add-on.
+    Subclasses can replace `run_job` with another module level function to run other jobs.
+    """
+    run_job = staticmethod(run_job)
+
+    def __init__(self, _workers=0):
+        self.workers = _workers or os.cpu_count() or 1
+        self.executor: ProcessPoolExecutor | None = None
+        self.pending: list[tuple[T3DJob, Future | T3DJobResult]] = [] # List of (job, future or result)
+        self.error: str | None = None # Why the jobs ran in the calling process after all
+
+        if self.workers > 1:
+            self.executor = ProcessPoolExecutor(self.workers, get_pool_context())
+        else:
+            self.workers = 1
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, _exc_type, _exc_value, _traceback):
+        if self.executor:
+            self.executor.shutdown(cancel_futures=_exc_type is not None)
+
+
+    def submit(self, _job:T3DJob):
+        if self.executor:
+            try:
+                self.pending.append((_job, self.executor.submit(self.run_job, _job)))
+                return
+            except BrokenProcessPool as e:
+                self.stop(e)
+
+        self.pending.append((_job, self.run_job(_job)))
+
+
+    def results(self) -> list:
+        results = []
+
+        for job, pending in self.pending:
+            if isinstance(pending, Future):
+                try:
+                    pending = pending.result()
+                except BrokenProcessPool as e:
+                    self.stop(e)
+                    pending = self.run_job(job)
+
+            results.append(pending)
+
+        return results
+
+
+    def stop(self, _error:Exception):
+        # The remaining jobs are run in the calling process
+        if self.error is None:
+            self.error = str(_error)
+            print(f'Export workers stopped, writing the remaining files in this process: {self.error}')
+
+        self.workers = 1
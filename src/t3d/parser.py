@@ -0,0 +1,195 @@
+import codecs
+from array       import array
+from dataclasses import dataclass, field
+from typing      import Iterator, TextIO
+
+
+# -----------------------------------------------------------------------------
+# Blocks
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+@dataclass
+class T3DPolyList:
+    """
+    Vertices are a flat array with three values per vertex, polygon k owns vertices offsets[k] up to offsets[k + 1]
+    """
+    vertices : array = field(default_factory=lambda: array('d'))
+    offsets : array = field(default_factory=lambda: array('q', [0]))
+    textures : list[str | None] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+# -----------------------------------------------------------------------------
+@dataclass
+class T3DObject:
+    cls : str
+    name : str
+    properties : dict[str, str] = field(default_factory=dict)
+
+
+# -----------------------------------------------------------------------------
+@dataclass
+class T3DActorBlock:
+    cls : str
+    name : str
+    properties : dict[str, str] = field(default_factory=dict)
+    objects : list[T3DObject] = field(default_factory=list) # Components, in the order they appear
+    polylist : T3DPolyList | None = None
+
+    def get(self, _key:str, _default:str=None) -> str | None:
+        """
+        Value of a property of the actor, or else of the first component that has it
+        """
+        if (value := self.properties.get(_key)) is not None:
+            return value
+
+        for obj in self.objects:
+            if (value := obj.properties.get(_key)) is not None:
+                return value
+
+        return _default
+
+
+# -----------------------------------------------------------------------------
+# Values
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def parse_header(_line:str) -> dict[str, str]:
+    # e.g. Begin Actor Class=Brush Name=Brush_0 Archetype=Brush'Engine.Default__Brush'
+    return dict(token.split('=', 1) for token in _line.split()[2:] if '=' in token)
+
+
+# -----------------------------------------------------------------------------
+def parse_struct(_value:str) -> dict[str, str]:
+    # e.g. (X=1.000000,Y=2.000000,Z=3.000000)
+    return dict(item.split('=', 1) for item in _value.strip('()').split(',') if '=' in item)
+
+
+# -----------------------------------------------------------------------------
+def parse_vector(_value:str | None, _keys=('X', 'Y', 'Z'), _default=0.0) -> tuple[float, ...]:
+    if not _value:
+        return (_default,) * len(_keys)
+
+    struct = parse_struct(_value)
+
+    return tuple(float(struct.get(k, _default)) for k in _keys)
+
+
+# -----------------------------------------------------------------------------
+def parse_reference(_value:str | None) -> str:
+    # e.g. StaticMesh'Package.Group.Name' returns Package.Group.Name
+    if not _value: return ''
+
+    start = _value.find('\'')
+
+    if start < 0: return _value
+
+    return _value[start + 1:_value.rfind('\'')]
+
+
+# -----------------------------------------------------------------------------
+def parse_bool(_value:str | None, _default=False) -> bool:
+    if _value is None: return _default
+    return _value.strip().lower() == 'true'
+
+
+# -----------------------------------------------------------------------------
+def parse_float(_value:str | None, _default=0.0) -> float:
+    if _value is None: return _default
+    return float(_value)
+
+
+# -----------------------------------------------------------------------------
+# Reader
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def open_t3d(_filepath:str, _buffer_size=1 << 20) -> TextIO:
+    """
+    UnrealEd writes UTF-16 with a byte order mark, files without one are ANSI like UnrealEd reads them
+    """
+    with open(_filepath, 'rb') as f:
+        bom = f.read(3)
+
+    if bom[:2] in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+        encoding = 'utf-16'
+    elif bom == codecs.BOM_UTF8:
+        encoding = 'utf-8-sig'
+    else:
+        encoding = 'cp1252'
+
+    return open(_filepath, 'r', encoding=encoding, errors='replace', buffering=_buffer_size)
+
+
+# -----------------------------------------------------------------------------
+def iter_actors(_file:TextIO) -> Iterator[T3DActorBlock]:
+    """
+    Yields each `Begin Actor ... End Actor` block of a .t3d file.
+    The file is read line by line in a single pass, only the current actor is kept in memory.
+    """
+    actor: T3DActorBlock | None = None
+    objects: list[T3DObject] = [] # Stack of the open `Begin Object` blocks
+    polylist: T3DPolyList | None = None
+    in_brush = False
+    in_polygon = False
+
+    for line in _file:
+        line = line.strip()
+
+        if not line: continue
+
+        if actor is None:
+            if line.startswith('Begin Actor'):
+                header = parse_header(line)
+                actor = T3DActorBlock(header.get('Class', ''), header.get('Name', ''))
+            continue
+
+        if in_polygon:
+            if line[0] == 'V':
+                # Vertex   X,Y,Z
+                polylist.vertices.extend(map(float, line[6:].split(',')))
+            elif line.startswith('End Polygon'):
+                polylist.offsets.append(len(polylist.vertices) // 3)
+                in_polygon = False
+            # Origin, Normal, TextureU, TextureV and Pan are recomputed on export
+            continue
+
+        if line.startswith('Begin '):
+            match line[6:].split(' ', 1)[0]:
+                case 'Polygon':
+                    polylist.textures.append(parse_header(line).get('Texture'))
+                    in_polygon = True
+                case 'PolyList':
+                    polylist = actor.polylist = T3DPolyList()
+                case 'Brush':
+                    in_brush = True
+                case 'Object':
+                    header = parse_header(line)
+                    obj = T3DObject(header.get('Class', ''), header.get('Name', ''))
+                    actor.objects.append(obj)
+                    objects.append(obj)
+            continue
+
+        if line.startswith('End '):
+            match line[4:].split(' ', 1)[0]:
+                case 'Actor':
+                    yield actor
+                    actor = None
+                    objects.clear()
+                    polylist = None
+                    in_brush = False
+                case 'Brush':
+                    in_brush = False
+                case 'Object':
+                    if objects: objects.pop()
+            continue
+
+        key, sep, value = line.partition('=')
+
+        if not sep or in_brush: continue
+
+        if objects:
+            objects[-1].properties[key] = value
+        else:
+            actor.properties[key] = value
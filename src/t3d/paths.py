@@ -0,0 +1,145 @@
+import bpy
+from bpy.types        import Scene, Depsgraph, Collection, ID
+from bpy.app.handlers import depsgraph_update_post, load_post, undo_post, redo_post, persistent
+
+from ... import b3d_utils
+
+
+# -----------------------------------------------------------------------------
+class CollectionPaths:
+    """
+    Package path of every object below the root collection, e.g. `Package.Group.`, as it is in the UnrealEd GenericBrowser.
+    The index is built on first use and then patched from depsgraph collection updates,
+    so exports do not have to walk the collection tree again.
+    Ids are tracked by `session_uid`, renaming an object does not change its path.
+    If an object is linked to more than one collection, the last one that is walked wins.
+    """
+    def __init__(self, _collection_root:str):
+        self.root = _collection_root
+        self.objects: dict[int, str] = {} # Dictionary of (object session_uid, collection path)
+        self.collections: dict[int, tuple[int | None, str, list[int], list[int]]] = {} # Dictionary of (collection session_uid, (parent, path, objects, children))
+        self.valid = False
+        self.rebuilds = 0
+        self.patches = 0
+
+
+    def __getitem__(self, _key:ID | str) -> str:
+        if not self.valid:
+            self.rebuild()
+
+        if isinstance(_key, str):
+            if not (_key := bpy.data.objects.get(_key)): return ''
+
+        return self.objects.get(_key.session_uid, '')
+
+
+    def invalidate(self):
+        self.valid = False
+
+
+    def rebuild(self):
+        self.objects.clear()
+        self.collections.clear()
+
+        if (root := bpy.data.collections.get(self.root)):
+            self.add_hierarchy(root, None, '')
+        else:
+            print(f'Collection does not exists: {self.root}')
+
+        self.valid = True
+        self.rebuilds += 1
+
+
+    def add_hierarchy(self, _collection:Collection, _parent:int | None, _path:str):
+        objects  = [obj.session_uid for obj in _collection.objects]
+        children = [child.session_uid for child in _collection.children]
+
+        self.collections[_collection.session_uid] = (_parent, _path, objects, children)
+
+        for uid in objects:
+            self.objects[uid] = _path
+
+        for child in _collection.children:
+            self.add_hierarchy(child, _collection.session_uid, _path + child.name + '.')
+
+
+    def remove_hierarchy(self, _uid:int):
+        if not (entry := self.collections.pop(_uid, None)): return
+
+        _, path, objects, children = entry
+
+        for uid in objects:
+            if self.objects.get(uid) == path:
+                del self.objects[uid]
+
+        for child in children:
+            self.remove_hierarchy(child)
+
+
+    def patch(self, _collection:Collection):
+        """
+        Walk `_collection` again after its objects, children or name changed
+        """
+        uid = _collection.session_uid
+
+        if not (entry := self.collections.get(uid)):
+            # The root may have been created or renamed
+            if _collection.name == self.root:
+                self.invalidate()
+            return
+
+        parent = entry[0]
+
+        if parent is None:
+            if _collection.name != self.root:
+                self.invalidate()
+                return
+            path = ''
+        else:
+            path = self.collections[parent][1] + _collection.name + '.'
+
+        self.remove_hierarchy(uid)
+        self.add_hierarchy(_collection, parent, path)
+        self.patches += 1
+
+
+collection_paths = CollectionPaths('GenericBrowser')
+
+
+# -----------------------------------------------------------------------------
+@persistent
+def on_collection_paths_depsgraph_update(_scene:Scene, _depsgraph:Depsgraph):
+    if not collection_paths.valid: return
+    if not _depsgraph.id_type_updated('COLLECTION'): return
+
+    for update in _depsgraph.updates:
+        if isinstance(update.id, Collection):
+            collection_paths.patch(update.id.original)
+
+
+# -----------------------------------------------------------------------------
+@persistent
+def on_collection_paths_invalidate(_scene:Scene, *_args):
+    # Loading a file or undoing replaces all collections without depsgraph updates for them
+    collection_paths.invalidate()
+
+
+# -----------------------------------------------------------------------------
+# Registration
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def register():
+    b3d_utils.add_callback(depsgraph_update_post, on_collection_paths_depsgraph_update)
+
+    for handler in (load_post, undo_post, redo_post):
+        b3d_utils.add_callback(handler, on_collection_paths_invalidate)
+
+    collection_paths.invalidate()
+
+
+# -----------------------------------------------------------------------------
+def unregister():
+    b3d_utils.remove_callback(depsgraph_update_post, on_collection_paths_depsgraph_update)
+
+    for handler in (load_post, undo_post, redo_post):
+        b3d_utils.remove_callback(handler, on_collection_paths_invalidate)
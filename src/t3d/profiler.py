@@ -0,0 +1,145 @@
+import cProfile
+import json
+import time
+from contextlib  import contextmanager
+from dataclasses import dataclass, asdict
+from typing      import Iterator
+
+
+# -----------------------------------------------------------------------------
+@dataclass
+class PhaseStats:
+    calls : int = 0
+    seconds : float = 0.0
+    polygons : int = 0
+    vertices : int = 0
+    bytes : int = 0
+
+    def add(self, _other:'PhaseStats'):
+        self.calls    += _other.calls
+        self.seconds  += _other.seconds
+        self.polygons += _other.polygons
+        self.vertices += _other.vertices
+        self.bytes    += _other.bytes
+
+
+# -----------------------------------------------------------------------------
+class T3DProfiler:
+    """
+    Wall time, call count, polygons, vertices and bytes of each export phase, per actor type.
+    Phases nest, e.g. `polygons` runs inside `actor`, so their times are inclusive.
+    `cached` counts the actors and bytes taken from the export cache, the time to find them is in `hash`.
+    With `_cprofile` a cProfile.Profile runs while the profiler is entered, which can be saved as a .prof file.
+
+        with T3DProfiler() as profiler:
+            T3DBuilder(_profiler=profiler).stream(objects, options, filepath)
+    """
+    # In the order they are reported
+    PHASES = ('build', 'stream', 'hash', 'cached', 'actor', 'polygons', 'serialize', 'write')
+
+
+    def __init__(self, _cprofile=False):
+        self.phases: dict[tuple[str, str], PhaseStats] = {} # Dictionary of ((phase, actor type), stats)
+        self.actor_type = ''
+        self.cprofile = cProfile.Profile() if _cprofile else None
+
+
+    def __enter__(self):
+        if self.cprofile:
+            self.cprofile.enable()
+
+        return self
+
+
+    def __exit__(self, _exc_type, _exc_value, _traceback):
+        if self.cprofile:
+            self.cprofile.disable()
+
+
+    def get(self, _phase:str, _actor_type:str=None) -> PhaseStats:
+        key = (_phase, self.actor_type if _actor_type is None else _actor_type)
+
+        if (stats := self.phases.get(key)) is None:
+            stats = self.phases[key] = PhaseStats()
+
+        return stats
+
+
+    @contextmanager
+    def measure(self, _phase:str, _actor_type:str=None) -> Iterator[PhaseStats]:
+        """
+        Nested phases without an actor type are attributed to the actor type of the enclosing phase
+        """
+        stats = self.get(_phase, _actor_type)
+        outer = self.actor_type
+
+        if _actor_type is not None:
+            self.actor_type = _actor_type
+
+        start = time.perf_counter()
+
+        try:
+            yield stats
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+            self.actor_type = outer
+
+
+    def totals(self) -> dict[str, PhaseStats]:
+        totals: dict[str, PhaseStats] = {}
+
+        for (phase, _), stats in self.phases.items():
+            totals.setdefault(phase, PhaseStats()).add(stats)
+
+        return totals
+
+
+    def report(self) -> list[str]:
+        lines = []
+        order = {phase: k for k, phase in enumerate(self.PHASES)}
+        totals = self.totals()
+
+        for phase in sorted(totals, key=lambda p: order.get(p, len(order))):
+            lines.append(format_stats(phase, totals[phase]))
+
+            per_type = [(t, s) for (p, t), s in self.phases.items() if p == phase and t]
+
+            for actor_type, stats in sorted(per_type, key=lambda item: -item[1].seconds):
+                lines.append('    ' + format_stats(actor_type, stats))
+
+        return lines
+
+
+    def to_dict(self) -> dict:
+        return {
+            'totals': {phase: asdict(stats) for phase, stats in self.totals().items()},
+            'phases': [{'phase': phase, 'actor_type': actor_type, **asdict(stats)} for (phase, actor_type), stats in self.phases.items()]}
+
+
+    def save_json(self, _filepath:str):
+        with open(_filepath, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+    def save_prof(self, _filepath:str):
+        """
+        Open with `python -m pstats` or snakeviz
+        """
+        if not self.cprofile:
+            raise ValueError('Profiler was created without cProfile')
+
+        self.cprofile.dump_stats(_filepath)
+
+
+# -----------------------------------------------------------------------------
+def format_stats(_label:str, _stats:PhaseStats) -> str:
+    text = f'{_label}: {_stats.seconds * 1000:.1f} ms, {_stats.calls} calls'
+
+    if _stats.polygons:
+        text += f', {_stats.polygons} polygons, {_stats.vertices} vertices'
+
+    if _stats.bytes:
+        text += f', {_stats.bytes / 1024:.1f} KB'
+
+    return text
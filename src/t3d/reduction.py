@@ -0,0 +1,251 @@
+import math
+import numpy as np
+from array       import array
+from dataclasses import dataclass
+
+from .scene    import PolyList
+from .writer   import NEWLINE
+from .geometry import to_array, polygon_areas
+
+
+# In Unreal units. UnrealEd treats points within 0.1 units of a plane as on the plane,
+# merged polygons stay ten times closer to it, so UnrealEd never sees them as bent.
+PLANE_TOLERANCE  = 0.01
+AREA_TOLERANCE   = 1.0e-4
+NORMAL_TOLERANCE = 1.0e-5 # 1 - cos of the largest angle between the normals of polygons that are merged
+CONVEX_TOLERANCE = 1.0e-6 # Relative to the edge lengths, allows collinear vertices
+
+# The integer part of '%.6f' % x has k + 1 digits if abs(x) rounds to at least 10 ** k
+DIGIT_THRESHOLDS = np.array([10.0 ** k - 5e-7 for k in range(1, 40)])
+
+# Characters of str(PolyList) around the values, see `PolyList.__str__`
+POLYGON_TEXT    = len('\tOrigin   \n\tNormal   \n\tTextureU \n\tTextureV \nEnd Polygon\n')
+VERTEX_TEXT     = len('\tVertex   \n')
+TEXTURED_HEADER = len('Begin Polygon Texture= Flags=3584 \n')
+LINKED_HEADER   = len('Begin Polygon Flags=3584 Link= \n')
+
+
+# -----------------------------------------------------------------------------
+@dataclass
+class PolygonReduction:
+    name : str
+    polygons_before : int
+    polygons_after : int
+    bytes_saved : int # In the file, with NEWLINE line endings and a single byte encoding
+
+    @property
+    def polygons_saved(self) -> int:
+        return self.polygons_before - self.polygons_after
+
+    def __str__(self) -> str:
+        return f'{self.name}: {self.polygons_before} -> {self.polygons_after} polygons, {self.bytes_saved} bytes saved'
+
+
+# -----------------------------------------------------------------------------
+def get_text_size(_text:str) -> int:
+    return len(_text) + (len(NEWLINE) - 1) * _text.count('\n')
+
+
+# -----------------------------------------------------------------------------
+def get_number_widths(_values:array) -> int:
+    """
+    Total length of the values formatted with '%.6f', without formatting them
+    """
+    values = np.frombuffer(_values, dtype=np.float32).astype(np.float64)
+    digits = 1 + np.searchsorted(DIGIT_THRESHOLDS, np.abs(values), side='right')
+
+    return int(digits.sum()) + 7 * len(values) + int(np.signbit(values).sum())
+
+
+# -----------------------------------------------------------------------------
+def get_polylist_size(_polylist:PolyList) -> int:
+    """
+    `get_text_size(str(_polylist))` computed from the values and counts, without serializing the polylist
+    """
+    count = len(_polylist)
+    corners = len(_polylist.Vertices) // 3
+    lines = 6 * count + corners
+
+    # Each point has two commas
+    size = count * POLYGON_TEXT + corners * VERTEX_TEXT + 2 * (4 * count + corners)
+
+    for values in (_polylist.Origins, _polylist.Normals, _polylist.TextureU, _polylist.TextureV, _polylist.Vertices):
+        size += get_number_widths(values)
+
+    # Polygons with a texture name it, the others are linked by their index among the polygons without one
+    link = 0
+
+    for k in range(count):
+        if (texture := _polylist.get_texture(k)):
+            size += TEXTURED_HEADER + len(texture)
+        else:
+            size += LINKED_HEADER + len(str(link))
+            link += 1
+
+    return size + (len(NEWLINE) - 1) * lines
+
+
+# -----------------------------------------------------------------------------
+class CoplanarMerger:
+    """
+    Merges adjacent polygons that lie in the same plane and have the same texture into convex polygons.
+    Polygons are adjacent if they share an edge, vertices are shared if their exported coordinates are equal.
+    A merged polygon keeps the origin, normal and texture axes of the polygon with the lowest index.
+    Polygons without area are dropped.
+    """
+    def __init__(self, _polylist:PolyList):
+        self.polylist = _polylist
+        self.count = len(_polylist)
+
+        verts = np.frombuffer(_polylist.Vertices, dtype=np.float32).reshape(-1, 3)
+        offsets = np.frombuffer(_polylist.Offsets, dtype=np.int64)
+
+        # Weld corners with the same coordinates
+        self.vertices, ids = np.unique(verts, axis=0, return_inverse=True)
+        ids = ids.reshape(-1)
+        self.points: list[list[float]] = self.vertices.astype(np.float64).tolist()
+
+        self.loops: list[list[int]] = [ids[a:b].tolist() for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+        self.textures = [_polylist.get_texture(k) for k in range(self.count)]
+
+        corners = verts.astype(np.float64) - verts.mean(axis=0)
+        area = polygon_areas(corners, offsets)
+        length = np.sqrt(np.einsum('ij,ij->i', area, area))
+
+        self.alive = (length > AREA_TOLERANCE).tolist()
+        self.normals: list[list[float]] = (area / np.where(length > 0, length, 1.0)[:, None]).tolist()
+        self.coplanar: dict[tuple[int, int], bool] = {}
+
+        # Directed edge to the polygon that owns it
+        self.owners: dict[tuple[int, int], int] = {}
+
+        for k, loop in enumerate(self.loops):
+            if not self.alive[k]: continue
+
+            for i in range(len(loop)):
+                self.owners[(loop[i], loop[(i + 1) % len(loop)])] = k
+
+
+    def merge(self) -> PolyList:
+        changed = True
+
+        while changed:
+            changed = False
+
+            for p in range(self.count):
+                if not self.alive[p]: continue
+
+                i = 0
+
+                while i < len(self.loops[p]):
+                    loop = self.loops[p]
+                    a, b = loop[i], loop[(i + 1) % len(loop)]
+
+                    # After a merge, the merged polygon is checked from the same position and again in the next pass
+                    if (q := self.owners.get((b, a))) is not None and q != p and self.try_merge(p, q, a, b):
+                        changed = True
+                    else:
+                        i += 1
+
+        return self.build()
+
+
+    def is_coplanar(self, _p:int, _q:int) -> bool:
+        # Does not change when polygons are merged, the merged polygon keeps the plane of `_p`
+        if (coplanar := self.coplanar.get((_p, _q))) is not None:
+            return coplanar
+
+        np_, nq = self.normals[_p], self.normals[_q]
+        op, oq = self.points[self.loops[_p][0]], self.points[self.loops[_q][0]]
+
+        coplanar = (np_[0] * nq[0] + np_[1] * nq[1] + np_[2] * nq[2] >= 1.0 - NORMAL_TOLERANCE and
+                    abs(np_[0] * (oq[0] - op[0]) + np_[1] * (oq[1] - op[1]) + np_[2] * (oq[2] - op[2])) <= PLANE_TOLERANCE)
+
+        self.coplanar[(_p, _q)] = coplanar
+
+        return coplanar
+
+
+    def is_convex_turn(self, _prev:int, _vertex:int, _next:int, _normal:tuple[float, float, float]) -> bool:
+        a, b, c = self.points[_prev], self.points[_vertex], self.points[_next]
+        e0 = (b[0] - a[0], b[1] - a[1], b[2] - a[2])
+        e1 = (c[0] - b[0], c[1] - b[1], c[2] - b[2])
+
+        turn = ((e0[1] * e1[2] - e0[2] * e1[1]) * _normal[0] +
+                (e0[2] * e1[0] - e0[0] * e1[2]) * _normal[1] +
+                (e0[0] * e1[1] - e0[1] * e1[0]) * _normal[2])
+
+        scale = math.sqrt((e0[0] ** 2 + e0[1] ** 2 + e0[2] ** 2) * (e1[0] ** 2 + e1[1] ** 2 + e1[2] ** 2))
+
+        return turn >= -CONVEX_TOLERANCE * scale
+
+
+    def try_merge(self, _p:int, _q:int, _a:int, _b:int) -> bool:
+        if not self.alive[_q] or self.textures[_p] != self.textures[_q]: return False
+        if not self.is_coplanar(_p, _q): return False
+
+        lp, lq = self.loops[_p], self.loops[_q]
+
+        # lp runs from b around to a, lq from a around to b, together they skip the shared edge
+        i = lp.index(_b)
+        j = lq.index(_a)
+        inner = (lq[j + 1:] + lq[:j])[:-1]
+        merged = lp[i:] + lp[:i] + inner
+
+        # Polygons that share more than one edge would touch themselves
+        if len(set(merged)) != len(merged): return False
+
+        # Only the turns at both ends of the shared edge change, the other vertices turn as they did in `_p` and `_q`
+        n = self.normals[_p]
+
+        if not self.is_convex_turn(inner[-1], _b, merged[1], n): return False
+        if not self.is_convex_turn(merged[len(lp) - 2], _a, inner[0], n): return False
+
+        # Keep the first vertex, it is the origin of the polygon
+        k = merged.index(lp[0])
+        self.loops[_p] = merged[k:] + merged[:k]
+        self.alive[_q] = False
+
+        del self.owners[(_a, _b)]
+        del self.owners[(_b, _a)]
+
+        for m in range(len(lq)):
+            edge = (lq[m], lq[(m + 1) % len(lq)])
+
+            if edge in self.owners:
+                self.owners[edge] = _p
+
+        return True
+
+
+    def build(self) -> PolyList:
+        keep = np.flatnonzero(self.alive)
+        loops = [self.loops[k] for k in keep.tolist()]
+
+        offsets = np.zeros(len(loops) + 1, dtype=np.int64)
+        np.cumsum([len(loop) for loop in loops], out=offsets[1:])
+
+        indices = np.fromiter((v for loop in loops for v in loop), dtype=np.int64, count=offsets[-1])
+
+        def rows(_values:array) -> np.ndarray:
+            return np.frombuffer(_values, dtype=np.float32).reshape(-1, 3)[keep]
+
+        polylist = PolyList(to_array('f', rows(self.polylist.Origins)),
+                            to_array('f', rows(self.polylist.Normals)),
+                            to_array('f', rows(self.polylist.TextureU)),
+                            to_array('f', rows(self.polylist.TextureV)),
+                            to_array('f', self.vertices[indices]),
+                            to_array('q', offsets),
+                            self.polylist.Texture)
+
+        if self.polylist.Textures is not None:
+            polylist.Textures = [self.textures[k] for k in keep.tolist()]
+
+        return polylist
+
+
+# -----------------------------------------------------------------------------
+def merge_coplanar(_polylist:PolyList) -> PolyList:
+    if not len(_polylist): return _polylist
+
+    return CoplanarMerger(_polylist).merge()
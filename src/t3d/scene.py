@@ -1,10 +1,9 @@
 import math
-from mathutils import Vector
 
-from enum import Enum
+from array       import array
+from enum        import Enum
 from dataclasses import dataclass
-
-from ... import b3d_utils
+from typing      import Iterator, Sequence
 
 
 EULER_TO_URU = 65536 / math.tau
@@ -63,33 +62,91 @@ class TrackIndex(str, Enum):
 
 
 # -----------------------------------------------------------------------------
-class Point3D(Vector):
+# Formatting
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def format_points(_values:Sequence[float], _format='%.6f', _prefixes=('', '', '')) -> list[str]:
+    """
+    Format a flat sequence of xyz values into one string per point with a single formatting call,
+    e.g. `X=1.000000,Y=2.000000,Z=3.000000` with `_prefixes=('X=', 'Y=', 'Z=')`.
+    `'%.6f' % x` gives the same text as `'{:.6f}'.format(x)`.
+    """
+    count = len(_values) // 3
+
+    if count == 0: return []
+
+    x, y, z = (p.replace('%', '%%') for p in _prefixes)
+    line = f'{x}{_format},{y}{_format},{z}{_format}\n'
+
+    return (line * count % tuple(_values)).split('\n')[:-1]
+
+
+# -----------------------------------------------------------------------------
+def float32(_value:float) -> float:
+    return array('f', (_value,))[0]
+
+
+# -----------------------------------------------------------------------------
+def map_range(_value:float, _in_min:float, _in_max:float, _out_min:float, _out_max:float):
+    return _out_min + (_value - _in_min) / (_in_max - _in_min) * (_out_max - _out_min)
+
+
+# -----------------------------------------------------------------------------
+class Point3D:
+    """
+    Three float32 values, the precision of the mathutils.Vector it used to be, so the output does not change.
+    Does not depend on bpy, so actors can be built, pickled and serialized outside of Blender.
+    """
     def __init__(self, _point=(0, 0, 0)):
-        super().__init__() 
-        self.x = _point[0]
-        self.y = _point[1]
-        self.z = _point[2]
+        self.values = array('f', (_point[0], _point[1], _point[2]))
 
         self.__prefix_x = ''
         self.__prefix_y = ''
         self.__prefix_z = ''
 
         self.format = '{:.6f}'
+        self.__update_template()
 
     def __str__(self) -> str:
-        x = self.format.format(self.x)
-        y = self.format.format(self.y)
-        z = self.format.format(self.z)
+        return self.__template.format(*self.values)
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        return 3
+
+    def __getitem__(self, _index:int) -> float:
+        return self.values[_index]
 
-        return f'{self.__prefix_x}{x},{self.__prefix_y}{y},{self.__prefix_z}{z}'
+    @property
+    def x(self) -> float: return self.values[0]
+    @x.setter
+    def x(self, _value:float): self.values[0] = _value
+
+    @property
+    def y(self) -> float: return self.values[1]
+    @y.setter
+    def y(self, _value:float): self.values[1] = _value
+
+    @property
+    def z(self) -> float: return self.values[2]
+    @z.setter
+    def z(self, _value:float): self.values[2] = _value
     
     def set_prefix(self, _x:str, _y:str, _z:str):
         self.__prefix_x = _x + '='
         self.__prefix_y = _y + '='
         self.__prefix_z = _z + '='
+        self.__update_template()
 
     def set_format(self, _f:str):
         self.format = _f
+        self.__update_template()
+
+    def __update_template(self):
+        f = self.format
+        self.__template = f'{self.__prefix_x}{f},{self.__prefix_y}{f},{self.__prefix_z}{f}'
 
 
 # -----------------------------------------------------------------------------
@@ -102,8 +159,9 @@ class Location(Point3D):
 # -----------------------------------------------------------------------------
 class Rotation(Point3D):
     def __init__(self, _point=(0, 0, 0)):
-        rotation = Vector(_point) * EULER_TO_URU
-        super().__init__(rotation)
+        # Multiply in float32 like mathutils did, the product of two float32 values is exact as a double
+        scale = float32(EULER_TO_URU)
+        super().__init__([v * scale for v in array('f', (_point[0], _point[1], _point[2]))])
         self.set_prefix('Pitch', 'Roll', 'Yaw')
         self.set_format('{:.0f}')
 
@@ -112,9 +170,9 @@ class Rotation(Point3D):
 class Color(Point3D):
     def __init__(self, _point=(0, 0, 0)):
         super().__init__(_point)
-        self.x = b3d_utils.map_range(self.x, 0, 1, 0, 255)
-        self.y = b3d_utils.map_range(self.y, 0, 1, 0, 255)
-        self.z = b3d_utils.map_range(self.z, 0, 1, 0, 255)
+        self.x = map_range(self.x, 0, 1, 0, 255)
+        self.y = map_range(self.y, 0, 1, 0, 255)
+        self.z = map_range(self.z, 0, 1, 0, 255)
         self.set_prefix('R', 'G', 'B')
         self.set_format('{:.0f}')
 
@@ -162,6 +220,78 @@ f'Begin Polygon {texture}Flags=3584 {link}\n\
 End Polygon\n'
 
 
+# -----------------------------------------------------------------------------
+class PolyList:
+    """
+    Array backed list of polygons.
+    Origins, normals and texture axes are flat float arrays with three values per polygon.
+    Vertices are a flat float array as well, polygon k owns vertices offsets[k] up to offsets[k + 1].
+    """
+    def __init__(
+            self,
+            _origins: Sequence[float],
+            _normals: Sequence[float],
+            _u:       Sequence[float],
+            _v:       Sequence[float],
+            _verts:   Sequence[float],
+            _offsets: Sequence[int],
+            _texture: str=None):
+
+        self.Origins  = _origins  if isinstance(_origins, array) else array('f', _origins)
+        self.Normals  = _normals  if isinstance(_normals, array) else array('f', _normals)
+        self.TextureU = _u        if isinstance(_u,       array) else array('f', _u)
+        self.TextureV = _v        if isinstance(_v,       array) else array('f', _v)
+        self.Vertices = _verts    if isinstance(_verts,   array) else array('f', _verts)
+        self.Offsets  = _offsets  if isinstance(_offsets, array) else array('q', _offsets)
+        self.Texture  = _texture
+        self.Textures: list[str | None] | None = None # Overrides Texture per polygon
+
+
+    def __len__(self) -> int:
+        return len(self.Offsets) - 1
+
+
+    def get_texture(self, _index:int) -> str | None:
+        if self.Textures is not None: 
+            return self.Textures[_index]
+        return self.Texture
+
+
+    def __iter__(self) -> Iterator[Polygon]:
+        def point(_values:array, _index:int):
+            return _values[_index * 3:_index * 3 + 3]
+
+        for k in range(len(self)):
+            verts = [point(self.Vertices, j) for j in range(self.Offsets[k], self.Offsets[k + 1])]
+            yield Polygon(point(self.Origins, k), point(self.Normals, k), point(self.TextureU, k), point(self.TextureV, k), verts, self.get_texture(k))
+
+
+    def __str__(self) -> str:
+        # Same output as str(Polygon) for each polygon, including the Link that Brush assigns
+        origins = format_points(self.Origins)
+        normals = format_points(self.Normals)
+        u       = format_points(self.TextureU)
+        v       = format_points(self.TextureV)
+        verts   = format_points(self.Vertices)
+        offsets = self.Offsets
+
+        out = []
+        link = 0
+
+        for k in range(len(self)):
+            if (texture := self.get_texture(k)):
+                out.append(f'Begin Polygon Texture={texture} Flags=3584 \n')
+            else:
+                out.append(f'Begin Polygon Flags=3584 Link={link} \n')
+                link += 1
+
+            out.append(f'\tOrigin   {origins[k]}\n\tNormal   {normals[k]}\n\tTextureU {u[k]}\n\tTextureV {v[k]}\n\tVertex   ')
+            out.append('\n\tVertex   '.join(verts[offsets[k]:offsets[k + 1]]))
+            out.append('\nEnd Polygon\n')
+
+        return ''.join(out)
+
+
 # -----------------------------------------------------------------------------
 # Actor
 # -----------------------------------------------------------------------------
@@ -182,7 +312,7 @@ class Actor:
 # -----------------------------------------------------------------------------
 class Brush(Actor):
     def __init__(self, 
-                 _polylist:list[Polygon],
+                 _polylist:PolyList | list[Polygon] | str,
                  _location:tuple[float, float, float], 
                  _rotation:tuple[float, float, float],
                  _class_name  ='Brush',
@@ -195,18 +325,23 @@ class Brush(Actor):
         self.CsgOper                   = _csg_oper
         self.ObjectSettings: list[str] = []
         self.ActorSettings: list[str]  = []
-        self.PolyList: list[Polygon]   = _polylist
+        self.PolyList                  = _polylist
 
 
     def __str__(self) -> str:
-        polylist = ''
-        link = 0
+        if isinstance(self.PolyList, str | PolyList):
+            # A string is a PolyList that has already been serialized
+            polylist = str(self.PolyList)
 
-        for poly in self.PolyList:
-            if not poly.Texture:
-                poly.Link = link
-                link += 1
-            polylist += str(poly)
+        else:
+            polylist = ''
+            link = 0
+
+            for poly in self.PolyList:
+                if not poly.Texture:
+                    poly.Link = link
+                    link += 1
+                polylist += str(poly)
 
         object_settings = ''
 
@@ -339,7 +474,7 @@ End Actor\n'
 # -----------------------------------------------------------------------------
 class LadderVolume(Brush):
     def __init__(self, 
-                 _polylist: list[Polygon],
+                 _polylist: PolyList | list[Polygon] | str,
                  _location: tuple[float, float, float], 
                  _rotation: tuple[float, float, float],
                  _is_pipe=False
@@ -355,7 +490,7 @@ class LadderVolume(Brush):
 # -----------------------------------------------------------------------------
 class Zipline(Brush):
     def __init__(self, 
-                 _polylist: list[Polygon],
+                 _polylist: PolyList | list[Polygon] | str,
                  _rotation: tuple[float, float, float],
                  _start:    tuple[float, float, float],
                  _middle:   tuple[float, float, float],
@@ -376,7 +511,7 @@ class Zipline(Brush):
 # -----------------------------------------------------------------------------
 class BlockingVolume(Brush):
     def __init__(self, 
-                 _polylist: list[Polygon], 
+                 _polylist: PolyList | list[Polygon] | str, 
                  _location: tuple[float, float, float], 
                  _rotation: tuple[float, float, float],
                  _phys_material:str=None):
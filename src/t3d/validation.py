@@ -0,0 +1,288 @@
+import bpy
+from bpy.types        import Object, Scene
+from bpy.app.handlers import save_pre, load_post, undo_post, redo_post, persistent
+
+import time
+import numpy as np
+from collections import defaultdict
+from dataclasses import dataclass
+
+from .scene    import ActorType
+from .geometry import check_polygons
+from .paths    import CollectionPaths, collection_paths
+from ...       import b3d_utils
+from ..props   import get_actor_prop
+
+
+# UnrealEd treats points within 0.1 unreal units of a plane as on the plane, in meters
+PLANE_TOLERANCE = 0.001
+AREA_TOLERANCE  = 1.0e-8
+
+
+# -----------------------------------------------------------------------------
+@dataclass
+class ValidationIssue:
+    severity : str # 'ERROR' or 'WARNING'
+    code : str
+    obj : Object | None # None if the issue is not about one object
+    message : str
+
+
+# -----------------------------------------------------------------------------
+# Brush Geometry
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+class BrushGeometryCache:
+    """
+    Result of `check_polygons()` per brush, in world space without the translation.
+    The coordinates come from `b3d_utils.mesh_bounds_cache`, an entry is valid as long as
+    that cache returns the same coordinates and the object was not rotated or scaled.
+    Brushes with modifiers are checked on their evaluated mesh and are not cached.
+    Entries of deleted objects are dropped after each validation, all entries when a file is loaded or on undo.
+    """
+    def __init__(self):
+        self.entries: dict[int, tuple[np.ndarray, tuple, tuple]] = {} # Dictionary of (object session_uid, (coordinates, matrix, result))
+
+
+    def get(self, _obj:Object, _depsgraph) -> tuple[np.ndarray, np.ndarray, float]:
+        m = _obj.matrix_world.to_3x3()
+        matrix = tuple(c for row in m for c in row)
+
+        if _obj.modifiers:
+            mesh = _obj.evaluated_get(_depsgraph).data
+            return self.check(mesh, b3d_utils.read_mesh_coordinates(mesh), m)
+
+        co = b3d_utils.mesh_bounds_cache.get(_obj.data)[0]
+
+        if (entry := self.entries.get(_obj.session_uid)) is not None and entry[0] is co and entry[1] == matrix:
+            return entry[2]
+
+        result = self.check(_obj.data, co, m)
+        self.entries[_obj.session_uid] = (co, matrix, result)
+
+        return result
+
+
+    def check(self, _mesh, _co:np.ndarray, _matrix) -> tuple[np.ndarray, np.ndarray, float]:
+        loop_total = np.empty(len(_mesh.polygons), dtype=np.int32)
+        loop_verts = np.empty(len(_mesh.loops), dtype=np.int32)
+        _mesh.polygons.foreach_get('loop_total', loop_total)
+        _mesh.loops.foreach_get('vertex_index', loop_verts)
+
+        verts = _co @ np.array(_matrix, dtype=np.float32).T
+
+        return check_polygons(verts, loop_total, loop_verts, PLANE_TOLERANCE, AREA_TOLERANCE)
+
+
+    def prune(self, _uids:set[int]):
+        """
+        Drop the entries of objects that are not in `_uids`
+        """
+        for uid in self.entries.keys() - _uids:
+            del self.entries[uid]
+
+
+    def invalidate(self):
+        self.entries.clear()
+
+
+brush_geometry_cache = BrushGeometryCache()
+
+
+# -----------------------------------------------------------------------------
+# Validation
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def get_unreal_name(_obj:Object) -> str:
+    # Unreal names are case insensitive and cannot contain dots
+    return _obj.name.replace('.', '_').lower()
+
+
+# -----------------------------------------------------------------------------
+class Validator:
+    """
+    Checks all actors in one pass before export:
+    missing prefabs and GenericBrowser paths, degenerate, non-planar and inverted brushes,
+    gaps in the checkpoint order of each track, duplicate names and PlayerStarts inside KillVolumes.
+    """
+    def __init__(self, _collection_paths:CollectionPaths=collection_paths, _cache:BrushGeometryCache=brush_geometry_cache):
+        self.collection_paths = _collection_paths
+        self.cache = _cache
+        self.issues: list[ValidationIssue] = []
+
+
+    def error(self, _code:str, _obj:Object | None, _message:str):
+        self.issues.append(ValidationIssue('ERROR', _code, _obj, _message))
+
+
+    def warning(self, _code:str, _obj:Object | None, _message:str):
+        self.issues.append(ValidationIssue('WARNING', _code, _obj, _message))
+
+
+    def validate(self, _objects:list[Object]) -> list[ValidationIssue]:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+
+        names: dict[str, list[Object]] = defaultdict(list)
+        checkpoints: dict[str, list[tuple[int, Object]]] = defaultdict(list)
+        kill_volumes: list[Object] = []
+        starts: list[Object] = []
+
+        for obj in _objects:
+            if obj.type == 'LIGHT':
+                names[get_unreal_name(obj)].append(obj)
+                continue
+
+            me_actor = get_actor_prop(obj)
+
+            if me_actor.actor_type == ActorType.NONE.name: continue
+
+            names[get_unreal_name(obj)].append(obj)
+
+            match me_actor.actor_type:
+                case ActorType.STATIC_MESH.name:
+                    self.check_static_mesh(obj, me_actor.get_static_mesh())
+                case ActorType.BRUSH.name:
+                    self.check_brush(obj, me_actor.get_brush(), depsgraph)
+                case ActorType.BLOCKING_VOLUME.name:
+                    self.check_material(obj, me_actor.get_blocking_volume().phys_material, 'PhysMaterial')
+                case ActorType.CHECKPOINT.name:
+                    checkpoint = me_actor.get_checkpoint()
+                    checkpoints[checkpoint.track_index].append((checkpoint.order_index, obj))
+                case ActorType.KILL_VOLUME.name:
+                    kill_volumes.append(obj)
+                case ActorType.PLAYER_START.name:
+                    starts.append(obj)
+
+        for track, entries in checkpoints.items():
+            self.check_checkpoint_order(track, entries)
+
+        for objects in names.values():
+            if len(objects) > 1:
+                self.error('DUPLICATE_NAME', objects[0], f'Same name in UnrealEd as {", ".join(o.name for o in objects[1:])}')
+
+        if kill_volumes and starts:
+            for overlap in b3d_utils.scene_bvh.overlaps(starts, kill_volumes):
+                self.warning('START_IN_KILL_VOLUME', overlap.a, f'PlayerStart overlaps KillVolume {overlap.b.name}')
+
+        if self.cache.entries:
+            self.cache.prune({obj.session_uid for obj in bpy.data.objects})
+
+        return self.issues
+
+
+    def check_static_mesh(self, _obj:Object, _static_mesh):
+        if not _static_mesh.use_prefab:
+            if not self.collection_paths[_obj]:
+                self.error('MISSING_PATH', _obj, 'StaticMesh is not in a GenericBrowser package')
+            return
+
+        if not (prefab := _static_mesh.prefab):
+            self.error('MISSING_PREFAB', _obj, 'Uses prefab, but has no prefab selected')
+        elif not self.collection_paths[prefab]:
+            self.error('MISSING_PATH', _obj, f'Prefab {prefab.name} is not in a GenericBrowser package')
+
+
+    def check_material(self, _obj:Object, _material:Object | None, _label:str):
+        if _material and not self.collection_paths[_material]:
+            self.error('MISSING_PATH', _obj, f'{_label} {_material.name} is not in a GenericBrowser package')
+
+
+    def check_brush(self, _obj:Object, _brush, _depsgraph):
+        self.check_material(_obj, _brush.material, 'Material')
+
+        if _obj.type != 'MESH': return
+
+        degenerate, non_planar, volume = self.cache.get(_obj, _depsgraph)
+
+        if len(degenerate):
+            self.error('DEGENERATE_FACES', _obj, f'{len(degenerate)} faces without area, e.g. face {degenerate[0]}')
+
+        if len(non_planar):
+            self.warning('NON_PLANAR_FACES', _obj, f'{len(non_planar)} faces are not planar, e.g. face {non_planar[0]}')
+
+        if volume < -AREA_TOLERANCE:
+            self.error('INVERTED_NORMALS', _obj, 'Normals point inwards')
+
+
+    def check_checkpoint_order(self, _track:str, _entries:list[tuple[int, Object]]):
+        _entries.sort(key=lambda e: e[0])
+        expected = 0
+
+        for i, (order, obj) in enumerate(_entries):
+            if i and order == _entries[i - 1][0]:
+                self.error('CHECKPOINT_ORDER', obj, f'Order index {order} is used twice on {_track}')
+                continue
+
+            if order != expected:
+                missing = f'{expected}' if order == expected + 1 else f'{expected} to {order - 1}'
+                self.error('CHECKPOINT_ORDER', obj, f'Order index {missing} is missing on {_track}')
+
+            expected = order + 1
+
+
+# -----------------------------------------------------------------------------
+def validate(_objects:list[Object]) -> list[ValidationIssue]:
+    return Validator().validate(_objects)
+
+
+# -----------------------------------------------------------------------------
+def validate_scene(_scene:Scene, _objects:list[Object]=None) -> list[ValidationIssue]:
+    """
+    Validate `_objects`, or all objects of `_scene` if None, 
+    and store the issues in the scene, where they are shown in the validation panel
+    """
+    start = time.perf_counter()
+    issues = validate(_scene.objects if _objects is None else _objects)
+
+    validation = _scene.medge_validation
+    validation.issues.clear()
+
+    for issue in issues:
+        item = validation.issues.add()
+        item.name = issue.message
+        item.severity = issue.severity
+        item.code = issue.code
+        item.obj = issue.obj
+
+    validation.selected_issue_idx = 0
+    validation.seconds = time.perf_counter() - start
+
+    return issues
+
+
+# -----------------------------------------------------------------------------
+@persistent
+def on_validation_save_pre(*_args):
+    if (scene := bpy.context.scene) and scene.medge_validation.validate_on_save:
+        validate_scene(scene)
+
+
+# -----------------------------------------------------------------------------
+@persistent
+def on_brush_geometry_cache_clear(_scene:Scene, *_args):
+    # Loading a file or undoing replaces all objects, like the mesh bounds cache the entries refer to
+    brush_geometry_cache.invalidate()
+
+
+# -----------------------------------------------------------------------------
+# Registration
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+def register():
+    b3d_utils.enable_mesh_bounds_cache()
+    b3d_utils.enable_scene_bvh()
+    b3d_utils.add_callback(save_pre, on_validation_save_pre)
+
+    for handler in (load_post, undo_post, redo_post):
+        b3d_utils.add_callback(handler, on_brush_geometry_cache_clear)
+
+
+# -----------------------------------------------------------------------------
+def unregister():
+    for handler in (load_post, undo_post, redo_post):
+        b3d_utils.remove_callback(handler, on_brush_geometry_cache_clear)
+
+    b3d_utils.remove_callback(save_pre, on_validation_save_pre)
+    b3d_utils.disable_scene_bvh()
+    b3d_utils.disable_mesh_bounds_cache()
+    brush_geometry_cache.invalidate()
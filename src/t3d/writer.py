@@ -0,0 +1,110 @@
+import codecs
+from typing import BinaryIO, Iterable
+
+from .scene import Actor
+
+
+HEADER = 'Begin Map\nBegin Level NAME=PersistentLevel\n'
+FOOTER = 'End Level\nBegin Surface\nEnd Surface\nEnd Map'
+
+# UnrealEd reads files without a byte order mark as ANSI, UTF-16 files start with a little endian byte order mark
+ENCODING = 'cp1252'
+NEWLINE = '\r\n'
+
+ASCII_COMPATIBLE = {'cp1252', 'utf-8', 'latin-1', 'iso8859-1', 'ascii'}
+
+# Number of characters that are collected before they are encoded and written at once.
+# Small enough to stay in the CPU cache while the newlines are replaced and the text is encoded.
+CHUNK_SIZE = 1 << 16
+
+
+# -----------------------------------------------------------------------------
+class T3DWriter:
+    """
+    Writes actors to a .t3d file. Does not depend on bpy, so it can be used from worker processes.
+    Text is collected in chunks, which are encoded with `_encoding` and written as bytes with `_newline` line endings,
+    independent of the platform.
+
+        with T3DWriter(filepath) as w:
+            w.write(actor)
+    """
+    def __init__(self, _filepath:str, _buffer_size=-1, _encoding=ENCODING, _newline=NEWLINE, _chunk_size=CHUNK_SIZE):
+        self.filepath    = _filepath
+        self.buffer_size = _buffer_size
+        self.encoding    = _encoding
+        self.newline     = _newline
+        self.chunk_size  = _chunk_size
+        self.count       = 0
+        self.file: BinaryIO | None = None
+        self.chunk: list[str] = []
+        self.chunk_length = 0
+
+
+    def __enter__(self):
+        self.file = open(self.filepath, 'wb', buffering=self.buffer_size)
+        self.codec = codecs.lookup(self.encoding).name
+
+        # Write the byte order mark once, the chunks are encoded without one
+        if self.codec == 'utf-16':
+            self.file.write(codecs.BOM_UTF16_LE)
+            self.codec = 'utf-16-le'
+
+        self.put(HEADER)
+
+        return self
+
+
+    def __exit__(self, _exc_type, _exc_value, _traceback):
+        try:
+            if _exc_type is None:
+                self.put(FOOTER)
+
+            self.flush()
+        finally:
+            self.file.close()
+            self.file = None
+
+
+    def put(self, _text:str):
+        self.chunk.append(_text)
+        self.chunk_length += len(_text)
+
+        if self.chunk_length >= self.chunk_size:
+            self.flush()
+
+
+    def flush(self):
+        text = ''.join(self.chunk)
+        self.chunk.clear()
+        self.chunk_length = 0
+
+        if self.newline != '\n':
+            text = text.replace('\n', self.newline)
+
+        # Actors are nearly always ASCII, which is much faster to encode than with a code page
+        if text.isascii() and self.codec in ASCII_COMPATIBLE:
+            self.file.write(text.encode('ascii'))
+        else:
+            self.file.write(text.encode(self.codec, 'replace'))
+
+
+    def write(self, _actor:Actor | str):
+        # Strings are actors that have already been serialized
+        self.put(str(_actor))
+        self.count += 1
+
+
+    def write_all(self, _actors:Iterable[Actor | str]):
+        for actor in _actors:
+            self.write(actor)
+
+
+# -----------------------------------------------------------------------------
+def write_t3d(_filepath:str, _actors:Iterable[Actor | str], _buffer_size=-1, _encoding=ENCODING, _newline=NEWLINE) -> int:
+    """
+    Returns the number of actors written
+    """
+    with T3DWriter(_filepath, _buffer_size, _encoding, _newline) as w:
+        w.write_all(_actors)
+
+    return w.count
@@ -0,0 +1,27 @@
+"""
+The tests run in plain Python with the `bpy` module, or inside Blender:
+
+    python -m pytest tests
+    blender --background --python-expr "import pytest; pytest.main(['tests'])"
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# The add-on is imported like the benchmarks import it, see benchmarks/_addon.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'benchmarks'))
+
+
+# -----------------------------------------------------------------------------
+@pytest.fixture(scope='session')
+def addon():
+    """
+    The registered add-on, for tests that need the `medge_actor` properties
+    """
+    from _addon import load_addon
+
+    addon = load_addon()
+    yield addon
+    addon.unregister()
@@ -0,0 +1,79 @@
+"""
+Actors taken from the incremental export cache must report the same as actors that are built.
+"""
+
+import math
+
+import pytest
+
+bpy = pytest.importorskip('bpy')
+
+from _addon import import_module
+
+props     = import_module('src.props')
+scene     = import_module('src.t3d.scene')
+builder   = import_module('src.t3d.builder')
+cache     = import_module('src.t3d.cache')
+profiler  = import_module('src.t3d.profiler')
+b3d_utils = import_module('b3d_utils')
+
+
+# -----------------------------------------------------------------------------
+def triangulated_prism(_sides:int):
+    ring = [(math.cos(math.tau * k / _sides), math.sin(math.tau * k / _sides)) for k in range(_sides)]
+    verts = [(x, y, 0) for x, y in ring] + [(x, y, 2) for x, y in ring]
+
+    faces = []
+
+    for k in range(_sides):
+        a, b = k, (k + 1) % _sides
+        faces += [(a, b, _sides + b), (a, _sides + b, _sides + a)]
+
+    faces += [(0, k + 1, k) for k in range(1, _sides - 1)]
+    faces += [(_sides, _sides + k, _sides + k + 1) for k in range(1, _sides - 1)]
+
+    return b3d_utils.new_mesh(verts, [], faces, 'TriangulatedPrism')
+
+
+# -----------------------------------------------------------------------------
+@pytest.fixture
+def brushes(addon):
+    objects = [props.new_actor(scene.ActorType.BRUSH, triangulated_prism(6 + k)) for k in range(3)]
+
+    for k, obj in enumerate(objects):
+        obj.location = (k * 10, 0, 0)
+
+    bpy.context.view_layer.update()
+
+    yield objects
+
+    for obj in objects:
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(mesh)
+
+
+# -----------------------------------------------------------------------------
+def test_cached_brushes_keep_polygon_reduction(brushes):
+    options = builder.T3DBuilderOptions(100, None, 1.0, 1.0, True)
+    export_cache = cache.T3DExportCache(None, options)
+
+    built = []
+    builder.T3DBuilder(export_cache, _reductions=built).build(brushes, options)
+
+    assert export_cache.misses == len(brushes)
+    assert [r.polygons_saved for r in built] == [3 * (6 + k) - 6 for k in range(3)]
+
+    cached = []
+    with profiler.T3DProfiler() as prof:
+        text = builder.T3DBuilder(export_cache, prof, cached).build(brushes, options)
+
+    assert export_cache.hits == len(brushes)
+    assert [(r.name, r.polygons_before, r.polygons_after, r.bytes_saved) for r in cached] == \
+           [(r.name, r.polygons_before, r.polygons_after, r.bytes_saved) for r in built]
+
+    totals = prof.totals()
+    assert totals['cached'].calls == len(brushes)
+    assert totals['cached'].bytes == sum(len(t) for t in text)
+    assert totals['hash'].calls == len(brushes)
+    assert 'actor' not in totals
@@ -0,0 +1,141 @@
+"""
+Brush polygons from `extract_polygons` must be serialized exactly like the bmesh and mathutils builder they replaced.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+bpy = pytest.importorskip('bpy')
+
+import bmesh
+from mathutils import Euler, Matrix, Vector
+
+from _addon import import_module
+
+geometry = import_module('src.t3d.geometry')
+scene    = import_module('src.t3d.scene')
+
+UNIT_SCALE = 100.0
+MIRROR     = (1, -1, 1)
+
+
+# -----------------------------------------------------------------------------
+def baseline_polygons(_obj_eval, _apply_transforms:bool) -> str:
+    """
+    `T3DBuilder.create_polygons` before it was vectorized, with the Link that Brush assigns
+    """
+    mirror = Vector(MIRROR)
+
+    bm = bmesh.new()
+    bm.from_mesh(_obj_eval.data)
+
+    out = []
+
+    for k, f in enumerate(bm.faces):
+        verts = []
+
+        for v in reversed(f.verts):
+            if _apply_transforms:
+                world_co = _obj_eval.matrix_world @ v.co
+                verts.append(world_co * UNIT_SCALE * mirror)
+            else:
+                verts.append(v.co * _obj_eval.scale * UNIT_SCALE * mirror)
+
+        u = f.verts[1].co - f.verts[0].co
+        u.normalize()
+        n = f.normal
+        v = n.cross(u)
+
+        p = scene.Polygon(verts[0], n, u, v, verts)
+        p.Link = k
+        out.append(str(p))
+
+    bm.free()
+
+    return ''.join(out)
+
+
+# -----------------------------------------------------------------------------
+@pytest.fixture
+def brush():
+    mesh = bpy.data.meshes.new('TestBrush')
+    obj = bpy.data.objects.new('TestBrush', mesh)
+    bpy.context.scene.collection.objects.link(obj)
+
+    yield obj
+
+    bpy.data.objects.remove(obj)
+    bpy.data.meshes.remove(mesh)
+
+
+# -----------------------------------------------------------------------------
+def irregular_prism(_sides:int, _seed:int) -> tuple[list, list]:
+    # Uneven radii and heights, so that the coordinates do not round nicely
+    verts = []
+
+    for k in range(_sides):
+        a = math.tau * k / _sides + 0.1 * _seed
+        r = 1.37 + 0.113 * ((k * 7 + _seed) % 5)
+        verts.append((r * math.cos(a), r * math.sin(a), -0.731))
+
+    verts += [(x * 0.83 + 0.19, y * 0.83 - 0.07, 1.913) for x, y, _ in verts]
+
+    faces = [tuple(range(_sides - 1, -1, -1)), tuple(range(_sides, 2 * _sides))]
+    faces += [(k, (k + 1) % _sides, _sides + (k + 1) % _sides, _sides + k) for k in range(_sides)]
+
+    return verts, faces
+
+
+TRANSFORMS = [
+    ((0, 0, 0),              (0, 0, 0),                  (1, 1, 1)),
+    ((12.5, -3.25, 0.75),    (0, 0, 0),                  (1, 1, 1)),
+    ((0, 0, 0),              (0.3, -1.1, 2.7),           (1, 1, 1)),
+    ((-731.13, 92.7, 17.01), (math.radians(33), 0.77, -2.9), (1.7, 0.35, 2.25)),
+    ((1e4 / 3, -2e3 / 7, 5.5), (1.234, 2.345, 3.456),    (-1, 1, 1)),
+]
+
+
+# -----------------------------------------------------------------------------
+@pytest.mark.parametrize('apply_transforms', (False, True))
+@pytest.mark.parametrize('location, rotation, scale', TRANSFORMS)
+@pytest.mark.parametrize('sides', (4, 7))
+def test_extract_polygons_matches_baseline(brush, sides, location, rotation, scale, apply_transforms):
+    verts, faces = irregular_prism(sides, len(location) + sides)
+    brush.data.from_pydata(verts, [], faces)
+    brush.data.update()
+
+    brush.matrix_world = Matrix.LocRotScale(Vector(location), Euler(rotation), Vector(scale))
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    obj_eval = brush.evaluated_get(depsgraph)
+
+    expected = baseline_polygons(obj_eval, apply_transforms)
+    actual = str(geometry.extract_polygons(obj_eval, UNIT_SCALE, MIRROR, apply_transforms))
+
+    assert actual == expected
+
+
+# -----------------------------------------------------------------------------
+def test_transform_points_matches_mathutils():
+    matrix = Matrix.LocRotScale(Vector((-731.13, 92.7, 17.01)), Euler((0.61, 0.77, -2.9)), Vector((1.7, 0.35, 2.25)))
+    points = [Vector((x * 0.731, -x * 1.37 + 0.5, x * x * 0.013)) for x in range(-50, 50)]
+
+    expected = [tuple(matrix @ p) for p in points]
+
+    actual = geometry.transform_points(matrix, np.array(points, dtype=np.float32))
+
+    assert [tuple(p) for p in actual.tolist()] == expected
+
+
+# -----------------------------------------------------------------------------
+def test_normalize_matches_mathutils():
+    vectors = [Vector((x * 0.731, -x * 1.37 + 0.5, x * x * 0.013)) for x in range(-50, 50)]
+    vectors += [Vector((1e-20, 0, 0)), Vector((0, 3e-18, 0)), Vector((0, 0, 0))]
+
+    expected = [tuple(v.normalized()) for v in vectors]
+
+    actual = geometry.normalize(np.array(vectors, dtype=np.float32))
+
+    assert [tuple(v) for v in actual.tolist()] == expected
@@ -0,0 +1,36 @@
+"""
+`b3d_utils.interpolate_nurbs` must give the points of the scalar port of `BKE_nurb_makeCurve` it replaced,
+which is kept in benchmarks/nurbs_bench.py.
+"""
+
+import random
+import itertools
+
+import pytest
+
+bpy = pytest.importorskip('bpy')
+
+from nurbs_bench import b3d_utils, create_spline, legacy_interpolate_nurbs
+
+TOLERANCE = 1e-6
+
+
+# -----------------------------------------------------------------------------
+@pytest.mark.parametrize('order, cyclic, endpoint, bezier', list(itertools.product(range(2, 7), *[(False, True)] * 3)))
+def test_interpolate_nurbs_matches_legacy(order, cyclic, endpoint, bezier):
+    random.seed(order)
+
+    for count in range(order, 9):
+        curve, spline = create_spline(count, order, cyclic, endpoint, bezier)
+
+        for res in (1, 4, 12):
+            if not cyclic and res * (count - 1) == 1: continue
+
+            spline.resolution_u = res
+            expected = legacy_interpolate_nurbs(spline, res, 3)
+            actual   = b3d_utils.interpolate_nurbs(spline, res, 3)
+
+            assert len(actual) == len(expected), f'{count=} {res=}'
+            assert max(abs(a - b) for a, b in zip(expected, actual)) <= TOLERANCE, f'{count=} {res=}'
+
+        bpy.data.curves.remove(curve)
@@ -0,0 +1,52 @@
+"""
+Coplanar polygon merging and the size of polylists, in plain Python without Blender.
+"""
+
+import sys
+import random
+from pathlib import Path
+
+# The T3D actor model does not depend on bpy, so it is imported as the package `t3d`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from t3d import scene, reduction
+from reduction_bench import triangulated_prism_polylist
+
+
+# -----------------------------------------------------------------------------
+def random_polylist(_count:int, _seed:int) -> scene.PolyList:
+    rng = random.Random(_seed)
+    scales = (1e-7, 1e-3, 0.5, 1.0, 9.9999999, 10.0, 123.456, 99999.99, 1e7, 3e12)
+
+    offsets = [0]
+
+    for _ in range(_count):
+        offsets.append(offsets[-1] + rng.randint(3, 9))
+
+    def values(_n:int) -> list[float]:
+        return [rng.choice((-1, 1)) * rng.choice(scales) * rng.choice((1, rng.random())) for _ in range(_n)]
+
+    polylist = scene.PolyList(values(3 * _count), values(3 * _count), values(3 * _count), values(3 * _count),
+                              values(3 * offsets[-1]), offsets, 'P_Test.Materials.M_Base')
+
+    # Mix polygons with their own texture and linked polygons without one
+    polylist.Textures = [rng.choice((None, 'P_Test.Materials.M_Trim', 'P_Test.M_Ä')) for _ in range(_count)]
+
+    return polylist
+
+
+# -----------------------------------------------------------------------------
+def test_polylist_size_matches_text():
+    for seed in range(20):
+        polylist = random_polylist(40, seed)
+        assert reduction.get_polylist_size(polylist) == reduction.get_text_size(str(polylist))
+
+
+# -----------------------------------------------------------------------------
+def test_merge_triangulated_prism():
+    polylist = triangulated_prism_polylist(12)
+    merged = reduction.merge_coplanar(polylist)
+
+    # 10 sides of two triangles and two caps of 8 triangles each become 10 quads and two caps
+    assert (len(polylist), len(merged)) == (36, 12)
+    assert reduction.get_polylist_size(merged) == reduction.get_text_size(str(merged))
@@ -0,0 +1,67 @@
+"""
+The export validates only the objects it exports.
+"""
+
+import pytest
+
+bpy = pytest.importorskip('bpy')
+
+from _addon import import_module
+
+props      = import_module('src.props')
+scene      = import_module('src.t3d.scene')
+validation = import_module('src.t3d.validation')
+b3d_utils  = import_module('b3d_utils')
+
+
+# -----------------------------------------------------------------------------
+@pytest.fixture
+def brushes(addon):
+    # A closed cube and a brush with a face without area
+    good = props.new_actor(scene.ActorType.BRUSH)
+    flat = props.new_actor(scene.ActorType.BRUSH, b3d_utils.new_mesh([(0, 0, 0), (1, 0, 0), (2, 0, 0)], [], [(0, 1, 2)], 'Flat'))
+    bpy.context.view_layer.update()
+
+    yield good, flat
+
+    for obj in (good, flat):
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(mesh)
+
+
+# -----------------------------------------------------------------------------
+def test_validate_scene_checks_only_the_given_objects(brushes):
+    good, flat = brushes
+    codes = lambda issues: {(i.code, i.obj.name) for i in issues}
+
+    assert ('DEGENERATE_FACES', flat.name) in codes(validation.validate_scene(bpy.context.scene))
+
+    issues = validation.validate_scene(bpy.context.scene, [good])
+
+    assert flat.name not in {name for _, name in codes(issues)}
+    assert len(bpy.context.scene.medge_validation.issues) == len(issues)
+
+
+# -----------------------------------------------------------------------------
+def test_brush_geometry_cache_drops_deleted_brushes(brushes):
+    good, flat = brushes
+    validation.validate_scene(bpy.context.scene)
+
+    assert {good.session_uid, flat.session_uid} <= validation.brush_geometry_cache.entries.keys()
+
+    # A brush that is deleted between two validations is not kept
+    extra = props.new_actor(scene.ActorType.BRUSH)
+    validation.validate_scene(bpy.context.scene, [extra])
+    uid, mesh = extra.session_uid, extra.data
+    bpy.data.objects.remove(extra)
+    bpy.data.meshes.remove(mesh)
+
+    validation.validate_scene(bpy.context.scene, [good])
+
+    assert uid not in validation.brush_geometry_cache.entries
+    assert flat.session_uid in validation.brush_geometry_cache.entries
+
+    validation.on_brush_geometry_cache_clear(bpy.context.scene)
+
+    assert not validation.brush_geometry_cache.entries